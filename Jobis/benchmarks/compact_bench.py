@@ -0,0 +1,126 @@
+"""압축 모드(PCA 차원 축소) 벤치마크
+
+rag_bench.py와 같은 합성 코퍼스로 원래 차원(768) 벡터 DB와 PCA 압축 벡터 DB를 만들고
+1) 벡터 메모리 / 디스크 사용량과 절감 비율
+2) 검색 지연 시간 (질문 임베딩 제외, p50/p95)
+3) recall@k 손실 (코퍼스 문장으로 만든 질문, PCA 학습에 쓰지 않은 별도 질문 세트)
+4) 원래 차원 검색 결과와의 top-k 겹침 비율
+을 비교합니다.
+
+    python benchmarks/compact_bench.py --dims 128,256 --k 10
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트 경로를 sys.path에 추가 (benchmarks/ 상위가 루트)
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from rag_bench import build_corpus, make_generated_queries, use_corpus
+from rag import embedding as embedding_module
+from rag import vectorstore as vectorstore_module
+from rag.embedder import get_embeddings
+from rag.projection import PCAProjection
+
+def use_persist_path(persist_path):
+    embedding_module.PERSIST_PATH = str(persist_path)
+    vectorstore_module.PERSIST_PATH = str(persist_path)
+
+def directory_size(path):
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(path)
+        for name in files
+    )
+
+def measure(persist_path, embeddings, queries, k):
+    use_persist_path(persist_path)
+    vectorstore = vectorstore_module.get_vectorstore(embeddings=embeddings)
+    projection = PCAProjection.load(str(persist_path))
+
+    query_vectors = [vectorstore.embeddings.embed_query(entry["query"]) for entry in queries]
+    vectorstore.similarity_search_by_vector(query_vectors[0], k=k)  # 인덱스 로딩은 측정에서 제외
+
+    latencies, results = [], []
+    for vector in query_vectors:
+        started = time.perf_counter()
+        docs = vectorstore.similarity_search_by_vector(vector, k=k)
+        latencies.append(time.perf_counter() - started)
+        results.append([doc.metadata.get("data_id") for doc in docs])
+
+    hits = [
+        len(set(ids) & entry["relevant"]) / min(len(entry["relevant"]), k)
+        for ids, entry in zip(results, queries) if entry["relevant"]
+    ]
+    count = vectorstore._collection.count()
+    dim = len(query_vectors[0])
+    p50, p95 = np.percentile(np.asarray(latencies) * 1000, [50, 95])
+    return {
+        "dim": dim,
+        "vector_mb": count * dim * 4 / 1024 ** 2,  # Chroma는 float32로 저장
+        "disk_mb": directory_size(persist_path) / 1024 ** 2,
+        "search_p50_ms": float(p50),
+        "search_p95_ms": float(p95),
+        "recall": float(np.mean(hits)) if hits else 0.0,
+        "results": results,
+        "explained_variance": projection.explained_variance if projection else 1.0,
+    }
+
+def overlap(reference, candidate, k):
+    return float(np.mean([len(set(ref) & set(cand)) / k for ref, cand in zip(reference, candidate)]))
+
+def main():
+    parser = argparse.ArgumentParser(description="압축 모드(PCA 차원 축소) 벤치마크")
+    parser.add_argument("--corpus-dir", default=str(ROOT_DIR / "data" / "bench"), help="rag_bench.py와 같은 코퍼스 폴더")
+    parser.add_argument("--rebuild-corpus", action="store_true", help="코퍼스와 벡터 DB를 모두 다시 만듭니다.")
+    parser.add_argument("--companies-per-industry", type=int, default=3)
+    parser.add_argument("--records-per-company", type=int, default=20)
+    parser.add_argument("--dims", default="128,256", help="쉼표로 구분한 압축 차원 목록")
+    parser.add_argument("--queries", type=int, default=200, help="recall 측정용 질문 수")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    corpus_dir = Path(args.corpus_dir)
+    if args.rebuild_corpus or not (corpus_dir / "chroma_db").exists():
+        build_corpus(corpus_dir, args.companies_per_industry, args.records_per_company, args.seed)
+    use_corpus(corpus_dir)
+
+    dims = [int(dim) for dim in args.dims.split(",")]
+    for dim in dims:
+        persist_path = corpus_dir / f"chroma_db_pca{dim}"
+        if args.rebuild_corpus or not persist_path.exists():
+            print(f"\n압축 벡터 DB 생성 중... ({dim}차원, {persist_path})")
+            use_persist_path(persist_path)
+            embedding_module.build_vector_db(rebuild=True, compact_dim=dim)
+
+    queries = make_generated_queries(args.queries, args.seed)
+    embeddings = get_embeddings()
+
+    configs = [("full", corpus_dir / "chroma_db")] + [(f"pca{dim}", corpus_dir / f"chroma_db_pca{dim}") for dim in dims]
+    results = {name: measure(path, embeddings, queries, args.k) for name, path in configs}
+    base = results["full"]
+
+    print(f"\n질문 {len(queries)}개 | k={args.k}")
+    print(
+        f"{'config':>8} {'dim':>5} {'벡터(MB)':>9} {'디스크(MB)':>10} {'절감':>7} {'p50(ms)':>8} {'p95(ms)':>8} "
+        f"{'recall@k':>9} {'손실':>7} {'top-k 겹침':>10} {'분산 보존':>9}"
+    )
+    for name, _ in configs:
+        result = results[name]
+        saved = 1 - result["vector_mb"] / base["vector_mb"]
+        print(
+            f"{name:>8} {result['dim']:>5} {result['vector_mb']:>9.2f} {result['disk_mb']:>10.2f} {saved:>7.1%} "
+            f"{result['search_p50_ms']:>8.2f} {result['search_p95_ms']:>8.2f} "
+            f"{result['recall']:>9.3f} {base['recall'] - result['recall']:>7.3f} "
+            f"{overlap(base['results'], result['results'], args.k):>10.3f} {result['explained_variance']:>9.1%}"
+        )
+
+if __name__ == "__main__":
+    main()
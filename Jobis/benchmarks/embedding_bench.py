@@ -0,0 +1,133 @@
+"""임베딩 백엔드 벤치마크 / 정합성 검사 (PyTorch fp32 vs ONNX int8)
+
+data/raw/dumy.py로 만든 합성 리뷰를 백엔드별로 임베딩해
+1) 질문 임베딩 지연 시간 (p50/p95/p99, ms)
+2) 문서 임베딩 처리량 (ingest docs/sec)
+3) 첫 번째 백엔드(기준) 대비 top-k 검색 결과 겹침 비율
+   - 전체 교체: 문서/질문 모두 새 백엔드로 임베딩 (벡터 DB를 다시 만든 경우)
+   - 질문만 교체: 기준 백엔드로 만든 문서 벡터에 새 백엔드의 질문 벡터로 검색 (벡터 DB를 그대로 둔 경우)
+을 측정합니다. 겹침 비율이 --min-overlap보다 낮으면 종료 코드 1을 반환합니다.
+
+    python rag/embedder.py  # ONNX int8 모델 변환 (처음 한 번)
+    python benchmarks/embedding_bench.py --backends torch,onnx --docs 2000 --k 10
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트 경로를 sys.path에 추가 (benchmarks/ 상위가 루트)
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+# data/raw는 패키지가 아니므로 경로를 직접 추가
+RAW_DIR = ROOT_DIR / 'data' / 'raw'
+if str(RAW_DIR) not in sys.path:
+    sys.path.append(str(RAW_DIR))
+
+import dumy
+from load_test import QUERIES
+from rag.embedder import get_embeddings
+from rag.embedding import create_documents
+from rag.preprocessing import iter_processed
+
+RECORDS_PER_COMPANY = 20
+
+def build_corpus(num_docs, num_queries, seed):
+    """합성 문서 num_docs개와, README 질문 + 문서 문장으로 만든 질문 num_queries개를 반환합니다."""
+    companies_per_industry = max(num_docs // (len(dumy.INDUSTRIES) * RECORDS_PER_COMPANY), 1)
+    companies = (
+        json.loads(dumy.generate_company((index, companies_per_industry, RECORDS_PER_COMPANY, seed)))
+        for index in range(len(dumy.INDUSTRIES) * companies_per_industry)
+    )
+    items = list(iter_processed(companies))[:num_docs]
+    texts = [doc.page_content for doc in create_documents(items)]
+
+    rng = random.Random(seed)
+    queries = list(QUERIES)
+    for item in rng.sample(items, min(max(num_queries - len(queries), 0), len(items))):
+        if item.get("sentences"):
+            queries.append(f"{item['company_name']} {rng.choice(item['sentences'])}")
+    return texts, queries
+
+def measure_backend(backend, texts, queries, batch_size):
+    embeddings = get_embeddings(use_cache=False, backend=backend)
+    embeddings.embed_query(queries[0])  # 모델/세션 초기화는 측정에서 제외
+
+    latencies = []
+    query_vectors = []
+    for query in queries:
+        started = time.perf_counter()
+        query_vectors.append(embeddings.embed_query(query))
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    doc_vectors = []
+    for start in range(0, len(texts), batch_size):
+        doc_vectors.extend(embeddings.embed_documents(texts[start:start + batch_size]))
+    ingest_seconds = time.perf_counter() - started
+
+    p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 95, 99])
+    return {
+        "query_ms": {"p50": float(p50), "p95": float(p95), "p99": float(p99)},
+        "docs_per_sec": len(texts) / ingest_seconds,
+        "queries": np.asarray(query_vectors, dtype=np.float32),
+        "docs": np.asarray(doc_vectors, dtype=np.float32),
+    }
+
+def top_k(query_vectors, doc_vectors, k):
+    # 정규화된 벡터이므로 내적이 코사인 유사도
+    scores = query_vectors @ doc_vectors.T
+    return np.argpartition(-scores, kth=min(k, scores.shape[1]) - 1, axis=1)[:, :k]
+
+def overlap(reference, candidate):
+    k = reference.shape[1]
+    return float(np.mean([len(set(ref) & set(cand)) / k for ref, cand in zip(reference, candidate)]))
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 백엔드 벤치마크 / 정합성 검사")
+    parser.add_argument("--backends", default="torch,onnx", help="쉼표로 구분한 백엔드 목록 (첫 번째가 기준)")
+    parser.add_argument("--docs", type=int, default=2000, help="임베딩할 문서 수")
+    parser.add_argument("--queries", type=int, default=200, help="질문 수 (README 예시 질문 포함)")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--min-overlap", type=float, default=0.9, help="허용할 최소 top-k 겹침 비율 (전체 교체 기준)")
+    args = parser.parse_args()
+
+    dumy.seed_random(args.seed)
+    texts, queries = build_corpus(args.docs, args.queries, args.seed)
+    backends = args.backends.split(",")
+    print(f"문서 {len(texts)}개 | 질문 {len(queries)}개 | k={args.k} | 기준 백엔드 {backends[0]}")
+
+    results = {}
+    for backend in backends:
+        print(f"\n[{backend}] 측정 중...")
+        results[backend] = measure_backend(backend, texts, queries, args.batch_size)
+
+    print(f"\n{'backend':>8} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'docs/sec':>10} {'top-k 겹침':>11} {'질문만 교체':>11}")
+    reference = results[backends[0]]
+    reference_top_k = top_k(reference["queries"], reference["docs"], args.k)
+    failed = False
+    for backend in backends:
+        result = results[backend]
+        full = overlap(reference_top_k, top_k(result["queries"], result["docs"], args.k))
+        query_only = overlap(reference_top_k, top_k(result["queries"], reference["docs"], args.k))
+        failed = failed or full < args.min_overlap
+        query_ms = result["query_ms"]
+        print(
+            f"{backend:>8} {query_ms['p50']:>9.2f} {query_ms['p95']:>9.2f} {query_ms['p99']:>9.2f} "
+            f"{result['docs_per_sec']:>10.1f} {full:>11.3f} {query_only:>11.3f}"
+        )
+
+    if failed:
+        print(f"\n❌ top-k 겹침 비율이 {args.min_overlap}보다 낮은 백엔드가 있습니다.")
+        sys.exit(1)
+    print("\n✅ 모든 백엔드가 기준 모델과 같은 검색 결과를 충분히 유지합니다.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""더미 데이터 생성기 벤치마크 / 분포 검사
+
+data/raw/dumy.py로 리뷰를 구간(block)별로 생성하면서
+1) 레코드당 생성 시간이 구간이 지나도 일정한지 (템플릿 풀이 커지지 않는지)
+2) 단점(re_dis) 텍스트에 쓰인 템플릿 빈도가 처음 구간과 마지막 구간에서 같은지
+를 확인합니다. 두 조건 중 하나라도 어긋나면 종료 코드 1을 반환합니다.
+
+    python benchmarks/generator_bench.py --blocks 10 --block-size 20000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# data/raw는 패키지가 아니므로 경로를 직접 추가
+ROOT_DIR = Path(__file__).resolve().parents[1]
+RAW_DIR = ROOT_DIR / 'data' / 'raw'
+if str(RAW_DIR) not in sys.path:
+    sys.path.append(str(RAW_DIR))
+
+import dumy
+
+SECTOR = dumy.INDUSTRIES[0]
+
+def template_counts(texts, templates):
+    return [sum(text.count(template) for text in texts) for template in templates]
+
+def run_block(block_size, data_id_start):
+    started = time.perf_counter()
+    texts = []
+    for i in range(block_size):
+        review = dumy.generate_review(SECTOR, data_id_start + i)["review"]
+        if review["re_dis"]:
+            texts.append(review["re_dis"])
+    elapsed = time.perf_counter() - started
+    return elapsed / block_size * 1e6, texts
+
+def main():
+    parser = argparse.ArgumentParser(description="더미 데이터 생성기 벤치마크 / 분포 검사")
+    parser.add_argument("--blocks", type=int, default=10)
+    parser.add_argument("--block-size", type=int, default=20_000, help="구간당 생성할 리뷰 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-slowdown", type=float, default=1.5, help="허용할 뒤쪽/앞쪽 절반 구간의 평균 시간 비율")
+    parser.add_argument("--tolerance", type=float, default=0.01, help="허용할 템플릿 빈도 차이 (절대값)")
+    args = parser.parse_args()
+
+    dumy.seed_random(args.seed)
+    templates = dumy.TEMPLATE_POOLS[SECTOR]["negative_long"]
+    questions = set(templates[len(dumy.NEGATIVE_TEMPLATES):])
+    pool_size = len(templates)
+
+    print(f"{'block':>5} {'us/record':>10} {'question share':>15}")
+    costs, frequencies = [], []
+    for block in range(args.blocks):
+        cost, texts = run_block(args.block_size, block * args.block_size + 1)
+        counts = template_counts(texts, templates)
+        total = sum(counts) or 1
+        frequency = [count / total for count in counts]
+        question_share = sum(f for template, f in zip(templates, frequency) if template in questions)
+
+        costs.append(cost)
+        frequencies.append(frequency)
+        print(f"{block:>5} {cost:>10.1f} {question_share:>15.3f}")
+
+    # 측정 잡음을 줄이기 위해 앞쪽 절반과 뒤쪽 절반의 평균을 비교
+    half = max(len(costs) // 2, 1)
+    slowdown = (sum(costs[-half:]) / half) / (sum(costs[:half]) / half)
+    drift = max(abs(first - last) for first, last in zip(frequencies[0], frequencies[-1]))
+    print(f"\n템플릿 풀 크기: {pool_size} (생성 후 {len(dumy.TEMPLATE_POOLS[SECTOR]['negative_long'])})")
+    print(f"뒤쪽/앞쪽 구간 평균 시간 비율: {slowdown:.2f}x (허용 {args.max_slowdown}x)")
+    print(f"템플릿 빈도 최대 차이: {drift:.4f} (허용 {args.tolerance}, 균등 분포 기준 {1 / pool_size:.4f})")
+
+    if slowdown > args.max_slowdown or drift > args.tolerance:
+        print("❌ 생성 비용 또는 템플릿 분포가 구간에 따라 달라졌습니다.")
+        sys.exit(1)
+    print("✅ 레코드당 비용과 템플릿 분포가 일정합니다.")
+
+if __name__ == "__main__":
+    main()
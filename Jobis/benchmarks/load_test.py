@@ -0,0 +1,93 @@
+"""JobisChatbot 비동기 API 부하 테스트
+
+로컬 가짜 LLM(FakeChatModel)으로 Gemini를 대체하고, 동시 요청 수에 따라
+처리량(QPS)과 지연 시간이 어떻게 변하는지 측정합니다. (벡터 DB가 먼저 구축되어 있어야 합니다.)
+
+    python benchmarks/load_test.py --concurrency 1,4,16,64 --requests 64 --llm-latency 0.5
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 경로를 sys.path에 추가 (benchmarks/ 상위가 루트)
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+import rag.chatbot as chatbot_module
+from rag.chatbot import JobisChatbot
+from rag.fake_llm import FakeChatModel
+from rag.resources import wait_until_ready
+
+# README의 예시 질문
+QUERIES = [
+    "삼성전자 리뷰에서 직원들이 말하는 장점 알려줘.",
+    "네이버와 카카오 리뷰 비교해줘.",
+    "LG화학 면접 질문은 어떤 편이야?",
+    "대한항공과 현대글로비스의 공통 단점이 뭐야?",
+    "삼성전자·네이버·LG화학 리뷰 기반으로 IT 업계 특징 분석해줘.",
+    "복지가 좋은 회사는 어디야?",
+]
+
+def percentile(values, q):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+async def run_level(bot, concurrency, total_requests, timeout):
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def one_request(i):
+        nonlocal failures
+        async with gate:
+            started = time.perf_counter()
+            answer = await bot.aask(QUERIES[i % len(QUERIES)], timeout=timeout)
+            latencies.append(time.perf_counter() - started)
+            if not answer.startswith("[FAKE]"):
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_request(i) for i in range(total_requests)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "qps": total_requests / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": percentile(latencies, 95),
+        "failures": failures,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="JobisChatbot 비동기 부하 테스트")
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32", help="동시 요청 수 목록 (쉼표 구분)")
+    parser.add_argument("--requests", type=int, default=64, help="단계별 총 요청 수")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="가짜 LLM 응답 지연 (초)")
+    parser.add_argument("--max-llm-calls", type=int, default=chatbot_module.MAX_CONCURRENT_LLM_CALLS,
+                        help="동시 LLM 호출 상한 (세마포어 크기)")
+    parser.add_argument("--timeout", type=float, default=chatbot_module.REQUEST_TIMEOUT, help="요청당 제한 시간 (초)")
+    args = parser.parse_args()
+
+    chatbot_module.MAX_CONCURRENT_LLM_CALLS = args.max_llm_calls
+    # 답변 캐시를 끄고 모든 요청이 검색 + LLM 경로를 타도록 합니다.
+    bot = JobisChatbot(llm=FakeChatModel(latency=args.llm_latency), use_answer_cache=False)
+    # 모델 로드가 첫 단계 측정에 섞이지 않도록 워밍업이 끝날 때까지 기다립니다.
+    wait_until_ready()
+
+    print(f"가짜 LLM 지연 {args.llm_latency}초 | LLM 동시 호출 상한 {args.max_llm_calls} | 단계별 요청 {args.requests}건")
+    print(f"{'동시성':>6} | {'QPS':>8} | {'p50(s)':>8} | {'p95(s)':>8} | 실패")
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        # 단계마다 새 이벤트 루프를 사용하므로 세마포어도 새로 만들어집니다.
+        result = asyncio.run(run_level(bot, concurrency, args.requests, args.timeout))
+        print(
+            f"{result['concurrency']:>6} | {result['qps']:>8.2f} | "
+            f"{result['p50']:>8.3f} | {result['p95']:>8.3f} | {result['failures']}"
+        )
+
+if __name__ == "__main__":
+    main()
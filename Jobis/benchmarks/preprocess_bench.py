@@ -0,0 +1,91 @@
+"""전처리 처리량 벤치마크
+
+data/raw/dumy.py의 생성 함수로 합성 리뷰를 만들고, 워커 수별로 전처리 속도(rows/sec)를 측정합니다.
+메모리를 아끼기 위해 --unique-rows개만 실제로 생성하고, data_id만 바꿔가며 --rows개까지 반복해서 흘려보냅니다.
+
+    python benchmarks/preprocess_bench.py --rows 1000000 --workers 1,2,4,0
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 경로를 sys.path에 추가 (benchmarks/ 상위가 루트)
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+# data/raw는 패키지가 아니므로 경로를 직접 추가
+RAW_DIR = ROOT_DIR / 'data' / 'raw'
+if str(RAW_DIR) not in sys.path:
+    sys.path.append(str(RAW_DIR))
+
+import dumy
+from rag.preprocessing import COMPANY_CHUNK_SIZE, iter_processed
+
+REVIEWS_PER_COMPANY = 100
+
+def build_review_pool(unique_rows, seed):
+    print(f"합성 리뷰 {unique_rows}개 생성 중... (seed={seed})")
+    dumy.seed_random(seed)
+    pool = []
+    for i in range(unique_rows):
+        sector_name = dumy.INDUSTRIES[i % len(dumy.INDUSTRIES)]
+        pool.append((sector_name, dumy.generate_review(sector_name, i + 1)["review"]))
+    return pool
+
+def iter_companies(pool, rows):
+    """pool을 반복하면서 기업당 REVIEWS_PER_COMPANY개씩, 총 rows개의 리뷰를 가진 기업 목록을 만듭니다."""
+    for company_index, start in enumerate(range(0, rows, REVIEWS_PER_COMPANY)):
+        count = min(REVIEWS_PER_COMPANY, rows - start)
+        sector_name = pool[start % len(pool)][0]
+        yield {
+            "company_id": f"CID{company_index:06d}",
+            "company_name": f"벤치마크기업{company_index}",
+            "industry": sector_name,
+            "data": [
+                {
+                    "type": "review",
+                    "data_id": f"{start + i + 1}_R",
+                    "review": pool[(start + i) % len(pool)][1],
+                }
+                for i in range(count)
+            ],
+        }
+
+def run(pool, rows, num_workers, chunk_size):
+    started = time.perf_counter()
+    processed = 0
+    previous_id = 0
+    for item in iter_processed(iter_companies(pool, rows), num_workers, chunk_size):
+        # 병렬 처리에서도 data_id 순서가 입력과 같아야 합니다.
+        current_id = int(item["data_id"].split("_")[0])
+        if current_id <= previous_id:
+            raise AssertionError(f"출력 순서가 바뀌었습니다: {previous_id} -> {current_id}")
+        previous_id = current_id
+        processed += 1
+    elapsed = time.perf_counter() - started
+    return processed, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="전처리 처리량 벤치마크")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="전처리할 리뷰 수")
+    parser.add_argument("--unique-rows", type=int, default=20_000, help="실제로 생성해 반복 사용할 리뷰 수")
+    parser.add_argument("--workers", default="1,2,4,0", help="쉼표로 구분한 워커 수 목록 (0이면 CPU 코어 수)")
+    parser.add_argument("--chunk-size", type=int, default=COMPANY_CHUNK_SIZE, help="워커에 한 번에 넘기는 기업 수")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    pool = build_review_pool(min(args.unique_rows, args.rows), args.seed)
+    worker_counts = [int(value) or os.cpu_count() for value in args.workers.split(",")]
+
+    print(f"\n{'workers':>8} {'rows':>10} {'seconds':>9} {'rows/sec':>10} {'speedup':>8}")
+    baseline = None
+    for num_workers in worker_counts:
+        processed, elapsed = run(pool, args.rows, num_workers, args.chunk_size)
+        rows_per_sec = processed / elapsed
+        baseline = baseline or rows_per_sec
+        print(f"{num_workers:>8} {processed:>10} {elapsed:>9.1f} {rows_per_sec:>10.0f} {rows_per_sec / baseline:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
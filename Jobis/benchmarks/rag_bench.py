@@ -0,0 +1,291 @@
+"""RAG 전 구간 지연 시간 벤치마크
+
+data/raw/dumy.py로 만든 고정 코퍼스(기본 data/bench/)에 대해 README 예시 질문 + 코퍼스에서 만든 질문을 실행하고
+1) 단계별(질문 임베딩 / 검색 / format_docs / 프롬프트 / LLM) p50/p95/p99
+2) 동시 요청 수별 QPS (JobisChatbot.aask)
+3) 생성 질문의 검색 recall@k
+를 측정합니다. LLM은 지연 시간을 정할 수 있는 로컬 가짜 LLM(FakeChatModel)을 사용합니다.
+저장된 기준값(--baseline)이 있으면 비교 결과를 함께 출력합니다.
+
+    python benchmarks/rag_bench.py --save-baseline          # 기준값 저장
+    python benchmarks/rag_bench.py --fail-on-regression 20  # 기준값보다 20% 이상 나빠지면 종료 코드 1
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# 프로젝트 루트 경로를 sys.path에 추가 (benchmarks/ 상위가 루트)
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+# data/raw는 패키지가 아니므로 경로를 직접 추가
+RAW_DIR = ROOT_DIR / 'data' / 'raw'
+if str(RAW_DIR) not in sys.path:
+    sys.path.append(str(RAW_DIR))
+
+import dumy
+from rag import embedding as embedding_module
+from rag import vectorstore as vectorstore_module
+from rag.embedder import get_embeddings
+from rag.fake_llm import FakeChatModel
+from rag.lexical_index import LexicalIndex
+from rag.pipeline import build_prompt, format_docs
+from rag.preprocessing import iter_processed, load_processed_items
+from rag.processed_store import write_processed_table
+from rag.query_analyzer import QueryAnalyzer
+from rag.retriever import get_retriever
+
+BENCH_DIR = ROOT_DIR / 'data' / 'bench'
+CORPUS_END_DATE = datetime(2025, 1, 1)  # 날짜까지 고정해 같은 seed면 같은 코퍼스
+STAGES = ["embed", "search", "format_docs", "prompt", "llm", "total"]
+MIN_LATENCY_DELTA_MS = 1.0  # 1ms 미만의 지연 시간 변화는 측정 잡음으로 보고 회귀로 판단하지 않음
+
+# README의 예시 질문
+README_QUERIES = [
+    "삼성전자 리뷰에서 직원들이 말하는 장점 알려줘.",
+    "네이버와 카카오 리뷰 비교해줘.",
+    "LG화학 면접 질문은 어떤 편이야?",
+    "대한항공과 현대글로비스의 공통 단점이 뭐야?",
+    "삼성전자·네이버·LG화학 리뷰 기반으로 IT 업계 특징 분석해줘.",
+    "복지가 좋은 회사는 어디야?",
+]
+
+class TimedEmbeddings(Embeddings):
+    """임베딩 호출 시간을 누적하는 래퍼 (검색 단계에서 질문 임베딩 시간만 분리하기 위함)"""
+
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+        self.elapsed = 0.0
+
+    def embed_documents(self, texts):
+        started = time.perf_counter()
+        try:
+            return self.embeddings.embed_documents(texts)
+        finally:
+            self.elapsed += time.perf_counter() - started
+
+    def embed_query(self, text):
+        started = time.perf_counter()
+        try:
+            return self.embeddings.embed_query(text)
+        finally:
+            self.elapsed += time.perf_counter() - started
+
+def use_corpus(corpus_dir):
+    """벤치마크 코퍼스 경로를 전처리/벡터 DB 모듈에 적용합니다."""
+    embedding_module.INPUT_FILE = str(corpus_dir / 'cleaned_data.json')
+    embedding_module.PERSIST_PATH = str(corpus_dir / 'chroma_db')
+    vectorstore_module.PERSIST_PATH = embedding_module.PERSIST_PATH
+
+def build_corpus(corpus_dir, companies_per_industry, records_per_company, seed):
+    print(f"코퍼스 생성 중... ({corpus_dir}, 업종당 기업 {companies_per_industry}개 × 데이터 {records_per_company}개)")
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    dumy.END_DATE = CORPUS_END_DATE
+    total_companies = len(dumy.INDUSTRIES) * companies_per_industry
+    companies = (
+        json.loads(dumy.generate_company((index, companies_per_industry, records_per_company, seed)))
+        for index in range(total_companies)
+    )
+    count = write_processed_table(iter_processed(companies), str(corpus_dir / 'cleaned_data.parquet'))
+    print(f"   - 전처리 항목 {count}개")
+
+    use_corpus(corpus_dir)
+    embedding_module.build_vector_db(rebuild=True)
+
+def make_generated_queries(num_queries, seed):
+    """코퍼스 문장으로 질문을 만들고, 같은 기업에서 그 문장을 가진 문서를 정답으로 삼습니다."""
+    items = list(load_processed_items(embedding_module.INPUT_FILE, columns=["data_id", "company_name", "sentences"]))
+    rng = random.Random(seed)
+    picked = [item for item in rng.sample(items, min(num_queries, len(items))) if item.get("sentences")]
+
+    queries = []
+    for item in picked:
+        sentence = rng.choice(item["sentences"])
+        relevant = {
+            other["data_id"] for other in items
+            if other["company_name"] == item["company_name"] and sentence in other.get("sentences", [])
+        }
+        queries.append({"query": f"{item['company_name']} {sentence}", "relevant": relevant})
+    return queries
+
+def percentiles(values):
+    values = np.asarray(values) * 1000  # ms
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"p50": round(float(p50), 2), "p95": round(float(p95), 2), "p99": round(float(p99), 2)}
+
+def measure_stages(queries, k, llm_latency):
+    """질문마다 단계별 시간을 따로 잽니다. (순차 실행)"""
+    embeddings = TimedEmbeddings(get_embeddings(use_cache=False))
+    vectorstore = vectorstore_module.get_vectorstore(embeddings=embeddings)
+    retriever = get_retriever(
+        vectorstore,
+        k=k,
+        analyzer=QueryAnalyzer.load(vectorstore),
+        lexical_index=LexicalIndex.load(),
+    )
+    prompt = build_prompt()
+    llm = FakeChatModel(latency=llm_latency)
+
+    # 모델/인덱스 로딩 시간이 첫 질문에 섞이지 않도록 한 번 실행
+    retriever.invoke(queries[0]["query"])
+
+    timings = {stage: [] for stage in STAGES}
+    hits = []
+    for entry in queries:
+        query = entry["query"]
+        embeddings.elapsed = 0.0
+
+        started = time.perf_counter()
+        docs = retriever.invoke(query)
+        retrieved = time.perf_counter()
+        context = format_docs(docs)
+        formatted = time.perf_counter()
+        prompt_value = prompt.invoke({"context": context, "question": query})
+        prompted = time.perf_counter()
+        llm.invoke(prompt_value)
+        finished = time.perf_counter()
+
+        timings["embed"].append(embeddings.elapsed)
+        timings["search"].append(retrieved - started - embeddings.elapsed)
+        timings["format_docs"].append(formatted - retrieved)
+        timings["prompt"].append(prompted - formatted)
+        timings["llm"].append(finished - prompted)
+        timings["total"].append(finished - started)
+
+        if entry.get("relevant"):
+            retrieved_ids = {doc.metadata.get("data_id") for doc in docs[:k]}
+            hits.append(len(retrieved_ids & entry["relevant"]) / min(len(entry["relevant"]), k))
+
+    recall = round(float(np.mean(hits)), 4) if hits else None
+    return {stage: percentiles(values) for stage, values in timings.items()}, recall
+
+async def run_level(bot, queries, concurrency, total_requests):
+    gate = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def one_request(i):
+        nonlocal failures
+        async with gate:
+            answer = await bot.aask(queries[i % len(queries)])
+            if not answer.startswith("[FAKE]"):
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_request(i) for i in range(total_requests)))
+    elapsed = time.perf_counter() - started
+    if failures:
+        print(f"   - 동시 {concurrency}: 실패 {failures}건")
+    return total_requests / elapsed
+
+def measure_qps(queries, concurrency_levels, total_requests, llm_latency):
+    from rag.chatbot import JobisChatbot
+    from rag.resources import wait_until_ready
+
+    bot = JobisChatbot(llm=FakeChatModel(latency=llm_latency), use_answer_cache=False)
+    wait_until_ready()
+    return {
+        str(concurrency): round(asyncio.run(run_level(bot, queries, concurrency, total_requests)), 2)
+        for concurrency in concurrency_levels
+    }
+
+def flatten(results):
+    metrics = {}
+    for stage, values in results["stages"].items():
+        for name, value in values.items():
+            metrics[f"{stage}.{name}_ms"] = value
+    for concurrency, qps in results["qps"].items():
+        metrics[f"qps@{concurrency}"] = qps
+    if results["recall"] is not None:
+        metrics[f"recall@{results['k']}"] = results["recall"]
+    return metrics
+
+def compare(current, baseline, fail_threshold):
+    """기준값 대비 변화를 출력하고, 허용치보다 나빠진 지표 목록을 반환합니다."""
+    current_metrics, baseline_metrics = flatten(current), flatten(baseline)
+    regressions = []
+    print(f"\n{'지표':<22} {'기준값':>10} {'현재':>10} {'변화':>8}")
+    for name, value in current_metrics.items():
+        base = baseline_metrics.get(name)
+        if base in (None, 0):
+            continue
+        change = (value - base) / base * 100
+        # 지연 시간은 커질수록, QPS/recall은 작아질수록 나빠진 것
+        worse = change if name.endswith("_ms") else -change
+        significant = not name.endswith("_ms") or abs(value - base) >= MIN_LATENCY_DELTA_MS
+        mark = " ⚠" if fail_threshold is not None and worse > fail_threshold and significant else ""
+        if mark:
+            regressions.append(name)
+        print(f"{name:<22} {base:>10} {value:>10} {change:>+7.1f}%{mark}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Jobis RAG 전 구간 지연 시간 벤치마크")
+    parser.add_argument("--corpus-dir", type=Path, default=BENCH_DIR, help="벤치마크 코퍼스/벡터 DB 경로")
+    parser.add_argument("--rebuild-corpus", action="store_true", help="코퍼스를 새로 생성합니다.")
+    parser.add_argument("--companies-per-industry", type=int, default=3)
+    parser.add_argument("--records-per-company", type=int, default=20)
+    parser.add_argument("--generated-queries", type=int, default=50, help="코퍼스에서 만들 질문 수 (recall 측정용)")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="가짜 LLM 응답 지연 (초)")
+    parser.add_argument("--concurrency", default="1,4,16", help="QPS를 잴 동시 요청 수 목록 (쉼표 구분)")
+    parser.add_argument("--requests", type=int, default=32, help="동시성 단계별 총 요청 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", type=Path, help="기준값 JSON 경로 (기본: <corpus-dir>/rag_baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장합니다.")
+    parser.add_argument("--fail-on-regression", type=float, help="기준값보다 이 비율(%%) 이상 나빠진 지표가 있으면 실패")
+    args = parser.parse_args()
+
+    corpus_dir = args.corpus_dir
+    baseline_path = args.baseline or corpus_dir / 'rag_baseline.json'
+    if args.rebuild_corpus or not (corpus_dir / 'chroma_db').exists():
+        build_corpus(corpus_dir, args.companies_per_industry, args.records_per_company, args.seed)
+    use_corpus(corpus_dir)
+
+    generated = make_generated_queries(args.generated_queries, args.seed)
+    queries = [{"query": query} for query in README_QUERIES] + generated
+    print(f"질문 {len(queries)}개 (README {len(README_QUERIES)}개 + 생성 {len(generated)}개) | k={args.k} | "
+          f"가짜 LLM 지연 {args.llm_latency}초")
+
+    stages, recall = measure_stages(queries, args.k, args.llm_latency)
+    qps = measure_qps(
+        [entry["query"] for entry in queries],
+        [int(c) for c in args.concurrency.split(",")],
+        args.requests,
+        args.llm_latency,
+    )
+    results = {"k": args.k, "stages": stages, "qps": qps, "recall": recall}
+
+    print(f"\n{'단계':<12} {'p50(ms)':>10} {'p95(ms)':>10} {'p99(ms)':>10}")
+    for stage, values in stages.items():
+        print(f"{stage:<12} {values['p50']:>10.2f} {values['p95']:>10.2f} {values['p99']:>10.2f}")
+    print("\nQPS: " + " | ".join(f"동시 {c}: {value}" for c, value in qps.items()))
+    print(f"recall@{args.k}: {recall}")
+
+    exit_code = 0
+    if baseline_path.exists() and not args.save_baseline:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.fail_on_regression)
+        if regressions:
+            print(f"\n❌ 기준값 대비 {args.fail_on_regression}% 이상 나빠진 지표: {', '.join(regressions)}")
+            exit_code = 1
+
+    if args.save_baseline:
+        os.makedirs(baseline_path.parent, exist_ok=True)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n기준값 저장: {baseline_path}")
+
+    sys.exit(exit_code)
+
+if __name__ == "__main__":
+    main()
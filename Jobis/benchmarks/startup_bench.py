@@ -0,0 +1,136 @@
+"""챗봇 시작 시간 벤치마크
+
+새 파이썬 프로세스에서 측정하므로 모듈 캐시의 영향을 받지 않습니다.
+1) import 시간: `import rag.chatbot`에 걸린 시간과, 그 시점에 무거운 모듈(torch, chromadb 등)이 로드되었는지
+2) 콜드 스타트: JobisChatbot() 생성 → 백그라운드 워밍업 완료 → 첫 답변까지의 시간 (가짜 LLM 사용)
+
+import 시간이 --max-import-seconds를 넘거나 무거운 모듈이 import 시점에 로드되면 종료 코드 1을 반환합니다.
+
+    python benchmarks/startup_bench.py --runs 5
+    python benchmarks/startup_bench.py --persist-path data/bench/chroma_db  # rag_bench.py 코퍼스로 콜드 스타트 측정
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 경로 (benchmarks/ 상위가 루트)
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+# `import rag.chatbot`만으로 로드되면 안 되는 모듈 (처음 사용할 때 import)
+HEAVY_MODULES = [
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "langchain_huggingface",
+    "chromadb",
+    "langchain_chroma",
+    "langchain_google_genai",
+    "pyarrow",
+]
+QUERY = "복지가 좋은 회사는 어디야?"
+
+IMPORT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import rag.chatbot
+elapsed = time.perf_counter() - started
+print(json.dumps({"import_s": elapsed, "loaded": [m for m in HEAVY_MODULES if m in sys.modules]}))
+"""
+
+COLD_START_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import rag.chatbot
+import rag.resources
+import rag.vectorstore
+if PERSIST_PATH:
+    rag.vectorstore.PERSIST_PATH = PERSIST_PATH
+imported = time.perf_counter()
+bot = rag.chatbot.JobisChatbot()
+constructed = time.perf_counter()
+rag.resources.wait_until_ready()
+ready = time.perf_counter()
+answer = bot.ask(QUERY)
+answered = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - started,
+    "construct_s": constructed - imported,
+    "warm_up_s": ready - constructed,
+    "first_answer_s": answered - ready,
+    "total_s": answered - started,
+    "answer": answer[:80],
+}))
+"""
+
+def run_child(script, env, **constants):
+    header = "".join(f"{name} = {value!r}\n" for name, value in constants.items())
+    result = subprocess.run(
+        [sys.executable, "-c", header + script],
+        cwd=ROOT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"측정 프로세스 실패:\n{result.stderr.strip()}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def summarize(runs, key):
+    values = [run[key] for run in runs]
+    return statistics.median(values), min(values), max(values)
+
+def main():
+    parser = argparse.ArgumentParser(description="챗봇 시작 시간 벤치마크")
+    parser.add_argument("--runs", type=int, default=5, help="새 프로세스로 반복 측정할 횟수")
+    parser.add_argument("--persist-path", help="콜드 스타트에 사용할 벡터 DB 경로 (기본: data/chroma_db)")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="가짜 LLM 지연 (초)")
+    parser.add_argument("--skip-cold-start", action="store_true", help="import 시간만 측정")
+    parser.add_argument("--max-import-seconds", type=float, default=2.0, help="허용할 import 시간 중앙값 (초)")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT_DIR), env.get("PYTHONPATH")]))
+    env["JOBIS_LLM"] = "fake"
+    env["JOBIS_FAKE_LLM_LATENCY"] = str(args.llm_latency)
+
+    print(f"1) import rag.chatbot ({args.runs}회, 새 프로세스)")
+    import_runs = [run_child(IMPORT_SCRIPT, env, HEAVY_MODULES=HEAVY_MODULES) for _ in range(args.runs)]
+    median, fastest, slowest = summarize(import_runs, "import_s")
+    leaked = sorted({module for run in import_runs for module in run["loaded"]})
+    print(f"   중앙값 {median:.3f}s (최소 {fastest:.3f}s, 최대 {slowest:.3f}s)")
+    print(f"   import 시점에 로드된 무거운 모듈: {', '.join(leaked) if leaked else '없음'}")
+
+    if not args.skip_cold_start:
+        persist_path = args.persist_path or str(ROOT_DIR / "data" / "chroma_db")
+        if not os.path.exists(persist_path):
+            print(f"\n2) 콜드 스타트 생략: 벡터 DB가 없습니다. ({persist_path})")
+        else:
+            print(f"\n2) 콜드 스타트 ({args.runs}회, 벡터 DB {persist_path})")
+            cold_runs = [
+                run_child(COLD_START_SCRIPT, env, PERSIST_PATH=args.persist_path, QUERY=QUERY)
+                for _ in range(args.runs)
+            ]
+            print(f"   {'단계':<16} {'중앙값(s)':>10} {'최소(s)':>9} {'최대(s)':>9}")
+            for key, label in [
+                ("import_s", "import"),
+                ("construct_s", "JobisChatbot()"),
+                ("warm_up_s", "워밍업 대기"),
+                ("first_answer_s", "첫 답변"),
+                ("total_s", "합계"),
+            ]:
+                median_s, fastest_s, slowest_s = summarize(cold_runs, key)
+                print(f"   {label:<16} {median_s:>10.3f} {fastest_s:>9.3f} {slowest_s:>9.3f}")
+            print(f"   첫 답변: {cold_runs[-1]['answer']}")
+
+    if leaked or median > args.max_import_seconds:
+        print(f"\n❌ import 시간이 {args.max_import_seconds}s를 넘었거나 무거운 모듈이 import 시점에 로드되었습니다.")
+        sys.exit(1)
+    print("\n✅ 시작 시간이 기준 안에 있습니다.")
+
+if __name__ == "__main__":
+    main()
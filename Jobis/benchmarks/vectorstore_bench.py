@@ -0,0 +1,188 @@
+"""검색 백엔드 벤치마크 (Chroma vs 로컬 mmap IVF 인덱스)
+
+rag_bench.py와 같은 합성 코퍼스의 벡터 DB를 로컬 인덱스(rag/local_index.py)로 내보낸 뒤
+1) 열기 시간: 새 프로세스에서 import / 벡터스토어 열기 / 첫 검색에 걸린 시간
+2) 검색 지연 시간 (질문 임베딩 제외, 필터 없음 / 기업명 필터, p50/p95)
+3) 정확 검색(전체 내적) 대비 top-k 겹침 비율과 recall@k
+4) 디스크 사용량
+을 비교합니다.
+
+    python benchmarks/vectorstore_bench.py --k 10 --nprobe 16
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트 경로를 sys.path에 추가 (benchmarks/ 상위가 루트)
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from rag_bench import build_corpus, make_generated_queries, use_corpus
+from rag import vectorstore as vectorstore_module
+from rag.embedder import get_embeddings
+from rag.lexical_index import LEXICAL_INDEX_DIR
+from rag.local_index import DEFAULT_NPROBE, LOCAL_INDEX_DIR, export_local_index, get_local_index_dir
+
+BACKENDS = ["chroma", "local"]
+
+OPEN_SCRIPT = """
+import json, time
+started = time.perf_counter()
+from langchain_core.embeddings import FakeEmbeddings
+import rag.vectorstore
+if BACKEND == "chroma":
+    import langchain_chroma
+else:
+    import rag.local_index
+rag.vectorstore.PERSIST_PATH = PERSIST_PATH
+imported = time.perf_counter()
+vectorstore = rag.vectorstore.get_vectorstore(embeddings=FakeEmbeddings(size=DIM), backend=BACKEND)
+opened = time.perf_counter()
+vectorstore.similarity_search_by_vector([1.0] * DIM, k=K)
+searched = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "open_ms": (opened - imported) * 1000,
+    "first_search_ms": (searched - opened) * 1000,
+}))
+"""
+
+def directory_size(path, exclude=()):
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(path)
+        if not any(part in exclude for part in Path(root).relative_to(path).parts)
+        for name in files
+    )
+
+def measure_open(backend, dim, k, runs):
+    """새 프로세스에서 열기 시간을 측정합니다. (이미 import된 모듈의 영향 제거)"""
+    header = f"PERSIST_PATH = {vectorstore_module.PERSIST_PATH!r}\nDIM = {dim}\nK = {k}\nBACKEND = {backend!r}\n"
+    results = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", header + OPEN_SCRIPT],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=False,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"측정 프로세스 실패:\n{result.stderr.strip()}")
+        results.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return {key: float(np.median([run[key] for run in results])) for key in results[0]}
+
+def measure_search(vectorstore, query_vectors, filters, k):
+    vectorstore.similarity_search_by_vector(query_vectors[0], k=k)  # 인덱스 로딩은 측정에서 제외
+
+    latencies, results = [], []
+    for vector, where in zip(query_vectors, filters):
+        kwargs = {"filter": where} if where else {}
+        started = time.perf_counter()
+        docs = vectorstore.similarity_search_by_vector(vector, k=k, **kwargs)
+        latencies.append(time.perf_counter() - started)
+        results.append([doc.metadata.get("data_id") for doc in docs])
+    p50, p95 = np.percentile(np.asarray(latencies) * 1000, [50, 95])
+    return {"p50_ms": float(p50), "p95_ms": float(p95), "results": results}
+
+def exact_search(local_store, query_vectors, filters, k):
+    """로컬 인덱스의 전체 벡터 행렬로 정확한 top-k를 구합니다. (겹침 비율 기준)"""
+    vectors = np.asarray(local_store.vectors)
+    data_ids = local_store.table.column("data_id").to_pylist()
+    results = []
+    for vector, where in zip(query_vectors, filters):
+        query = np.asarray(vector, dtype=np.float32)
+        scores = vectors @ (query / np.linalg.norm(query))
+        if where:
+            scores[~local_store._filter_mask(where)] = -np.inf
+        top = np.argsort(-scores)[:k]
+        results.append([data_ids[row] for row in top if np.isfinite(scores[row])])
+    return results
+
+def overlap(reference, candidate):
+    return float(np.mean([
+        len(set(ref) & set(cand)) / len(ref) for ref, cand in zip(reference, candidate) if ref
+    ]))
+
+def recall(results, queries, k):
+    hits = [
+        len(set(ids) & entry["relevant"]) / min(len(entry["relevant"]), k)
+        for ids, entry in zip(results, queries) if entry["relevant"]
+    ]
+    return float(np.mean(hits)) if hits else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description="검색 백엔드 벤치마크 (Chroma vs 로컬 인덱스)")
+    parser.add_argument("--corpus-dir", default=str(ROOT_DIR / "data" / "bench"), help="rag_bench.py와 같은 코퍼스 폴더")
+    parser.add_argument("--rebuild-corpus", action="store_true", help="코퍼스와 벡터 DB를 모두 다시 만듭니다.")
+    parser.add_argument("--companies-per-industry", type=int, default=3)
+    parser.add_argument("--records-per-company", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=200, help="검색 질문 수")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=DEFAULT_NPROBE, help="로컬 인덱스에서 살펴볼 IVF 리스트 수")
+    parser.add_argument("--nlist", type=int, help="IVF 리스트 수 (기본: 4 * sqrt(문서 수))")
+    parser.add_argument("--open-runs", type=int, default=3, help="열기 시간 측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    corpus_dir = Path(args.corpus_dir)
+    if args.rebuild_corpus or not (corpus_dir / "chroma_db").exists():
+        build_corpus(corpus_dir, args.companies_per_industry, args.records_per_company, args.seed)
+    use_corpus(corpus_dir)
+
+    started = time.perf_counter()
+    export_local_index(nlist=args.nlist)
+    export_seconds = time.perf_counter() - started
+
+    embeddings = get_embeddings()
+    stores = {backend: vectorstore_module.get_vectorstore(embeddings=embeddings, backend=backend) for backend in BACKENDS}
+    local_store = stores["local"]
+    local_store.nprobe = args.nprobe
+
+    queries = make_generated_queries(args.queries, args.seed)
+    query_vectors = [local_store.embeddings.embed_query(entry["query"]) for entry in queries]
+    # 기업명 필터: 질문을 만든 기업 (정답 문서의 기업명)
+    companies = [
+        local_store.get(ids=sorted(entry["relevant"])[:1])["metadatas"][0]["company_name"] if entry["relevant"] else None
+        for entry in queries
+    ]
+    modes = {
+        "전체": [None] * len(queries),
+        "기업 필터": [{"company_name": company} if company else None for company in companies],
+    }
+
+    dim = local_store.meta["dim"]
+    persist_path = vectorstore_module.PERSIST_PATH
+    disk_mb = {
+        "chroma": directory_size(persist_path, exclude=(LOCAL_INDEX_DIR, LEXICAL_INDEX_DIR)) / 1024 ** 2,
+        "local": directory_size(get_local_index_dir()) / 1024 ** 2,
+    }
+
+    print(
+        f"\n문서 {local_store.count()}개 | {dim}차원 | 질문 {len(queries)}개 | k={args.k} | "
+        f"IVF {local_store.meta['nlist']}개 리스트, nprobe={args.nprobe} | 내보내기 {export_seconds:.1f}초"
+    )
+    print(f"{'backend':>8} {'import(ms)':>10} {'열기(ms)':>9} {'첫 검색(ms)':>11} {'디스크(MB)':>10}")
+    for backend in BACKENDS:
+        opened = measure_open(backend, dim, args.k, args.open_runs)
+        print(
+            f"{backend:>8} {opened['import_ms']:>10.1f} {opened['open_ms']:>9.1f} "
+            f"{opened['first_search_ms']:>11.2f} {disk_mb[backend]:>10.2f}"
+        )
+
+    print(f"\n{'mode':>8} {'backend':>8} {'p50(ms)':>8} {'p95(ms)':>8} {'정확 검색 겹침':>13} {'recall@k':>9}")
+    for mode, filters in modes.items():
+        exact = exact_search(local_store, query_vectors, filters, args.k)
+        for backend in BACKENDS:
+            result = measure_search(stores[backend], query_vectors, filters, args.k)
+            print(
+                f"{mode:>8} {backend:>8} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                f"{overlap(exact, result['results']):>13.3f} {recall(result['results'], queries, args.k):>9.3f}"
+            )
+
+if __name__ == "__main__":
+    main()
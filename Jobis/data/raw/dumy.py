@@ -1,6 +1,14 @@
+import argparse
 import json
+import os
 import random
+import time
+from collections import deque
 from datetime import datetime, timedelta
+from itertools import islice
+from multiprocessing import Pool
+
+import numpy as np
 
 # --- 1. 상수 정의 및 설정 ---
 # 업종별 기업명을 현실적으로 반영하기 위한 더미 리스트
@@ -275,9 +283,21 @@ COMPANY_TEMPLATES = {
 LEVELS = ["매우쉬움", "쉬움", "보통", "어려움", "매우어려움"]
 MISSING_RATE = 0.1  # 10% 확률로 결측치 발생
 
+# 생성기 기본값 (기존 고정 규모: 10개 업종 × 기업 10개 × 리뷰/면접 20개)
+DEFAULT_COMPANIES_PER_INDUSTRY = 10
+DEFAULT_RECORDS_PER_COMPANY = 20
+OUTPUT_FORMATS = ("json", "jsonl")
+PROGRESS_EVERY = 1000  # 이 기업 수마다 진행 상황 출력
+GENERATE_CHUNK_SIZE = 16  # 워커에 한 번에 넘기는 기업 수
+END_DATE = None  # 날짜 생성 기준일 (None이면 오늘). 같은 seed로 같은 결과를 얻으려면 고정
+
+# 템플릿 문구에 들어가는 업종은 실행할 때마다 바뀌지 않도록 고정 seed로 선택
+_TEMPLATE_RNG = random.Random(0)
+
 # --- 1-1. 텍스트 다양성 확대를 위한 새로운 템플릿 목록 (창의성/다양성 대폭 강화) ---
 
-POSITIVE_TEMPLATES = [
+# 템플릿은 생성 중에 절대 바뀌지 않도록 tuple로 정의
+POSITIVE_TEMPLATES = (
     # 기술 및 성장 관련 (학생님 관심사)
     "주니어에게도 MLOps 파이프라인 설계 기회가 주어지며, 최신 기술 도입에 적극적입니다. 파이썬 기반의 데이터 분석 환경이 잘 구축되어 있어 성장에 최적화된 곳입니다.",
     "정기적으로 딥러닝 스터디를 진행하고, 트랜스포머 아키텍처 같은 심화 주제에 대한 지원이 확실합니다. 기술 블로그 운영을 장려하며 지식 공유 문화가 훌륭합니다.",
@@ -303,15 +323,15 @@ POSITIVE_TEMPLATES = [
     f"[은행/금융업] 금융 거래 데이터 분석을 통한 이상 탐지 모델 개발에 참여했습니다. 민감 데이터 처리 경험을 쌓기 좋습니다.",
     f"[의료/제약/복지] 의료 영상 데이터 기반의 딥러닝 진단 보조 시스템 구축 프로젝트는 높은 가치를 창출합니다.",
     f"[제조/화학] 공정 최적화를 위한 시계열 분석 프로젝트는 데이터 분석가로서의 커리어를 넓히는 기회였습니다.",
-    f"[{INDUSTRIES[random.randint(0, 9)]}] 업종 내에서 시장 점유율이 높고, 안정적인 현금 흐름을 바탕으로 장기 근속이 가능한 좋은 회사입니다.",
+    f"[{INDUSTRIES[_TEMPLATE_RNG.randint(0, 9)]}] 업종 내에서 시장 점유율이 높고, 안정적인 현금 흐름을 바탕으로 장기 근속이 가능한 좋은 회사입니다.",
     "최신 IT 트렌드를 놓치지 않으려는 노력이 보입니다. 매주 신기술 동향 보고회를 통해 전사적인 학습이 이루어집니다.",
     "회사 내부의 작은 갤러리나 휴게 공간이 예술적으로 꾸며져 있어, 창의적인 영감을 얻기 좋습니다.",
     "새로운 시도를 두려워하지 않는 스타트업 정신이 남아있어, 수평적인 관계 속에서 아이디어를 자유롭게 개진할 수 있습니다.",
     "점심 식사를 뷔페식으로 제공하고 커피차가 상주하는 등, 소소하지만 확실한 복지가 생활의 만족도를 높여줍니다.",
     "원격 근무가 활성화되어 있어 출퇴근 스트레스 없이 업무에 집중할 수 있습니다. 장비 지원도 최고 사양입니다."
-]
+)
 
-NEGATIVE_TEMPLATES = [
+NEGATIVE_TEMPLATES = (
     # 기술 및 성장 관련 (학생님 관심사)
     "데이터 분석 환경이 너무 오래된 레거시 시스템에 의존합니다. 파이썬 2.7 환경을 벗어나지 못해 최신 트랜스포머 모델을 적용할 엄두도 내지 못하고 있습니다.",
     "개인의 성장을 위한 교육 지원이 전무합니다. 텐서플로우나 MLOps 같은 신기술은 개인 시간을 할애해서 독학해야 하며, 회사 차원의 투자가 전혀 없습니다.",
@@ -337,43 +357,68 @@ NEGATIVE_TEMPLATES = [
     "업무 외적인 친목 활동(강제 회식, 주말 등산 등) 참여를 강요하는 분위기가 있어 개인 시간이 부족합니다.",
     
     # 면접 관련 (심층적/부정적 질문 추가)
-    f"[{INDUSTRIES[random.randint(0, 9)]}] 업종 특성상 보수적인 문화가 강해, 새로운 시도나 아이디어는 무조건 거부당하는 분위기입니다.",
+    f"[{INDUSTRIES[_TEMPLATE_RNG.randint(0, 9)]}] 업종 특성상 보수적인 문화가 강해, 새로운 시도나 아이디어는 무조건 거부당하는 분위기입니다.",
     f"[IT/웹/통신] 금융 거래 데이터 분석을 통한 이상 탐지 모델 개발에 참여했습니다. 민감 데이터 처리 경험을 쌓기 좋습니다.",
     "MLOps 파이프라인 설계 경험 중 가장 처리가 어려웠던 데이터 버전 관리(Data Versioning) 이슈와 해결 방법을 설명해 주세요.",
     "정규화 모델(L1, L2)의 수학적 원리를 설명하고, 대용량 데이터셋에서 L2 정규화가 L1보다 계산 효율이 좋은 이유를 구체적으로 기술하시오.",
     "K-means 클러스터링을 적용할 때 초기 중심값 설정에 따라 결과가 달라지는 문제를 어떻게 해결했는지, 구체적인 방법(K-means++)과 그 원리를 설명해 보세요."
-]
+)
+
+# 긴 부정 텍스트(리뷰 단점, 면접 질문)에 함께 섞는 심층 면접 질문 ({sector_name}은 업종명으로 치환)
+INTERVIEW_QUESTION_TEMPLATES = (
+    "[{sector_name}] 지원자가 경험한 가장 복잡했던 데이터 분석 프로젝트에 대해 설명하시오. 이때 발생한 결측치 처리 방법과 왜 그 방법을 선택했는지 기술적 근거를 제시해주세요. (Data Analysis)",
+    "트랜스포머의 인코더와 디코더의 역할 차이점을 설명하고, 시퀀스 투 시퀀스 학습에서 어떻게 활용되는지 구체적인 예시(예: 번역 모델)를 들어 설명하시오. (Deep Learning)",
+    "회귀분석 모델을 구축할 때 과적합(Overfitting)을 방지하기 위한 정규화 모델(L1, L2)의 원리를 설명하고, 언제 어떤 정규화 기법을 적용해야 하는지 판단 기준을 설명해 주세요. (Machine Learning)",
+)
+
+def build_template_pools():
+    """업종별 템플릿 풀(positive / negative / negative_long)을 미리 만들어 둠"""
+    pools = {}
+    for sector_name in INDUSTRIES:
+        questions = tuple(template.format(sector_name=sector_name) for template in INTERVIEW_QUESTION_TEMPLATES)
+        pools[sector_name] = {
+            "positive": POSITIVE_TEMPLATES,
+            "negative": NEGATIVE_TEMPLATES,
+            "negative_long": NEGATIVE_TEMPLATES + questions,
+        }
+    return pools
+
+TEMPLATE_POOLS = build_template_pools()
+
+# 문장 선택용 NumPy 난수 생성기 (seed_random으로 random 모듈과 함께 초기화)
+_np_rng = np.random.default_rng()
+
+def seed_random(seed):
+    """random 모듈과 NumPy 난수 생성기를 같은 seed로 초기화"""
+    global _np_rng
+    random.seed(seed)
+    _np_rng = np.random.default_rng(seed)
 
 
 # --- 2. 헬퍼 함수: 랜덤 데이터 생성 ---
 
 def get_random_date(days_ago=365):
     """최근 1년 이내의 랜덤 날짜 (YYYY-MM-DD) 반환"""
-    end_date = datetime.now()
+    end_date = END_DATE or datetime.now()
     start_date = end_date - timedelta(days=days_ago)
     random_date = start_date + (end_date - start_date) * random.random()
     return random_date.strftime("%Y-%m-%d")
 
 def get_random_text(min_len, max_len, sector_name, is_positive=True):
-    """최소-최대 길이 범위의 랜덤 텍스트를 생성 (긍정/부정 템플릿 사용)"""
-    
-    templates = POSITIVE_TEMPLATES if is_positive else NEGATIVE_TEMPLATES
-    
-    # 면접 질문을 위한 별도 템플릿 추가
-    if min_len >= 30 and not is_positive: 
-        templates.extend([
-            f"[{sector_name}] 지원자가 경험한 가장 복잡했던 데이터 분석 프로젝트에 대해 설명하시오. 이때 발생한 결측치 처리 방법과 왜 그 방법을 선택했는지 기술적 근거를 제시해주세요. (Data Analysis)",
-            "트랜스포머의 인코더와 디코더의 역할 차이점을 설명하고, 시퀀스 투 시퀀스 학습에서 어떻게 활용되는지 구체적인 예시(예: 번역 모델)를 들어 설명하시오. (Deep Learning)",
-            "회귀분석 모델을 구축할 때 과적합(Overfitting)을 방지하기 위한 정규화 모델(L1, L2)의 원리를 설명하고, 언제 어떤 정규화 기법을 적용해야 하는지 판단 기준을 설명해 주세요. (Machine Learning)",
-        ])
-
-    base_text = random.choice(templates)
+    """최소-최대 길이 범위의 랜덤 텍스트를 생성 (업종별로 미리 만든 템플릿 풀 사용)"""
+    pools = TEMPLATE_POOLS[sector_name]
+    if is_positive:
+        templates = pools["positive"]
+    elif min_len >= 30:
+        # 긴 부정 텍스트(단점, 면접 질문)에는 심층 면접 질문도 섞음
+        templates = pools["negative_long"]
+    else:
+        templates = pools["negative"]
     
-    # 문장의 길이를 늘리기 위해 반복
-    # 텍스트 길이를 늘릴 때, 불필요한 반복을 줄이고 다양한 템플릿의 문장을 섞음
+    # 문장의 길이를 늘리기 위해 여러 템플릿을 섞음 (문장 인덱스를 NumPy로 한 번에 뽑음)
     num_sentences = random.randint(3, 8)
-    long_text_parts = random.choices(templates, k=num_sentences)
-    long_text = " ".join(long_text_parts)
+    indices = _np_rng.integers(len(templates), size=num_sentences).tolist()
+    long_text = " ".join([templates[index] for index in indices])
     
     # 최종적으로 길이를 자르거나 조정 (최소 길이는 보장)
     if len(long_text) > max_len:
@@ -452,57 +497,151 @@ def generate_interview(sector_name, data_id):
 
 
 # --- 4. 메인 데이터 생성 로직 ---
-def generate_jobis_data_file():
-    all_jobis_data = []
-    company_counter = 0
-    data_id_counter = 0
+def get_company_name(sector_name, index):
+    """업종별 기업명 템플릿을 순서대로 쓰고, 모자라면 번호를 붙여 이름을 늘림"""
+    templates = COMPANY_TEMPLATES[sector_name]
+    base_name = templates[index % len(templates)]
+    rounds = index // len(templates)
+    return base_name if rounds == 0 else f"{base_name} {rounds + 1}호"
+
+def generate_company(task):
+    """기업 하나(리뷰/면접을 번갈아 records_per_company개)를 만들어 JSON 문자열로 반환 (워커 프로세스에서 실행)"""
+    company_index, companies_per_industry, records_per_company, seed = task
+    sector_name = INDUSTRIES[company_index // companies_per_industry]
+
+    # 기업마다 seed를 따로 정해 워커 수나 처리 순서와 관계없이 같은 결과가 나오도록 함
+    seed_random(seed * 1_000_003 + company_index)
+
+    company_data_list = []
+    first_id = company_index * records_per_company
+    for i in range(records_per_company):
+        data_id = first_id + i + 1
+        if i % 2 == 0:
+            company_data_list.append(generate_review(sector_name, data_id))
+        else:
+            company_data_list.append(generate_interview(sector_name, data_id))
+
+    # 최종 기업 객체 구조
+    company_obj = {
+        "company_id": f"CID{company_index + 1:03d}",
+        "company_name": get_company_name(sector_name, company_index % companies_per_industry),
+        "industry": sector_name,
+        "data": company_data_list
+    }
+    return json.dumps(company_obj, ensure_ascii=False)
+
+def generate_company_chunk(tasks):
+    """기업 여러 개를 한 번에 생성 (워커와 주고받는 횟수를 줄이기 위함)"""
+    return [generate_company(task) for task in tasks]
+
+def iter_generated(pool, tasks, num_workers, chunk_size=GENERATE_CHUNK_SIZE):
+    """기업을 워커 풀에서 생성해 입력 순서대로 반환합니다.
+
+    pool.imap은 쓰기가 느려도 결과를 계속 쌓으므로, 진행 중인 묶음 수를 제한해 메모리 사용량을 일정하게 유지
+    """
+    max_inflight = num_workers * 2
+    inflight = deque()
+    while True:
+        chunk = list(islice(tasks, chunk_size))
+        if not chunk:
+            break
+        inflight.append(pool.apply_async(generate_company_chunk, (chunk,)))
+        if len(inflight) >= max_inflight:
+            yield from inflight.popleft().get()
+    while inflight:
+        yield from inflight.popleft().get()
+
+def _init_worker(end_date):
+    global END_DATE
+    END_DATE = end_date
+
+def generate_jobis_data_file(
+    output_file="jobis_rag_data.json",
+    companies_per_industry=DEFAULT_COMPANIES_PER_INDUSTRY,
+    records_per_company=DEFAULT_RECORDS_PER_COMPANY,
+    output_format=None,
+    seed=None,
+    num_workers=1,
+    end_date=None,
+):
+    """더미 데이터를 기업 단위로 생성하면서 바로 파일에 씀 (전체를 메모리에 올리지 않음)
+
+    output_format이 json이면 기업 객체 배열, jsonl이면 한 줄에 기업 하나를 씀
+    """
+    output_format = output_format or ("jsonl" if output_file.endswith(".jsonl") else "json")
+    if seed is None:
+        seed = random.randrange(2 ** 31)
+    end_date = end_date or datetime.now()
+    total_companies = len(INDUSTRIES) * companies_per_industry
+    total_records = total_companies * records_per_company
+
+    print(f"--- Jobis RAG 더미 데이터 생성 시작 (기업 {total_companies}개, 총 {total_records}개 목표) ---")
+    print(f"seed={seed} | 기준일={end_date:%Y-%m-%d} | 워커 {num_workers}개 | 형식 {output_format}")
+
+    tasks = ((index, companies_per_industry, records_per_company, seed) for index in range(total_companies))
+    started = time.perf_counter()
+    tmp_file = output_file + ".tmp"
+    pool = None
 
-    print("--- Jobis RAG 더미 데이터 생성 시작 (총 10,000개 목표) ---")
-    
-    # 10개 업종을 순회 (INDUSTRIES 리스트 길이만큼 자동으로 반복)
-    for sector_name in INDUSTRIES:
-        # 각 업종별로 10개 기업 생성
-        sector_companies = [f"{template}" for template in COMPANY_TEMPLATES[sector_name][:10]]
-        
-        for company_name in sector_companies:
-            company_counter += 1
-            company_data_list = []
-            
-            # --- 변경 사항: 각 기업별로 리뷰 10개, 면접 후기 10개 생성 ---
-
-            for i in range(10): 
-                data_id_counter += 1
-                company_data_list.append(generate_review(sector_name, data_id_counter))
-                
-                data_id_counter += 1
-                company_data_list.append(generate_interview(sector_name, data_id_counter))
-
-            # 최종 기업 객체 구조
-            company_obj = {
-                "company_id": f"CID{company_counter:03d}",
-                "company_name": company_name,
-                "industry": sector_name,
-                "data": company_data_list
-            }
-            all_jobis_data.append(company_obj)
-            
-            print(f"  [+] 생성 완료: {company_name} ({sector_name}) - 데이터 {len(company_data_list)}개")
-
-    # --- 5. JSON 파일 저장 ---
-    FILE_NAME = "jobis_rag_data.json"
     try:
-        with open(FILE_NAME, 'w', encoding='utf-8') as f:
-            # indent=2를 사용하여 사람이 읽기 쉬운 형태로 저장
-            json.dump(all_jobis_data, f, ensure_ascii=False, indent=2)
-        
-        # 최종 총 데이터 수 (100개 기업 * 100개 데이터 = 10,000개)
+        # 워커 수와 관계없이 기업 순서대로 기록
+        if num_workers > 1:
+            pool = Pool(num_workers, initializer=_init_worker, initargs=(end_date,))
+            companies = iter_generated(pool, tasks, num_workers)
+        else:
+            _init_worker(end_date)
+            companies = map(generate_company, tasks)
+
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            if output_format == "json":
+                f.write("[\n")
+            for company_count, company_json in enumerate(companies, start=1):
+                if output_format == "json" and company_count > 1:
+                    f.write(",\n")
+                f.write(company_json)
+                if output_format == "jsonl":
+                    f.write("\n")
+
+                if company_count % PROGRESS_EVERY == 0 or company_count == total_companies:
+                    elapsed = time.perf_counter() - started
+                    records = company_count * records_per_company
+                    print(f"  [+] 기업 {company_count}/{total_companies}개 생성 ({records / elapsed:.0f} records/sec)")
+            if output_format == "json":
+                f.write("\n]\n")
+
+        os.replace(tmp_file, output_file)
+
         print("\n==============================================")
-        print(f"✅ 총 {company_counter}개 기업, {data_id_counter}개 데이터 생성 완료! (총 10,000개 데이터)")
-        print(f"파일 경로: {FILE_NAME}")
+        print(f"✅ 총 {total_companies}개 기업, {total_records}개 데이터 생성 완료! ({time.perf_counter() - started:.1f}초)")
+        print(f"파일 경로: {output_file}")
         print("==============================================")
-        
+
     except Exception as e:
         print(f"\n❌ 파일 저장 중 오류 발생: {e}")
+    finally:
+        if pool is not None:
+            pool.terminate()
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
 
 if __name__ == "__main__":
-    generate_jobis_data_file()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Jobis RAG 더미 데이터 생성기")
+    parser.add_argument("--output", default="jobis_rag_data.json", help="출력 파일 경로 (.jsonl이면 JSON Lines)")
+    parser.add_argument("--companies-per-industry", type=int, default=DEFAULT_COMPANIES_PER_INDUSTRY)
+    parser.add_argument("--records-per-company", type=int, default=DEFAULT_RECORDS_PER_COMPANY,
+                        help="기업당 데이터 수 (리뷰/면접을 번갈아 생성)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, help="출력 형식 (기본: 확장자로 판단)")
+    parser.add_argument("--seed", type=int, help="seed와 기준일이 같으면 같은 데이터를 생성")
+    parser.add_argument("--workers", type=int, default=1, help="생성 워커 프로세스 수 (0이면 CPU 코어 수)")
+    parser.add_argument("--end-date", help="날짜 생성 기준일 YYYY-MM-DD (기본: 오늘)")
+    args = parser.parse_args()
+
+    generate_jobis_data_file(
+        output_file=args.output,
+        companies_per_industry=args.companies_per_industry,
+        records_per_company=args.records_per_company,
+        output_format=args.format,
+        seed=args.seed,
+        num_workers=args.workers or os.cpu_count(),
+        end_date=datetime.strptime(args.end_date, "%Y-%m-%d") if args.end_date else None,
+    )
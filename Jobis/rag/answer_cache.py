@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from rag import telemetry
+from rag.vectorstore import get_db_version
+
+# 시맨틱 답변 캐시 설정
+SIMILARITY_THRESHOLD = 0.93  # 이 값 이상의 코사인 유사도면 같은 질문으로 간주
+CACHE_TTL = 60 * 60  # 초
+MAX_CACHE_ENTRIES = 1000
+# 템플릿 질문은 긍정/부정 단어만 달라도 임베딩이 거의 같으므로 캐시 키에 극성을 포함합니다.
+POLARITY_TERMS = {
+    "positive": ("장점", "좋은", "좋아", "좋나", "만족", "추천"),
+    "negative": ("단점", "나쁜", "나빠", "안 좋", "안좋", "불만", "힘든", "힘들"),
+}
+
+def polarity_of(query):
+    """질문에 들어 있는 극성(positive/negative) 목록을 반환합니다."""
+    return tuple(label for label, terms in POLARITY_TERMS.items() if any(term in query for term in terms))
+
+def analysis_key_fn(analyzer):
+    """QueryAnalyzer 결과(정렬한 기업명/산업)를 캐시 키로 쓰는 함수를 만듭니다."""
+    def key_fn(query):
+        analysis = analyzer.analyze(query)
+        return tuple(sorted(analysis["companies"])), tuple(sorted(analysis["industries"]))
+    return key_fn
+
+class SemanticAnswerCache:
+    """의미가 거의 같은 질문에 대해 이전 답변을 재사용하는 캐시입니다.
+
+    질문 임베딩의 코사인 유사도로 조회하며 TTL/LRU로 항목을 정리합니다.
+    기업만 바뀐 질문("삼성전자 장점은?" / "LG전자 장점은?")은 임베딩이 거의 같으므로,
+    key_fn(질문 분석 결과)과 극성이 같은 항목끼리만 비교합니다.
+    벡터 DB 버전(db_version)이 바뀌면 전체를 비웁니다.
+    """
+
+    def __init__(self, embeddings, threshold=SIMILARITY_THRESHOLD, ttl=CACHE_TTL,
+                 max_entries=MAX_CACHE_ENTRIES, version_fn=get_db_version, key_fn=None):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.version_fn = version_fn
+        self.key_fn = key_fn
+        self._version = version_fn()
+        self._entries = OrderedDict()  # query -> {"key", "vector", "answer", "created", "cost"}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.latency_saved = 0.0
+
+    def _embed(self, query):
+        vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _key(self, query):
+        return (self.key_fn(query) if self.key_fn else None), polarity_of(query)
+
+    def _check_version(self):
+        version = self.version_fn()
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+    def _expire(self, now):
+        expired = [query for query, entry in self._entries.items() if now - entry["created"] > self.ttl]
+        for query in expired:
+            del self._entries[query]
+
+    def lookup(self, query):
+        """유사한 질문의 답변이 있으면 반환하고, 없으면 None을 반환합니다."""
+        key = self._key(query)
+        vector = self._embed(query)
+        now = time.time()
+
+        with self._lock:
+            self._check_version()
+            self._expire(now)
+
+            best_query, best_score = None, -1.0
+            queries = [q for q, entry in self._entries.items() if entry["key"] == key]
+            if queries:
+                matrix = np.stack([self._entries[q]["vector"] for q in queries])
+                scores = matrix @ vector
+                best = int(np.argmax(scores))
+                best_query, best_score = queries[best], float(scores[best])
+
+            if best_query is None or best_score < self.threshold:
+                self.misses += 1
+                telemetry.increment("answer_cache", result="miss")
+                return None
+
+            entry = self._entries[best_query]
+            self._entries.move_to_end(best_query)
+            self.hits += 1
+            telemetry.increment("answer_cache", result="hit")
+            self.latency_saved += entry["cost"]
+            return entry["answer"]
+
+    def store(self, query, answer, cost):
+        """생성된 답변과 생성에 걸린 시간(cost, 초)을 저장합니다."""
+        key = self._key(query)
+        vector = self._embed(query)
+
+        with self._lock:
+            self._entries[query] = {
+                "key": key,
+                "vector": vector,
+                "answer": answer,
+                "created": time.time(),
+                "cost": cost,
+            }
+            self._entries.move_to_end(query)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "latency_saved_sec": self.latency_saved,
+                "entries": len(self._entries),
+            }
@@ -1,33 +1,216 @@
+import asyncio
+import time
+import weakref
+from functools import cached_property
+
 from dotenv import load_dotenv
 load_dotenv()
 
-from rag.vectorstore import get_vectorstore
-from rag.retriever import get_retriever
-from rag.pipeline import build_rag_chain
+from rag import telemetry
+from rag.pipeline import build_answer_chain, build_rag_chain, format_docs
+from rag.resources import (
+    get_shared_answer_cache,
+    get_shared_answer_chain,
+    get_shared_chain,
+    get_shared_retriever,
+    get_shared_vectorstore,
+    start_warmup,
+)
+
+# 비동기 API 설정
+MAX_CONCURRENT_LLM_CALLS = 8  # 이벤트 루프당 동시에 진행할 수 있는 LLM 호출 수
+REQUEST_TIMEOUT = 60  # 요청 하나당 제한 시간 (초)
+TIMEOUT_MESSAGE = "응답 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."
+
+# asyncio.Semaphore는 이벤트 루프에 묶이므로 루프별로 하나씩 만듭니다.
+_llm_semaphores = weakref.WeakKeyDictionary()
+
+def _get_llm_semaphore():
+    loop = asyncio.get_running_loop()
+    semaphore = _llm_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_LLM_CALLS)
+        _llm_semaphores[loop] = semaphore
+    return semaphore
 
 class JobisChatbot:
-    def __init__(self):
-        # 1. VectorStore 로드 (vectorstore.py)
-        self.vectorstore = get_vectorstore()
-        
-        # 2. Retriever 생성 (retriever.py)
-        self.retriever = get_retriever(self.vectorstore, k=10)
-        
-        # 3. RAG Chain 구축 (pipeline.py)
-        self.chain = build_rag_chain(self.retriever)
+    def __init__(self, k=10, llm=None, use_answer_cache=True, warm_up=True):
+        # 임베딩 모델, VectorStore, RAG Chain은 프로세스 전체에서 공유합니다 (resources.py).
+        # 세션마다 JobisChatbot을 만들어도 모델은 한 번만 로드됩니다.
+        # 생성자는 바로 반환하고, 모델 로드는 백그라운드 워밍업 또는 첫 질문 때 이루어집니다.
+        self.k = k
+        self.llm = llm
+        self.use_answer_cache = use_answer_cache
+        if warm_up:
+            start_warmup(k=k, build_chain=llm is None)
+
+    # 1. VectorStore 로드 (vectorstore.py)
+    @cached_property
+    def vectorstore(self):
+        return get_shared_vectorstore()
+
+    # 2. Retriever 생성 (retriever.py)
+    @cached_property
+    def retriever(self):
+        return get_shared_retriever(k=self.k)
+
+    @cached_property
+    def _traced_retriever(self):
+        # 비동기 경로는 Chain을 거치지 않고 Retriever를 직접 호출하므로 여기서 계측을 붙입니다.
+        return telemetry.instrument(self.retriever, "retriever")
+
+    # 3. RAG Chain 구축 (pipeline.py)
+    # llm을 직접 넘기면 (예: 부하 테스트용 FakeChatModel) 이 챗봇 전용 Chain을 만듭니다.
+    @cached_property
+    def chain(self):
+        if self.llm is None:
+            return get_shared_chain(k=self.k)
+        return build_rag_chain(self.retriever, llm=self.llm)
+
+    @cached_property
+    def answer_chain(self):
+        if self.llm is None:
+            return get_shared_answer_chain()
+        return build_answer_chain(self.llm)
+
+    # 4. 시맨틱 답변 캐시 (answer_cache.py) - 비슷한 질문은 검색/LLM 호출 없이 답변
+    @cached_property
+    def answer_cache(self):
+        return get_shared_answer_cache() if self.use_answer_cache else None
+
+    def _lookup_cache(self, query):
+        if self.answer_cache is None:
+            return None
+        return self.answer_cache.lookup(query)
+
+    def _store_cache(self, query, answer, started):
+        if self.answer_cache is not None:
+            self.answer_cache.store(query, answer, time.perf_counter() - started)
 
     def ask(self, query):
         """사용자 질문을 받아 답변을 반환합니다."""
         if not query:
             return "질문을 입력해주세요."
-        
+
+        try:
+            with telemetry.span("request", mode="invoke") as span:
+                cached = self._lookup_cache(query)
+                if cached is not None:
+                    span.set(cached=True)
+                    return cached
+
+                started = time.perf_counter()
+                response = self.chain.invoke(query)
+                self._store_cache(query, response, started)
+                return response
+        except Exception as e:
+            return f"오류가 발생했습니다: {str(e)}"
+
+    def ask_stream(self, query):
+        """사용자 질문을 받아 LLM이 생성하는 답변 조각(chunk)을 순서대로 반환합니다."""
+        if not query:
+            yield "질문을 입력해주세요."
+            return
+
+        try:
+            with telemetry.span("request", mode="stream") as span:
+                cached = self._lookup_cache(query)
+                if cached is not None:
+                    span.set(cached=True)
+                    yield cached
+                    return
+
+                started = time.perf_counter()
+                chunks = []
+                for chunk in self.chain.stream(query):
+                    chunks.append(chunk)
+                    yield chunk
+                self._store_cache(query, "".join(chunks), started)
+        except Exception as e:
+            yield f"오류가 발생했습니다: {str(e)}"
+
+    async def _aprepare(self, query):
+        """비동기 검색 후 답변 Chain 입력을 만듭니다."""
+        docs = await self._traced_retriever.ainvoke(query)
+        return {"context": format_docs(docs), "question": query}
+
+    async def aask(self, query, timeout=REQUEST_TIMEOUT):
+        """ask의 비동기 버전. 검색은 동시에, LLM 호출은 세마포어로 제한해 실행합니다."""
+        if not query:
+            return "질문을 입력해주세요."
+
         try:
-            response = self.chain.invoke(query)
-            return response
+            async with asyncio.timeout(timeout):
+                with telemetry.span("request", mode="ainvoke") as span:
+                    cached = await asyncio.to_thread(self._lookup_cache, query)
+                    if cached is not None:
+                        span.set(cached=True)
+                        return cached
+
+                    started = time.perf_counter()
+                    inputs = await self._aprepare(query)
+                    async with _get_llm_semaphore():
+                        response = await self.answer_chain.ainvoke(inputs)
+                    await asyncio.to_thread(self._store_cache, query, response, started)
+                    return response
+        except TimeoutError:
+            return TIMEOUT_MESSAGE
         except Exception as e:
             return f"오류가 발생했습니다: {str(e)}"
 
+    async def astream(self, query, timeout=REQUEST_TIMEOUT):
+        """ask_stream의 비동기 버전. 답변 조각을 생성되는 대로 반환합니다.
+
+        제한 시간은 검색/LLM을 기다리는 시간에만 적용합니다. (yield 후 호출자가 조각을 처리하는 시간은 제외)
+        """
+        if not query:
+            yield "질문을 입력해주세요."
+            return
+
+        loop = asyncio.get_running_loop()
+        remaining = timeout
+
+        async def within_budget(awaitable):
+            # yield 중에 타임아웃이 발생하면 취소가 호출자 Task로 전달되므로, 기다리는 구간마다 남은 시간으로 제한합니다.
+            nonlocal remaining
+            waited_from = loop.time()
+            try:
+                return await asyncio.wait_for(awaitable, max(remaining, 0))
+            finally:
+                remaining -= loop.time() - waited_from
+
+        try:
+            with telemetry.span("request", mode="astream") as span:
+                cached = await within_budget(asyncio.to_thread(self._lookup_cache, query))
+                if cached is not None:
+                    span.set(cached=True)
+                    yield cached
+                    return
+
+                started = time.perf_counter()
+                chunks = []
+                inputs = await within_budget(self._aprepare(query))
+                semaphore = _get_llm_semaphore()
+                await within_budget(semaphore.acquire())
+                stream = self.answer_chain.astream(inputs)
+                try:
+                    while True:
+                        try:
+                            chunk = await within_budget(anext(stream))
+                        except StopAsyncIteration:
+                            break
+                        chunks.append(chunk)
+                        yield chunk
+                finally:
+                    await stream.aclose()
+                    semaphore.release()
+                await asyncio.to_thread(self._store_cache, query, "".join(chunks), started)
+        except TimeoutError:
+            yield TIMEOUT_MESSAGE
+        except Exception as e:
+            yield f"오류가 발생했습니다: {str(e)}"
+
 # 테스트 코드
 if __name__ == "__main__":
     bot = JobisChatbot()
-    print(bot.ask("복지가 좋은 회사는 어디야?"))
\ No newline at end of file
+    print(bot.ask("복지가 좋은 회사는 어디야?"))
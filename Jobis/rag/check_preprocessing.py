@@ -1,24 +1,42 @@
+import argparse
 import json
 import os
+import sys
+import time
+
+import numpy as np
+import pyarrow.compute as pc
 
 # 경로 맟 설정
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 PROCESSED_FILE = os.path.join(BASE_DIR, 'data', 'processed', 'cleaned_data.json')
+# 검증에 필요한 컬럼만 읽습니다. (Parquet이면 나머지 컬럼은 디스크에서 읽지 않음)
+VERIFY_COLUMNS = ["data_id", "type", "score", "sentiment", "content", "sentences"]
+REPORT_COLUMNS = ["company_name", "industry", "type", "data_id", "score", "sentiment", "date", "content", "sentences"]
+REPORT_FILE = os.path.join(BASE_DIR, 'data', 'processed', 'validation_report.json')
+NOISE_MARKER = "결측치 포함"
+LENGTH_BINS = [0, 50, 100, 200, 400, 800, 1600]  # 본문 길이(글자 수) 히스토그램 구간 시작값
+MAX_EXAMPLES = 10  # 리포트에 남길 문제 항목 data_id 예시 수
+
+# `python rag/check_preprocessing.py`로 실행해도 rag 패키지를 찾을 수 있도록 루트 경로 추가
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+
+from rag.preprocessing import find_processed_file, load_processed_items
+from rag.processed_store import PARQUET_SUFFIX, load_processed_table, table_from_items
 
 def verify_data():
-    print(f"🔍 검증 파일 경로: {PROCESSED_FILE}")
+    source = find_processed_file(PROCESSED_FILE)
+    print(f"🔍 검증 파일 경로: {source or PROCESSED_FILE}")
     
-    if not os.path.exists(PROCESSED_FILE):
-        print("오류: 'cleaned_data.json' 파일이 존재하지 않습니다. preprocessing.py를 먼저 실행했는지 확인해주세요.")
+    if source is None:
+        print("오류: 전처리 결과(cleaned_data.parquet/.json) 파일이 존재하지 않습니다. preprocessing.py를 먼저 실행했는지 확인해주세요.")
         return
 
-    with open(PROCESSED_FILE, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    print(f"총 데이터 개수: {len(data)}개")
     print("-" * 50)
 
     # 검증 통계 변수
+    total_count = 0
     error_count = 0
     null_remains = 0
     noise_remains = 0
@@ -28,7 +46,9 @@ def verify_data():
     negative_sample = None
     interview_sample = None
 
-    for item in data:
+    # 파일 전체를 메모리에 올리지 않고 항목을 하나씩 검증
+    for item in load_processed_items(PROCESSED_FILE, columns=VERIFY_COLUMNS):
+        total_count += 1
         content = item.get('content', '')
         
         # [체크 1] 결측치(null)나 빈 문자열 처리가 안 된 항목이 있는지
@@ -56,6 +76,7 @@ def verify_data():
 
     # 결과 리포트 출력
     print(f"검증 결과 리포트")
+    print(f"   - 총 데이터 개수: {total_count}개")
     print(f"   - 데이터 구조 무결성 오류: {error_count}건")
     print(f"   - '결측치' 텍스트 잔존 여부: {noise_remains}건")
     
@@ -86,5 +107,156 @@ def verify_data():
         print(f"내용(일부): {interview_sample['content'][:100]}...")
         print(f"문장분리 예시: {interview_sample['sentences'][0]}")
 
+def load_report_table(columns=REPORT_COLUMNS):
+    """검증할 컬럼을 pyarrow Table로 읽습니다. JSON 결과물이면 같은 스키마로 변환합니다."""
+    source = find_processed_file(PROCESSED_FILE)
+    if source is None:
+        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {PROCESSED_FILE}")
+    if source.endswith(PARQUET_SUFFIX):
+        return load_processed_table(source, columns=columns), source
+    return table_from_items(load_processed_items(PROCESSED_FILE, columns=columns), columns=columns), source
+
+def _value_counts(column):
+    """값별 개수를 많은 순으로 정렬한 dict (null은 "null" 키)"""
+    counts = pc.value_counts(column).to_pylist()
+    counts.sort(key=lambda entry: entry["counts"], reverse=True)
+    def label(value):
+        if value is None:
+            return "null"
+        # score는 float 컬럼이므로 정수 평점은 "4.0"이 아니라 "4"로 표시
+        return str(int(value)) if isinstance(value, float) and value.is_integer() else str(value)
+
+    return {label(entry["values"]): entry["counts"] for entry in counts}
+
+def _summary(values):
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return {"min": None, "max": None, "mean": None, "p50": None, "p95": None}
+    p50, p95 = np.percentile(values, [50, 95])
+    return {
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "mean": round(float(values.mean()), 2),
+        "p50": float(p50),
+        "p95": float(p95),
+    }
+
+def _format_stat(value, spec=""):
+    """통계 값을 출력용 문자열로 바꿉니다. 데이터가 없어 None이면 "-"를 반환합니다."""
+    return "-" if value is None else format(value, spec)
+
+def _examples(table, mask):
+    return table.filter(mask).column("data_id").slice(0, MAX_EXAMPLES).to_pylist()
+
+def build_report(table):
+    """전처리 결과 전체를 컬럼 연산(Arrow compute/NumPy)으로 검증하고 통계 리포트(dict)를 만듭니다."""
+    num_rows = table.num_rows
+    content = pc.fill_null(table.column("content"), "")
+    sentences = table.column("sentences")
+
+    # 무결성: 빈 본문, 비어 있는 문장 리스트, 남아 있는 결측치 마커
+    empty_content = pc.equal(pc.utf8_trim_whitespace(content), "")
+    sentence_counts = pc.fill_null(pc.list_value_length(sentences), 0)
+    empty_sentences = pc.equal(sentence_counts, 0)
+    noise = pc.match_substring(content, NOISE_MARKER)
+
+    # 본문 길이 분포
+    lengths = pc.utf8_length(content).to_numpy(zero_copy_only=False)
+    histogram, _ = np.histogram(lengths, bins=[*LENGTH_BINS, max(int(lengths.max(initial=0)) + 1, LENGTH_BINS[-1] + 1)])
+    length_labels = [f"{start}-{end - 1}" for start, end in zip(LENGTH_BINS, LENGTH_BINS[1:])] + [f"{LENGTH_BINS[-1]}+"]
+
+    # 본문이 완전히 같은 항목 (Arrow 해시 테이블로 그룹핑)
+    content_counts = pc.value_counts(content)
+    duplicated = content_counts.filter(pc.greater(content_counts.field("counts"), 1))
+    duplicate_values = duplicated.field("values")
+    duplicate_mask = pc.is_in(content, value_set=duplicate_values)
+    duplicate_rows = int(pc.sum(duplicated.field("counts")).as_py() or 0) - len(duplicated)
+    # data_id는 벡터 DB의 문서 id이므로 중복되면 안 됨
+    data_id_counts = pc.value_counts(table.column("data_id"))
+    duplicate_data_ids = data_id_counts.filter(pc.greater(data_id_counts.field("counts"), 1)).field("values")
+
+    scores = table.column("score").drop_null().to_numpy()
+
+    return {
+        "source_rows": num_rows,
+        "integrity": {
+            "empty_content": int(pc.sum(empty_content).as_py() or 0),
+            "empty_sentences": int(pc.sum(empty_sentences).as_py() or 0),
+            "noise_remains": int(pc.sum(noise).as_py() or 0),
+            "noise_examples": _examples(table, noise),
+            "duplicate_data_ids": len(duplicate_data_ids),
+            "duplicate_data_id_examples": duplicate_data_ids.slice(0, MAX_EXAMPLES).to_pylist(),
+        },
+        "counts": {
+            "by_type": _value_counts(table.column("type")),
+            "by_industry": _value_counts(table.column("industry")),
+            "by_company": _value_counts(table.column("company_name")),
+        },
+        "sentiment": _value_counts(table.column("sentiment")),
+        "score": {
+            "distribution": _value_counts(table.column("score")),
+            **_summary(scores),
+        },
+        "missing_rate": {
+            name: round(table.column(name).null_count / num_rows, 4) if num_rows else 0.0
+            for name in table.column_names
+        },
+        "content_length": {
+            **_summary(lengths),
+            "histogram": dict(zip(length_labels, histogram.tolist())),
+        },
+        "duplicates": {
+            "groups": len(duplicated),
+            "rows": duplicate_rows,
+            "examples": _examples(table, duplicate_mask),
+        },
+        "sentences": {
+            **_summary(sentence_counts.to_numpy(zero_copy_only=False)),
+            "total": int(pc.sum(sentence_counts).as_py() or 0),
+        },
+    }
+
+def report_data(output_file=REPORT_FILE):
+    """컬럼 연산 기반 전체 검증 리포트를 만들어 요약을 출력하고 JSON으로 저장합니다."""
+    started = time.perf_counter()
+    table, source = load_report_table()
+    print(f"🔍 검증 파일 경로: {source} ({table.num_rows}행)")
+
+    report = build_report(table)
+    report["source"] = source
+    report["seconds"] = round(time.perf_counter() - started, 3)
+
+    integrity = report["integrity"]
+    print(f"   - 빈 본문: {integrity['empty_content']}건 | 빈 문장 리스트: {integrity['empty_sentences']}건 | "
+          f"'결측치' 텍스트 잔존: {integrity['noise_remains']}건")
+    print(f"   - 중복 본문: {report['duplicates']['groups']}그룹 ({report['duplicates']['rows']}건) | "
+          f"중복 data_id: {integrity['duplicate_data_ids']}건")
+    print(f"   - 기업 {len(report['counts']['by_company'])}개 | 산업 {len(report['counts']['by_industry'])}개 | "
+          f"유형별 {report['counts']['by_type']}")
+    print(f"   - 감정 분포: {report['sentiment']}")
+    content_length = report['content_length']
+    print(f"   - 본문 길이 p50/p95: {_format_stat(content_length['p50'], '.0f')}/"
+          f"{_format_stat(content_length['p95'], '.0f')}자 | "
+          f"문장 수 평균: {_format_stat(report['sentences']['mean'])}")
+    print(f"   - 소요 시간: {report['seconds']}초")
+
+    if output_file == "-":
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    elif output_file:
+        os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"리포트 저장: {output_file}")
+    return report
+
 if __name__ == "__main__":
-    verify_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Jobis 전처리 결과 검증")
+    parser.add_argument("--report", action="store_true",
+                        help="컬럼 연산으로 전체 데이터를 검증하고 통계 리포트(JSON)를 만듭니다.")
+    parser.add_argument("--output", default=REPORT_FILE, help="리포트 JSON 경로 (-이면 표준 출력)")
+    args = parser.parse_args()
+
+    if args.report:
+        report_data(args.output)
+    else:
+        verify_data()
\ No newline at end of file
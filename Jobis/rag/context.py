@@ -0,0 +1,110 @@
+import logging
+import math
+import re
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from rag.embedder import EMBEDDING_MODEL
+
+logger = logging.getLogger(__name__)
+
+# 컨텍스트 구성 설정
+CONTEXT_TOKEN_BUDGET = 3000  # LLM에 넘길 [관련 기업 정보]의 최대 토큰 수
+DEDUP_THRESHOLD = 0.8  # MinHash로 추정한 Jaccard 유사도가 이 값 이상이면 중복으로 간주
+MINHASH_PERMUTATIONS = 64
+SHINGLE_SIZE = 3  # 글자 n-gram 크기
+CHARS_PER_TOKEN = 1.5  # 토크나이저를 쓸 수 없을 때의 대략적인 글자/토큰 비율
+
+# uint64 곱셈이 넘치지 않도록 31비트 메르센 소수를 사용
+_MERSENNE_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(42)
+_PERM_A = _rng.integers(1, _MERSENNE_PRIME, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _MERSENNE_PRIME, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+HEADER_PATTERN = re.compile(r'^기업명: .*\n산업분야: .*\n내용: ', re.MULTILINE)
+
+@lru_cache(maxsize=1)
+def _get_tokenizer():
+    """임베딩 모델의 fast tokenizer를 불러옵니다. 불러올 수 없으면 None"""
+    try:
+        from transformers import AutoTokenizer
+        return AutoTokenizer.from_pretrained(EMBEDDING_MODEL, use_fast=True)
+    except Exception as e:
+        logger.warning("토크나이저를 불러오지 못해 글자 수로 토큰을 추정합니다: %s", e)
+        return None
+
+def count_tokens(text):
+    if not text:
+        return 0
+    tokenizer = _get_tokenizer()
+    if tokenizer is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(tokenizer(text, add_special_tokens=False, verbose=False)["input_ids"])
+
+def strip_header(content):
+    """page_content 앞의 "기업명/산업분야" 머리말을 떼어 본문만 반환합니다."""
+    return HEADER_PATTERN.sub('', content, count=1)
+
+def minhash_signature(text):
+    shingles = {text[i:i + SHINGLE_SIZE] for i in range(max(len(text) - SHINGLE_SIZE + 1, 1))}
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode('utf-8')) % _MERSENNE_PRIME for shingle in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+    # (a * x + b) mod p 형태의 해시 함수 64개를 한 번에 적용
+    permuted = (hashes[:, None] * _PERM_A[None, :] + _PERM_B[None, :]) % _MERSENNE_PRIME
+    return permuted.min(axis=0)
+
+def deduplicate(docs, threshold=DEDUP_THRESHOLD):
+    """검색 순위를 유지하면서 거의 같은 내용의 문서를 제거합니다."""
+    kept, signatures = [], []
+    for doc in docs:
+        signature = minhash_signature(strip_header(doc.page_content))
+        if any(np.mean(signature == other) >= threshold for other in signatures):
+            continue
+        kept.append(doc)
+        signatures.append(signature)
+    return kept
+
+def build_context(docs, max_tokens=CONTEXT_TOKEN_BUDGET, dedup_threshold=DEDUP_THRESHOLD):
+    """검색 문서로 LLM 컨텍스트를 만듭니다.
+
+    1) 거의 중복된 문서 제거 2) 검색 순위대로 토큰 예산 안에 담기
+    3) 기업별로 묶어 기업명/산업 머리말은 한 번만 출력
+    """
+    if not docs:
+        return ""
+
+    unique_docs = deduplicate(docs, dedup_threshold)
+
+    groups = {}  # 기업명 -> {"header": ..., "items": [...]} (처음 등장한 순서 유지)
+    used_tokens = 0
+    for doc in unique_docs:
+        company = doc.metadata.get('company_name', 'Unknown')
+        item = f"- {strip_header(doc.page_content)}"
+        item_tokens = count_tokens(item)
+
+        header = None
+        if company not in groups:
+            header = f"[{company}] 산업분야: {doc.metadata.get('industry', 'Unknown')}"
+            item_tokens += count_tokens(header)
+
+        # 예산을 넘는 문서는 건너뛰고, 더 짧은 다음 문서가 들어갈 수 있는지 계속 확인
+        if used_tokens + item_tokens > max_tokens:
+            continue
+
+        if header is not None:
+            groups[company] = {"header": header, "items": []}
+        groups[company]["items"].append(item)
+        used_tokens += item_tokens
+
+    logger.info(
+        "context: 검색 %d건 -> 중복 제거 %d건 -> 사용 %d건, %d tokens",
+        len(docs), len(unique_docs), sum(len(group["items"]) for group in groups.values()), used_tokens,
+    )
+    return "\n\n".join(
+        "\n".join([group["header"], *group["items"]]) for group in groups.values()
+    )
@@ -0,0 +1,97 @@
+import os
+import sys
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# `python rag/embedder.py`로 실행해도 rag 패키지를 찾을 수 있도록 루트 경로 추가
+if BASE_PATH not in sys.path:
+    sys.path.append(BASE_PATH)
+
+from rag.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+# 임베딩 모델 설정 (embedding.py / vectorstore.py 공통)
+EMBEDDING_MODEL = "jhgan/ko-sroberta-multitask"
+NORMALIZE_EMBEDDINGS = True
+
+# 추론 백엔드 설정
+# torch: PyTorch fp32 (기본) / onnx: ONNX Runtime + 동적 int8 양자화 (GPU 없는 서버용, export_onnx_model()로 먼저 변환)
+# 백엔드를 바꾸면 벡터가 조금 달라지므로 `python rag/embedding.py --rebuild`로 벡터 DB를 다시 만드는 것을 권장합니다.
+EMBEDDING_BACKENDS = ('torch', 'onnx')
+EMBEDDING_BACKEND = os.getenv("JOBIS_EMBEDDING_BACKEND", "torch")
+ONNX_MODEL_DIR = os.path.join(BASE_PATH, 'data', 'onnx', EMBEDDING_MODEL.split('/')[-1])
+# CPU 명령어 집합별 양자화 설정: avx2 (대부분의 x86), avx512, avx512_vnni (최신 Xeon), arm64
+ONNX_QUANTIZATION = os.getenv("JOBIS_ONNX_QUANTIZATION", "avx2")
+
+def get_onnx_file_name(quantization=ONNX_QUANTIZATION):
+    """export_onnx_model()이 만드는 양자화 모델 파일 경로 (ONNX_MODEL_DIR 기준 상대 경로)"""
+    return f"onnx/model_qint8_{quantization}.onnx"
+
+def get_cache_model_name(backend=EMBEDDING_BACKEND, quantization=ONNX_QUANTIZATION):
+    """임베딩 캐시 키에 쓰는 모델 이름. 백엔드마다 벡터가 다르므로 캐시를 따로 씁니다."""
+    if backend == 'onnx':
+        return f"{EMBEDDING_MODEL}#onnx-qint8-{quantization}"
+    return EMBEDDING_MODEL
+
+def export_onnx_model(output_dir=ONNX_MODEL_DIR, quantization=ONNX_QUANTIZATION):
+    """EMBEDDING_MODEL을 ONNX로 변환하고 동적 int8 양자화 모델을 output_dir에 저장합니다."""
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    # backend="onnx"로 열면 ONNX 파일이 없는 모델은 fp32 ONNX로 자동 변환됩니다.
+    model = SentenceTransformer(EMBEDDING_MODEL, device='cpu', backend='onnx')
+    model.save_pretrained(output_dir)
+    export_dynamic_quantized_onnx_model(model, quantization, output_dir)
+    return os.path.join(output_dir, get_onnx_file_name(quantization))
+
+def get_embeddings(use_cache=True, backend=None):
+    """임베딩 모델을 생성합니다. use_cache=True이면 디스크 캐시로 감싸서 반환합니다.
+
+    backend를 생략하면 JOBIS_EMBEDDING_BACKEND(기본 torch)를 사용합니다.
+    """
+    # sentence-transformers/torch는 import가 느리므로 모델을 만들 때 불러옵니다.
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    backend = backend or EMBEDDING_BACKEND
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"지원하지 않는 임베딩 백엔드입니다: {backend} (사용 가능: {EMBEDDING_BACKENDS})")
+
+    model_name = EMBEDDING_MODEL
+    model_kwargs = {'device': 'cpu'}
+    if backend == 'onnx':
+        onnx_file_name = get_onnx_file_name()
+        if not os.path.exists(os.path.join(ONNX_MODEL_DIR, onnx_file_name)):
+            raise FileNotFoundError(
+                f"ONNX 모델이 없습니다: {os.path.join(ONNX_MODEL_DIR, onnx_file_name)} "
+                f"(`python rag/embedder.py`로 먼저 변환하세요)"
+            )
+        model_name = ONNX_MODEL_DIR
+        model_kwargs.update(backend='onnx', model_kwargs={'file_name': onnx_file_name})
+
+    embeddings = HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs=model_kwargs,
+        encode_kwargs={'normalize_embeddings': NORMALIZE_EMBEDDINGS}
+    )
+
+    if not use_cache:
+        return embeddings
+
+    return CachedEmbeddings(
+        embeddings,
+        EmbeddingCache(),
+        model_name=get_cache_model_name(backend),
+        normalize=NORMALIZE_EMBEDDINGS,
+    )
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="임베딩 모델 ONNX 변환 + 동적 int8 양자화")
+    parser.add_argument("--quantization", default=ONNX_QUANTIZATION,
+                        choices=['avx2', 'avx512', 'avx512_vnni', 'arm64'])
+    parser.add_argument("--output", default=ONNX_MODEL_DIR)
+    args = parser.parse_args()
+
+    print(f"Exporting {EMBEDDING_MODEL} -> {args.output} (int8, {args.quantization})...")
+    path = export_onnx_model(args.output, args.quantization)
+    print(f"변환 완료: {path}")
+    print(f"사용하려면 .env에 JOBIS_EMBEDDING_BACKEND=onnx, JOBIS_ONNX_QUANTIZATION={args.quantization}를 추가하세요.")
@@ -1,76 +1,290 @@
+import argparse
+import hashlib
 import json
+import logging
 import os
 import shutil
+import sys
 from langchain_core.documents import Document
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_chroma import Chroma
 
 # 경로 및 설정
 BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 INPUT_FILE = os.path.join(BASE_PATH, 'data', 'processed', 'cleaned_data.json')
 PERSIST_PATH = os.path.join(BASE_PATH, 'data', 'chroma_db')
-EMBEDDING_MODEL = "jhgan/ko-sroberta-multitask"
+DELETE_BATCH_SIZE = 256  # Chroma 한 번의 delete 호출에 넣을 최대 id 수
+CHUNK_WINDOW = 3  # 청크 하나에 들어가는 문장 수
+CHUNK_STRIDE = 2  # 다음 청크로 넘어갈 때 이동하는 문장 수 (WINDOW보다 작으면 겹침)
 
-def load_processed_data():
-    if not os.path.exists(INPUT_FILE):
+# 단계별로 필요한 컬럼만 읽습니다. (Parquet이면 나머지 컬럼은 디스크에서 읽지 않음)
+METADATA_COLUMNS = ["company_name", "industry", "type", "sentiment", "score", "date", "data_id"]
+DOCUMENT_COLUMNS = METADATA_COLUMNS + ["content"]
+CHUNK_COLUMNS = METADATA_COLUMNS + ["sentences"]
+LEXICAL_COLUMNS = ["data_id", "company_name", "industry", "sentences"]
+
+# `python rag/embedding.py`로 실행해도 rag 패키지를 찾을 수 있도록 루트 경로 추가
+if BASE_PATH not in sys.path:
+    sys.path.append(BASE_PATH)
+
+from rag.embedder import EMBEDDING_BACKEND, EMBEDDING_MODEL, get_cache_model_name, get_embeddings
+from rag.ingest import DEFAULT_BATCH_SIZE, IngestEngine
+from rag.lexical_index import build_lexical_index
+from rag.local_index import export_local_index
+from rag.preprocessing import find_processed_file, load_processed_items
+from rag.projection import PCAProjection, ProjectedEmbeddings, fit_projection
+from rag.query_analyzer import save_company_index
+from rag.vectorstore import (
+    CHUNK_COLLECTION,
+    bump_db_version,
+    get_embedding_model_marker,
+    open_chroma,
+    write_embedding_model_marker,
+)
+
+logger = logging.getLogger(__name__)
+
+def load_processed_data(columns=None):
+    """전처리 항목을 하나씩 읽는 제너레이터를 반환합니다. (cleaned_data.parquet > .jsonl > .json 순으로 사용)"""
+    if find_processed_file(INPUT_FILE) is None:
         raise FileNotFoundError(f"파일을 찾을 수 없습니다: {INPUT_FILE}")
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_processed_items(INPUT_FILE, columns=columns)
+
+def build_page_content(company_name, industry, content_text):
+    # 검색 정확도를 위해 본문(page_content)에 기업명과 산업 정보를 포함시킵니다.
+    return f"기업명: {company_name}\n산업분야: {industry}\n내용: {content_text}"
+
+def build_metadata(item):
+    # JSON의 null과 필드 누락(Parquet에서는 구분되지 않음)은 같은 기본값으로 저장해 해시가 같도록 합니다.
+    def value(key, default):
+        return item[key] if item.get(key) is not None else default
+
+    return {
+        "company_name": value('company_name', 'Unknown'),
+        "industry": value('industry', 'Unknown'),
+        "type": value('type', 'Unknown'),
+        "sentiment": value('sentiment', 'neutral'),
+        "score": value('score', 0),
+        "date": value('date', ''),
+        "data_id": value('data_id', '')
+    }
 
 def create_documents(data):
-    documents = []
-    
     for item in data:
-        # 검색 정확도를 위해 본문(page_content)에 기업명과 산업 정보를 포함시킵니다.
-        company_name = item.get('company_name', 'Unknown')
-        industry = item.get('industry', 'Unknown')
-        content_text = item.get('content', '')
+        metadata = build_metadata(item)
 
         # AI가 검색할 실제 텍스트 구성
-        page_content = f"기업명: {company_name}\n산업분야: {industry}\n내용: {content_text}"
-        
-        metadata = {
-            "company_name": company_name,
-            "industry": industry,
-            "type": item.get('type', 'Unknown'),
-            "sentiment": item.get('sentiment', 'neutral'),
-            "score": item.get('score', 0) if item.get('score') is not None else 0,
-            "date": item.get('date', ''),
-            "data_id": item.get('data_id', '')
-        }
+        page_content = build_page_content(metadata['company_name'], metadata['industry'], item.get('content', ''))
+        metadata["content_hash"] = compute_content_hash(page_content, metadata)
         
-        doc = Document(page_content=page_content, metadata=metadata)
-        documents.append(doc)
-        
-    return documents
+        yield Document(id=metadata['data_id'], page_content=page_content, metadata=metadata)
 
-def build_vector_db():
-    print(f"1. 데이터 로딩 중... ({INPUT_FILE})")
-    data = load_processed_data()
-    
-    print(f"2. 문서 변환 중... (총 {len(data)}개 항목)")
-    documents = create_documents(data)
-    
-    # 기존 DB 삭제 후 재생성
-    if os.path.exists(PERSIST_PATH):
+def create_chunk_documents(data, window=CHUNK_WINDOW, stride=CHUNK_STRIDE):
+    """sentences를 슬라이딩 윈도우로 묶은 청크 문서를 만듭니다. 각 청크는 parent_id(data_id)로 원문과 연결됩니다."""
+    for item in data:
+        sentences = item.get('sentences') or []
+        parent = build_metadata(item)
+
+        starts = list(range(0, max(len(sentences) - window, 0) + 1, stride))
+        # 마지막 문장들이 stride 때문에 빠지지 않도록 끝에 맞춘 윈도우를 추가
+        if starts and starts[-1] + window < len(sentences):
+            starts.append(len(sentences) - window)
+
+        for chunk_index, start in enumerate(starts):
+            end = min(start + window, len(sentences))
+            if start >= end:
+                continue
+
+            metadata = dict(parent)
+            metadata.update({
+                "parent_id": parent['data_id'],
+                "chunk_index": chunk_index,
+                "window_start": start,
+                "window_end": end,
+            })
+            page_content = build_page_content(
+                parent['company_name'], parent['industry'], " ".join(sentences[start:end])
+            )
+            metadata["content_hash"] = compute_content_hash(page_content, metadata)
+
+            yield Document(id=f"{parent['data_id']}#{chunk_index}", page_content=page_content, metadata=metadata)
+
+def compute_content_hash(page_content, metadata):
+    """본문과 메타데이터로부터 변경 감지용 SHA-256 해시를 계산합니다."""
+    fields = {key: value for key, value in metadata.items() if key != "content_hash"}
+    payload = json.dumps(
+        {"page_content": page_content, "metadata": fields},
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def sync_vector_db(vector_store, load_documents, batch_size=DEFAULT_BATCH_SIZE, num_workers=1):
+    """문서 id(data_id, 청크는 data_id#번호)를 키로 신규/변경 문서만 upsert하고 사라진 문서는 삭제합니다.
+
+    load_documents는 호출할 때마다 새 문서 이터러블을 반환하는 함수입니다.
+    문서 전체를 메모리에 올리지 않도록 1차로 id/해시만 모으고, 2차로 다시 읽으며 바뀐 문서만 임베딩합니다.
+    """
+    # id가 중복되면 마지막 항목을 기준으로 합니다. id(data_id)가 없는 문서는 동기화할 수 없으므로 건너뜁니다.
+    incoming = {}
+    missing_id = 0
+    for doc in load_documents():
+        if not doc.id:
+            missing_id += 1
+            continue
+        incoming[doc.id] = doc.metadata["content_hash"]
+    if missing_id:
+        logger.warning("data_id가 없는 문서 %d건을 건너뜁니다.", missing_id)
+
+    existing = vector_store.get(include=["metadatas"])
+    existing_hashes = {
+        doc_id: (metadata or {}).get("content_hash")
+        for doc_id, metadata in zip(existing["ids"], existing["metadatas"])
+    }
+
+    summary = {"added": 0, "updated": 0, "deleted": 0, "skipped": 0, "missing_id": missing_id}
+    pending = set()
+    for doc_id, content_hash in incoming.items():
+        if doc_id not in existing_hashes:
+            summary["added"] += 1
+        elif existing_hashes[doc_id] != content_hash:
+            summary["updated"] += 1
+        else:
+            summary["skipped"] += 1
+            continue
+        pending.add(doc_id)
+    total = len(pending)
+
+    def iter_upserts():
+        for doc in load_documents():
+            if doc.id in pending and doc.metadata["content_hash"] == incoming[doc.id]:
+                pending.discard(doc.id)
+                yield doc.id, doc
+
+    engine = IngestEngine(
+        vector_store,
+        vector_store.embeddings,
+        batch_size=batch_size,
+        num_workers=num_workers,
+    )
+    summary["ingest"] = engine.run(iter_upserts(), total=total)
+
+    stale_ids = [doc_id for doc_id in existing_hashes if doc_id not in incoming]
+    for start in range(0, len(stale_ids), DELETE_BATCH_SIZE):
+        vector_store.delete(ids=stale_ids[start:start + DELETE_BATCH_SIZE])
+    summary["deleted"] = len(stale_ids)
+
+    return summary
+
+def build_vector_db(rebuild=False, use_cache=True, batch_size=DEFAULT_BATCH_SIZE, num_workers=1, chunked=False,
+                    compact_dim=None, export_local=False):
+    """벡터 DB를 구축합니다. 기본은 증분 모드이며, rebuild=True이면 전체를 재생성합니다.
+
+    chunked=True이면 문장 윈도우 청크 컬렉션(CHUNK_COLLECTION)도 함께 동기화합니다.
+    청크 컬렉션이 이미 있으면 chunked를 생략해도 동기화합니다. (검색에 쓰이는 청크가 원문과 어긋나지 않도록)
+    compact_dim을 주면 PCA로 임베딩을 compact_dim차원으로 줄여 저장합니다. (압축 모드)
+    이미 압축 모드로 만든 DB는 compact_dim을 생략해도 저장된 투영을 그대로 사용합니다.
+    export_local=True이면 구축한 컬렉션을 로컬 ANN 인덱스(local_index.py)로도 내보냅니다.
+    """
+    # 전처리 파일은 필요할 때마다 처음부터 한 줄씩 다시 읽습니다. (메모리 사용량이 데이터 크기와 무관)
+    print(f"1. 데이터 확인 중... ({find_processed_file(INPUT_FILE) or INPUT_FILE})")
+    load_processed_data()
+
+    def load_documents():
+        return create_documents(load_processed_data(DOCUMENT_COLUMNS))
+
+    def load_chunk_documents():
+        return create_chunk_documents(load_processed_data(CHUNK_COLUMNS))
+
+    print("2. 문서 변환은 동기화 단계에서 스트리밍으로 진행합니다.")
+
+    # 전체 재구축 모드에서만 기존 DB 삭제
+    if rebuild and os.path.exists(PERSIST_PATH):
         print(f"기존 DB 삭제 중... ({PERSIST_PATH})")
         shutil.rmtree(PERSIST_PATH)
 
-    print(f"3. 임베딩 모델 로드 중... ({EMBEDDING_MODEL})")
-    embeddings = HuggingFaceEmbeddings(
-        model_name=EMBEDDING_MODEL,
-        model_kwargs={'device': 'cpu'},
-        encode_kwargs={'normalize_embeddings': True}
-    )
+    print(f"3. 임베딩 모델 로드 중... ({EMBEDDING_MODEL}, {EMBEDDING_BACKEND})")
+    embeddings = get_embeddings(use_cache=use_cache)
 
-    print(f"4. ChromaDB 생성 및 데이터 저장 중...")
-    vector_store = Chroma.from_documents(
-        documents=documents,
-        embedding=embeddings,
-        persist_directory=PERSIST_PATH
+    # 증분 빌드는 바뀐 문서만 다시 임베딩하므로, 모델/백엔드가 다르면 서로 다른 벡터가 한 DB에 섞입니다.
+    model_name = get_cache_model_name()
+    stored_model = get_embedding_model_marker(PERSIST_PATH)
+    if stored_model is not None and stored_model != model_name:
+        raise ValueError(
+            f"벡터 DB는 {stored_model}로 임베딩되었습니다. (현재 {model_name}) "
+            "임베딩 모델/백엔드를 바꾸려면 --rebuild로 벡터 DB를 다시 만들어야 합니다."
+        )
+    if stored_model is None and os.path.exists(os.path.join(PERSIST_PATH, 'chroma.sqlite3')):
+        logger.warning("벡터 DB에 임베딩 모델 기록이 없어 현재 모델(%s)로 만든 것으로 간주합니다.", model_name)
+    write_embedding_model_marker(model_name, PERSIST_PATH)
+
+    # 압축 모드: 투영이 바뀌면 기존 벡터와 차원이 달라지므로 전체 재구축에서만 새로 학습합니다.
+    projection = PCAProjection.load(PERSIST_PATH)
+    if compact_dim and (projection is None or projection.dim != compact_dim):
+        if os.path.exists(os.path.join(PERSIST_PATH, 'chroma.sqlite3')):
+            raise ValueError("압축 차원을 바꾸려면 --rebuild로 벡터 DB를 다시 만들어야 합니다.")
+        print(f"3-1. PCA 투영 학습 중... (→ {compact_dim}차원)")
+        projection = fit_projection(embeddings, load_documents(), compact_dim, model=model_name)
+        projection.save(PERSIST_PATH)
+        print(f"   - 설명된 분산 비율: {projection.explained_variance:.1%}")
+    store_embeddings = embeddings if projection is None else ProjectedEmbeddings(embeddings, projection)
+
+    print("4. ChromaDB 동기화 중... (신규/변경 문서만 임베딩)")
+    vector_store = Chroma(
+        persist_directory=PERSIST_PATH,
+        embedding_function=store_embeddings,
     )
+    summary = sync_vector_db(vector_store, load_documents, batch_size=batch_size, num_workers=num_workers)
+    changed = summary['added'] or summary['updated'] or summary['deleted']
+
+    chunk_store = open_chroma(PERSIST_PATH, CHUNK_COLLECTION, store_embeddings, create=chunked)
+    if chunk_store is not None:
+        print(f"4-1. 문장 윈도우 청크 동기화 중... (window={CHUNK_WINDOW}, stride={CHUNK_STRIDE})")
+        chunk_summary = sync_vector_db(
+            chunk_store, load_chunk_documents, batch_size=batch_size, num_workers=num_workers
+        )
+        changed = changed or chunk_summary['added'] or chunk_summary['updated'] or chunk_summary['deleted']
+        print(
+            f"   - 청크 추가: {chunk_summary['added']}건 | 변경: {chunk_summary['updated']}건 | "
+            f"삭제: {chunk_summary['deleted']}건 | 유지: {chunk_summary['skipped']}건"
+        )
+
+    # 내용이 바뀌었으면 버전 마커를 갱신해 답변 캐시 등이 무효화되도록 합니다.
+    if rebuild or changed:
+        bump_db_version(PERSIST_PATH)
+
+    # 질문 분석기(query_analyzer.py)가 쓰는 기업명/산업 별칭 인덱스 저장
+    save_company_index(load_documents(), PERSIST_PATH)
+
+    # 하이브리드 검색용 BM25 역색인 (sentences 기반, 매번 전체 재생성)
+    print("5. BM25 역색인 생성 중...")
+    build_lexical_index(load_processed_data(LEXICAL_COLUMNS), PERSIST_PATH)
+
+    if export_local:
+        print("6. 로컬 ANN 인덱스 내보내는 중...")
+        export_local_index(PERSIST_PATH)
+        if chunk_store is not None:
+            export_local_index(PERSIST_PATH, CHUNK_COLLECTION)
     
     print(f"벡터 DB 구축 완료! 저장 경로: {PERSIST_PATH}")
+    print(
+        f"   - 추가: {summary['added']}건 | 변경: {summary['updated']}건 | "
+        f"삭제: {summary['deleted']}건 | 유지: {summary['skipped']}건"
+        + (f" | data_id 없음(건너뜀): {summary['missing_id']}건" if summary['missing_id'] else "")
+    )
+    ingest = summary["ingest"]
+    peak_rss = f"{ingest['peak_rss_mb']:.0f}MB" if ingest['peak_rss_mb'] is not None else "측정 불가"
+    if ingest['peak_child_rss_mb'] is not None:
+        peak_rss += f" (워커 1개 최대 {ingest['peak_child_rss_mb']:.0f}MB)"
+    print(
+        f"   - 임베딩 처리량: {ingest['docs_per_sec']:.1f} docs/sec "
+        f"({ingest['documents']}건, {ingest['seconds']:.1f}초) | 메인 프로세스 peak RSS {peak_rss}"
+    )
+    if use_cache:
+        stats = embeddings.stats()
+        print(
+            f"   - 임베딩 캐시: hit {stats['hits']}건 | miss {stats['misses']}건 | "
+            f"hit rate {stats['hit_rate']:.1%} | 저장 항목 {stats['entries']}개"
+        )
 
     return vector_store
 
@@ -86,5 +300,25 @@ def test_search(vector_store, query_text):
         print(f"내용 미리보기: {doc.page_content[:100].replace(chr(10), ' ')}...") 
 
 if __name__ == "__main__":
-    db = build_vector_db()
+    parser = argparse.ArgumentParser(description="Jobis 벡터 DB 구축")
+    parser.add_argument("--rebuild", action="store_true", help="기존 DB를 삭제하고 전체를 다시 임베딩합니다.")
+    parser.add_argument("--no-cache", action="store_true", help="임베딩 캐시를 사용하지 않습니다.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="임베딩 배치 크기")
+    parser.add_argument("--workers", type=int, default=1, help="임베딩 워커 프로세스 수 (0이면 CPU 코어 수)")
+    parser.add_argument("--chunked", action="store_true", help="문장 윈도우 청크 컬렉션도 함께 구축합니다. (한 번 만들면 이후 빌드에서도 계속 동기화)")
+    parser.add_argument("--compact-dim", type=int,
+                        help="압축 모드: PCA로 임베딩을 이 차원으로 줄여 저장합니다. (--rebuild와 함께 사용)")
+    parser.add_argument("--export-local", action="store_true",
+                        help="로컬 ANN 인덱스로도 내보냅니다. (JOBIS_VECTOR_BACKEND=local에서 사용)")
+    args = parser.parse_args()
+
+    db = build_vector_db(
+        rebuild=args.rebuild,
+        use_cache=not args.no_cache,
+        batch_size=args.batch_size,
+        num_workers=args.workers,
+        chunked=args.chunked,
+        compact_dim=args.compact_dim,
+        export_local=args.export_local,
+    )
     test_search(db, "삼성전자의 장점은?")
\ No newline at end of file
@@ -0,0 +1,198 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from rag import telemetry
+
+# 경로 및 설정
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_PATH = os.path.join(BASE_PATH, 'data', 'embedding_cache.sqlite3')
+MAX_CACHE_ENTRIES = 500_000  # 약 1.5GB (768차원 float32 기준)
+SQLITE_MAX_VARIABLES = 900  # IN 절 한 번에 넣을 최대 키 수
+EVICT_TARGET_RATIO = 0.9  # 정리할 때 최대 항목 수의 90%까지 줄여 매 저장마다 정리하지 않도록 함
+TOUCH_FLUSH_SIZE = 256  # 캐시 적중 시각(last_access)은 모아 두었다가 이 개수마다 기록
+TOUCH_FLUSH_INTERVAL = 60.0  # 또는 마지막 기록 후 이 시간(초)이 지나면 기록
+
+def hash_text(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class EmbeddingCache:
+    """(모델명, 정규화 여부, 텍스트 해시)를 키로 벡터를 저장하는 SQLite 캐시입니다.
+
+    최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다.
+    조회 경로에서 매번 SQLite에 쓰지 않도록 사용 시각은 모아서 기록하고,
+    항목 수는 메모리에서 추정해 최대치를 넘을 수 있을 때만 COUNT(*)로 확인합니다.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_entries=MAX_CACHE_ENTRIES):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                normalize INTEGER NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (model, normalize, text_hash)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON embeddings(last_access)")
+        self._conn.commit()
+        (self._entries,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()  # 항목 수 상한 추정치
+        self._touches = {}  # (model, normalize, text_hash) -> 마지막 적중 시각 (아직 기록하지 않은 것)
+        self._last_flush = time.monotonic()
+
+    def get_many(self, model, normalize, text_hashes):
+        """해시 목록에 대해 {해시: 벡터} 딕셔너리를 반환합니다. 없는 항목은 빠집니다."""
+        found = {}
+        unique_hashes = list(dict.fromkeys(text_hashes))
+        now = time.time()
+
+        with self._lock:
+            for start in range(0, len(unique_hashes), SQLITE_MAX_VARIABLES):
+                chunk = unique_hashes[start:start + SQLITE_MAX_VARIABLES]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND normalize = ? AND text_hash IN ({placeholders})",
+                    [model, int(normalize), *chunk],
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+            for text_hash in found:
+                self._touches[(model, int(normalize), text_hash)] = now
+            if found and (
+                len(self._touches) >= TOUCH_FLUSH_SIZE
+                or time.monotonic() - self._last_flush >= TOUCH_FLUSH_INTERVAL
+            ):
+                self._flush_touches()
+                self._conn.commit()
+
+            self.hits += sum(1 for text_hash in text_hashes if text_hash in found)
+            self.misses += sum(1 for text_hash in text_hashes if text_hash not in found)
+
+        return found
+
+    def put_many(self, model, normalize, items):
+        """(해시, 벡터) 목록을 저장하고 필요하면 오래된 항목을 정리합니다."""
+        if not items:
+            return
+        now = time.time()
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, normalize, text_hash, vector, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (model, int(normalize), text_hash, np.asarray(vector, dtype=np.float32).tobytes(), now)
+                    for text_hash, vector in items
+                ],
+            )
+            # INSERT OR REPLACE로 덮어쓴 항목도 더하므로 실제 항목 수 이상입니다.
+            self._entries += len(items)
+            if self._entries > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _flush_touches(self):
+        if self._touches:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_access = ? WHERE model = ? AND normalize = ? AND text_hash = ?",
+                [(last_access, *key) for key, last_access in self._touches.items()],
+            )
+            self._touches.clear()
+        self._last_flush = time.monotonic()
+
+    def _evict(self):
+        # 최근 적중 기록을 먼저 반영해야 자주 쓰는 항목이 삭제되지 않음
+        self._flush_touches()
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        overflow = count - int(self.max_entries * EVICT_TARGET_RATIO) if count > self.max_entries else 0
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE rowid IN "
+                "(SELECT rowid FROM embeddings ORDER BY last_access LIMIT ?)",
+                (overflow,),
+            )
+        self._entries = count - overflow
+
+    def flush(self):
+        """모아 둔 사용 시각을 기록합니다."""
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": entries,
+            }
+
+class CachedEmbeddings(Embeddings):
+    """기존 임베딩 모델을 감싸 캐시에 없는 텍스트만 인코딩합니다."""
+
+    def __init__(self, embeddings, cache, model_name, normalize=True):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_name = model_name
+        self.normalize = normalize
+
+    def embed_documents(self, texts):
+        texts = list(texts)
+        hashes = [hash_text(text) for text in texts]
+        found = self.cache.get_many(self.model_name, self.normalize, hashes)
+
+        # 캐시에 없는 텍스트는 중복을 제거한 뒤 한 번에 인코딩
+        missing = {}
+        for text, text_hash in zip(texts, hashes):
+            if text_hash not in found and text_hash not in missing:
+                missing[text_hash] = text
+
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            new_items = list(zip(missing.keys(), vectors))
+            self.cache.put_many(self.model_name, self.normalize, new_items)
+            found.update(
+                (text_hash, np.asarray(vector, dtype=np.float32).tolist()) for text_hash, vector in new_items
+            )
+
+        return [found[text_hash] for text_hash in hashes]
+
+    def embed_query(self, text):
+        text_hash = hash_text(text)
+        with telemetry.span("embed_query") as span:
+            found = self.cache.get_many(self.model_name, self.normalize, [text_hash])
+            if text_hash in found:
+                span.set(cached=True)
+                telemetry.increment("embedding_cache", result="hit")
+                return found[text_hash]
+
+            telemetry.increment("embedding_cache", result="miss")
+            vector = self.embeddings.embed_query(text)
+            self.cache.put_many(self.model_name, self.normalize, [(text_hash, vector)])
+            return np.asarray(vector, dtype=np.float32).tolist()
+
+    def stats(self):
+        return self.cache.stats()
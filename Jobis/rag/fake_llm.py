@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+class FakeChatModel(BaseChatModel):
+    """Gemini 대신 사용하는 로컬 가짜 LLM입니다. (부하 테스트/벤치마크용)
+
+    API 호출 없이 latency초 만큼 기다린 뒤, 입력 길이만 요약한 고정된 답변을 돌려줍니다.
+    """
+
+    latency: float = 0.5        # 첫 토큰까지의 지연 (초)
+    token_latency: float = 0.0  # 스트리밍 시 토큰 간 지연 (초)
+
+    @property
+    def _llm_type(self):
+        return "jobis-fake"
+
+    def _make_answer(self, messages):
+        prompt_chars = sum(len(str(message.content)) for message in messages)
+        return f"[FAKE] 프롬프트 {prompt_chars}자를 받아 생성한 테스트 답변입니다."
+
+    def _tokens(self, answer):
+        words = answer.split(" ")
+        return [word if i == len(words) - 1 else word + " " for i, word in enumerate(words)]
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        answer = self._make_answer(messages)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=answer))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        answer = self._make_answer(messages)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=answer))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        for token in self._tokens(self._make_answer(messages)):
+            if self.token_latency:
+                time.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        for token in self._tokens(self._make_answer(messages)):
+            if self.token_latency:
+                await asyncio.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
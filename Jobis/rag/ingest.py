@@ -0,0 +1,156 @@
+import os
+import sys
+import time
+from itertools import islice
+
+from langchain_core.embeddings import Embeddings
+
+from rag.embedding_cache import CachedEmbeddings
+from rag.projection import unwrap_projection
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 기본 설정
+DEFAULT_BATCH_SIZE = 64
+SORT_WINDOW_BATCHES = 16  # 길이 정렬에 사용할 버퍼 크기 (배치 단위)
+
+def get_sentence_transformer(embeddings):
+    """LangChain 임베딩 객체에서 내부 SentenceTransformer 모델을 꺼냅니다."""
+    if isinstance(embeddings, CachedEmbeddings):
+        embeddings = embeddings.embeddings
+    return getattr(embeddings, '_client', None)
+
+def get_peak_rss_mb(children=False):
+    """현재 프로세스의 최대 RSS를 MB 단위로 반환합니다.
+
+    children=True이면 종료된 자식 프로세스(워커 풀) 중 가장 큰 한 프로세스의 최대 RSS를 반환합니다.
+    (두 값은 서로 다른 프로세스의 최댓값이므로 더해도 전체 사용량이 되지 않습니다.)
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return peak / divisor
+
+class PoolEmbeddings(Embeddings):
+    """SentenceTransformer 멀티 프로세스 풀로 문서를 인코딩하는 어댑터입니다."""
+
+    def __init__(self, model, pool, batch_size, normalize=True):
+        self.model = model
+        self.pool = pool
+        self.batch_size = batch_size
+        self.normalize = normalize
+
+    def embed_documents(self, texts):
+        vectors = self.model.encode(
+            list(texts),
+            pool=self.pool,
+            batch_size=self.batch_size,
+            normalize_embeddings=self.normalize,
+        )
+        return vectors.tolist()
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+class IngestEngine:
+    """문서를 배치 단위로 임베딩하고 완료된 배치를 바로 Chroma에 기록합니다.
+
+    - 토큰 길이 순으로 정렬해 배치 내 패딩 낭비를 줄입니다.
+    - num_workers > 1이면 SentenceTransformer 멀티 프로세스 풀을 사용합니다.
+    - 처리 속도(docs/sec)와 최대 메모리(peak RSS)를 리포트합니다.
+    - 압축 모드(ProjectedEmbeddings)이면 원래 차원으로 임베딩/캐시한 뒤 PCA 투영을 적용해 저장합니다.
+    """
+
+    def __init__(self, vector_store, embeddings, batch_size=DEFAULT_BATCH_SIZE, num_workers=1):
+        self.vector_store = vector_store
+        self.embeddings, self.projection = unwrap_projection(embeddings)
+        self.batch_size = batch_size
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.model = get_sentence_transformer(self.embeddings)
+
+    def _token_lengths(self, texts):
+        if self.model is None:
+            return [len(text) for text in texts]
+        encoded = self.model.tokenizer(texts, add_special_tokens=False)
+        return [len(ids) for ids in encoded['input_ids']]
+
+    def _sorted_batches(self, items):
+        """일정 크기의 버퍼 안에서 토큰 길이로 정렬한 배치를 순서대로 내보냅니다."""
+        items = iter(items)
+        window_size = self.batch_size * SORT_WINDOW_BATCHES
+        while True:
+            window = list(islice(items, window_size))
+            if not window:
+                return
+            lengths = self._token_lengths([doc.page_content for _, doc in window])
+            order = sorted(range(len(window)), key=lengths.__getitem__)
+            for start in range(0, len(order), self.batch_size):
+                yield [window[i] for i in order[start:start + self.batch_size]]
+
+    def _make_encoder(self, pool):
+        if pool is None:
+            return self.embeddings
+
+        pool_embeddings = PoolEmbeddings(
+            self.model,
+            pool,
+            batch_size=self.batch_size,
+            normalize=getattr(self.embeddings, 'normalize', True),
+        )
+        # 캐시를 쓰는 경우 캐시 미스만 풀로 보냅니다.
+        if isinstance(self.embeddings, CachedEmbeddings):
+            return CachedEmbeddings(
+                pool_embeddings,
+                self.embeddings.cache,
+                model_name=self.embeddings.model_name,
+                normalize=self.embeddings.normalize,
+            )
+        return pool_embeddings
+
+    def run(self, items, total=None):
+        """(id, Document) 목록을 임베딩해 upsert하고 처리 통계를 반환합니다."""
+        pool = None
+        if self.num_workers > 1 and self.model is not None:
+            print(f"   - 멀티 프로세스 풀 시작 (워커 {self.num_workers}개)")
+            pool = self.model.start_multi_process_pool(target_devices=['cpu'] * self.num_workers)
+
+        encoder = self._make_encoder(pool)
+        processed = 0
+        started = time.perf_counter()
+
+        try:
+            for batch in self._sorted_batches(items):
+                ids = [doc_id for doc_id, _ in batch]
+                texts = [doc.page_content for _, doc in batch]
+                vectors = encoder.embed_documents(texts)
+                if self.projection is not None:
+                    vectors = self.projection.transform(vectors).tolist()
+
+                self.vector_store._collection.upsert(
+                    ids=ids,
+                    embeddings=vectors,
+                    documents=texts,
+                    metadatas=[doc.metadata for _, doc in batch],
+                )
+
+                processed += len(batch)
+                elapsed = time.perf_counter() - started
+                progress = f"{processed}/{total}" if total else f"{processed}"
+                print(f"   - upsert 진행: {progress} ({processed / elapsed:.1f} docs/sec)")
+        finally:
+            if pool is not None:
+                self.model.stop_multi_process_pool(pool)
+
+        elapsed = time.perf_counter() - started
+        return {
+            "documents": processed,
+            "seconds": elapsed,
+            "docs_per_sec": processed / elapsed if elapsed > 0 else 0.0,
+            "peak_rss_mb": get_peak_rss_mb(),
+            "peak_child_rss_mb": get_peak_rss_mb(children=True) if pool is not None else None,
+        }
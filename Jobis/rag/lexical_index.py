@@ -0,0 +1,131 @@
+import json
+import math
+import os
+import re
+from collections import Counter
+
+import numpy as np
+
+from rag import vectorstore as vectorstore_module
+
+# BM25 역색인 설정
+LEXICAL_INDEX_DIR = 'lexical_index'  # 벡터 DB 폴더 안에 함께 저장
+MAX_TERM_LENGTH = 16  # 고정 길이 문자열 배열로 저장하기 위한 최대 토큰 길이
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r'[0-9a-z]+|[가-힣]+')
+
+def tokenize(text):
+    """한국어는 글자 2-gram, 영문/숫자는 단어 단위로 토큰화합니다. (예: "L2 정규화" -> l2, 정규, 규화)"""
+    tokens = []
+    for word in TOKEN_PATTERN.findall((text or '').lower()):
+        if word.isascii() or len(word) == 1:
+            tokens.append(word[:MAX_TERM_LENGTH])
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+def get_lexical_index_dir(persist_path=None):
+    return os.path.join(persist_path or vectorstore_module.PERSIST_PATH, LEXICAL_INDEX_DIR)
+
+def build_lexical_index(data, persist_path=None):
+    """전처리 데이터의 sentences(+기업명/산업)로 BM25 역색인을 만들어 npy 파일로 저장합니다."""
+    doc_ids = []
+    doc_lengths = []
+    postings = {}  # term -> [(doc_index, tf), ...]
+
+    for item in data:
+        doc_id = item.get('data_id')
+        if not doc_id:
+            continue
+        text = " ".join([
+            item.get('company_name') or '',
+            item.get('industry') or '',
+            *(item.get('sentences') or []),
+        ])
+        counts = Counter(tokenize(text))
+
+        doc_index = len(doc_ids)
+        doc_ids.append(doc_id)
+        doc_lengths.append(sum(counts.values()))
+        for term, tf in counts.items():
+            postings.setdefault(term, []).append((doc_index, tf))
+
+    terms = sorted(postings)
+    offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(postings[term]) for term in terms])
+    posting_docs = np.empty(offsets[-1], dtype=np.int32)
+    posting_tfs = np.empty(offsets[-1], dtype=np.float32)
+    for i, term in enumerate(terms):
+        entries = postings[term]
+        posting_docs[offsets[i]:offsets[i + 1]] = [doc_index for doc_index, _ in entries]
+        posting_tfs[offsets[i]:offsets[i + 1]] = [tf for _, tf in entries]
+
+    index_dir = get_lexical_index_dir(persist_path)
+    os.makedirs(index_dir, exist_ok=True)
+    np.save(os.path.join(index_dir, 'terms.npy'), np.array(terms, dtype=f'<U{MAX_TERM_LENGTH}'))
+    np.save(os.path.join(index_dir, 'offsets.npy'), offsets)
+    np.save(os.path.join(index_dir, 'posting_docs.npy'), posting_docs)
+    np.save(os.path.join(index_dir, 'posting_tfs.npy'), posting_tfs)
+    np.save(os.path.join(index_dir, 'doc_lengths.npy'), np.array(doc_lengths, dtype=np.float32))
+    np.save(os.path.join(index_dir, 'doc_ids.npy'), np.array(doc_ids, dtype=str))
+
+    avg_length = float(np.mean(doc_lengths)) if doc_lengths else 0.0
+    with open(os.path.join(index_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({"num_docs": len(doc_ids), "avg_length": avg_length}, f)
+
+    return index_dir
+
+class LexicalIndex:
+    """npy 파일을 메모리 매핑(mmap)해서 읽는 BM25 검색기입니다. 프로세스마다 다시 만들지 않습니다."""
+
+    def __init__(self, index_dir):
+        def load(name):
+            return np.load(os.path.join(index_dir, name), mmap_mode='r')
+
+        self.terms = load('terms.npy')
+        self.offsets = load('offsets.npy')
+        self.posting_docs = load('posting_docs.npy')
+        self.posting_tfs = load('posting_tfs.npy')
+        self.doc_lengths = load('doc_lengths.npy')
+        self.doc_ids = load('doc_ids.npy')
+        with open(os.path.join(index_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.num_docs = meta["num_docs"]
+        self.avg_length = meta["avg_length"] or 1.0
+
+    @classmethod
+    def load(cls, persist_path=None):
+        """저장된 역색인을 엽니다. 아직 만들어지지 않았으면 None을 반환합니다."""
+        index_dir = get_lexical_index_dir(persist_path)
+        if not os.path.exists(os.path.join(index_dir, 'meta.json')):
+            return None
+        return cls(index_dir)
+
+    def _postings(self, term):
+        position = int(np.searchsorted(self.terms, term))
+        if position >= len(self.terms) or self.terms[position] != term:
+            return None, None
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return self.posting_docs[start:end], self.posting_tfs[start:end]
+
+    def search(self, query, k=10):
+        """BM25 점수 상위 k개의 (data_id, 점수) 목록을 반환합니다."""
+        if self.num_docs == 0:
+            return []
+
+        scores = np.zeros(self.num_docs, dtype=np.float32)
+        for term, query_tf in Counter(tokenize(query)).items():
+            docs, tfs = self._postings(term)
+            if docs is None:
+                continue
+            df = len(docs)
+            idf = math.log(1 + (self.num_docs - df + 0.5) / (df + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[docs] / self.avg_length)
+            scores[docs] += query_tf * idf * tfs * (BM25_K1 + 1) / (tfs + norm)
+
+        k = min(k, self.num_docs)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(str(self.doc_ids[i]), float(scores[i])) for i in top if scores[i] > 0]
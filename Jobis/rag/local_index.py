@@ -0,0 +1,346 @@
+import json
+import math
+import os
+import shutil
+import sys
+import time
+from typing import Any
+
+import numpy as np
+import pyarrow as pa
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# `python rag/local_index.py`로 실행해도 rag 패키지를 찾을 수 있도록 루트 경로 추가
+if BASE_PATH not in sys.path:
+    sys.path.append(BASE_PATH)
+
+from rag import vectorstore as vectorstore_module
+
+# 로컬 ANN 인덱스 설정 (읽기 전용 서빙용, Chroma 컬렉션을 내보내서 만듦)
+LOCAL_INDEX_DIR = 'local_index'  # 벡터 DB 폴더 안에 컬렉션별로 저장
+DEFAULT_COLLECTION = 'langchain'  # langchain_chroma 기본 컬렉션 이름
+FILTER_COLUMNS = ("company_name", "industry", "type", "sentiment")  # 필터 검색을 지원하는 메타데이터
+EXPORT_BATCH_SIZE = 5_000  # Chroma에서 한 번에 읽어올 항목 수
+KMEANS_SAMPLE_SIZE = 50_000  # IVF 중심점 학습에 사용할 최대 벡터 수
+KMEANS_ITERATIONS = 20
+ASSIGN_BATCH_SIZE = 65_536
+DEFAULT_NPROBE = 16  # 검색 시 살펴볼 IVF 리스트 수
+BRUTE_FORCE_MAX_ROWS = 20_000  # 후보가 이보다 적으면 IVF 없이 정확 검색
+
+def get_local_index_dir(persist_path=None, collection_name=None):
+    return os.path.join(
+        persist_path or vectorstore_module.PERSIST_PATH,
+        LOCAL_INDEX_DIR,
+        collection_name or DEFAULT_COLLECTION,
+    )
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+def train_ivf(vectors, nlist, seed=42, iterations=KMEANS_ITERATIONS, sample_size=KMEANS_SAMPLE_SIZE):
+    """코사인 유사도 기준 k-means(spherical)로 IVF 중심점을 학습하고, 전체 벡터의 리스트 번호를 반환합니다."""
+    rng = np.random.default_rng(seed)
+    sample = vectors[rng.choice(len(vectors), size=min(sample_size, len(vectors)), replace=False)]
+    centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        empty = np.bincount(labels, minlength=nlist) == 0
+        # 비어 있는 리스트는 표본에서 새 중심점을 다시 뽑음
+        sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+        centroids = _normalize(sums)
+
+    assignments = np.concatenate([
+        np.argmax(vectors[start:start + ASSIGN_BATCH_SIZE] @ centroids.T, axis=1)
+        for start in range(0, len(vectors), ASSIGN_BATCH_SIZE)
+    ])
+    return centroids.astype(np.float32), assignments
+
+def export_local_index(persist_path=None, collection_name=None, nlist=None, output_dir=None):
+    """Chroma 컬렉션을 로컬 ANN 인덱스(npy + Arrow 파일)로 내보냅니다.
+
+    벡터는 IVF 리스트 순서로 정렬해 저장하므로 검색 시 리스트 하나가 연속된 메모리 구간이 됩니다.
+    """
+    persist_path = persist_path or vectorstore_module.PERSIST_PATH
+    output_dir = output_dir or get_local_index_dir(persist_path, collection_name)
+    chroma = vectorstore_module.open_chroma(persist_path, collection_name, create=False)
+    if chroma is None:
+        raise ValueError(f"내보낼 컬렉션이 없습니다: {persist_path} ({collection_name or DEFAULT_COLLECTION})")
+    collection = chroma._collection
+
+    ids, documents, metadatas, vectors = [], [], [], []
+    total = collection.count()
+    for offset in range(0, total, EXPORT_BATCH_SIZE):
+        batch = collection.get(
+            include=["embeddings", "documents", "metadatas"],
+            limit=EXPORT_BATCH_SIZE,
+            offset=offset,
+        )
+        ids.extend(batch["ids"])
+        documents.extend(batch["documents"])
+        metadatas.extend(metadata or {} for metadata in batch["metadatas"])
+        vectors.append(np.asarray(batch["embeddings"], dtype=np.float32))
+
+    if not ids:
+        raise ValueError(f"내보낼 문서가 없습니다: {persist_path} ({collection_name or DEFAULT_COLLECTION})")
+    vectors = _normalize(np.concatenate(vectors))
+    nlist = max(1, min(nlist or int(4 * math.sqrt(len(ids))), len(ids)))
+    centroids, assignments = train_ivf(vectors, nlist)
+    order = np.argsort(assignments, kind='stable')
+    offsets = np.zeros(nlist + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(assignments, minlength=nlist))
+
+    # 쓰는 도중 실패하면 기존 인덱스를 그대로 두도록 임시 폴더에 쓴 뒤 교체
+    tmp_dir = output_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    np.save(os.path.join(tmp_dir, 'vectors.npy'), vectors[order])
+    np.save(os.path.join(tmp_dir, 'centroids.npy'), centroids)
+    np.save(os.path.join(tmp_dir, 'offsets.npy'), offsets)
+
+    # id 조회용: 정렬된 id 배열 + 해당 행 번호 (searchsorted로 찾음)
+    sorted_ids = np.array([ids[row] for row in order], dtype=str)
+    id_order = np.argsort(sorted_ids, kind='stable')
+    np.save(os.path.join(tmp_dir, 'ids_sorted.npy'), sorted_ids[id_order])
+    np.save(os.path.join(tmp_dir, 'ids_rows.npy'), id_order.astype(np.int64))
+
+    # 필터 컬럼은 정수 코드 배열로 저장해 벡터 연산으로 거릅니다.
+    vocabularies = {}
+    for column in FILTER_COLUMNS:
+        values = [metadatas[row].get(column) for row in order]
+        vocabulary = sorted({value for value in values if value is not None})
+        codes = {value: code for code, value in enumerate(vocabulary)}
+        np.save(os.path.join(tmp_dir, f'codes_{column}.npy'),
+                np.array([codes.get(value, -1) for value in values], dtype=np.int32))
+        vocabularies[column] = vocabulary
+
+    # 본문/메타데이터는 Arrow IPC 파일로 저장 (메모리 매핑으로 필요한 행만 읽음)
+    metadata_keys = sorted({key for metadata in metadatas for key in metadata})
+    table = pa.table({
+        "id": [ids[row] for row in order],
+        "document": [documents[row] for row in order],
+        **{key: [metadatas[row].get(key) for row in order] for key in metadata_keys},
+    })
+    with pa.OSFile(os.path.join(tmp_dir, 'documents.arrow'), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            "count": len(ids),
+            "dim": int(vectors.shape[1]),
+            "nlist": nlist,
+            "metadata_keys": metadata_keys,
+            "vocabularies": vocabularies,
+            "db_version": vectorstore_module.get_db_version(persist_path),
+            "created": time.time(),
+        }, f, ensure_ascii=False)
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.replace(tmp_dir, output_dir)
+    return output_dir
+
+class LocalVectorStore(VectorStore):
+    """mmap NumPy 행렬 + IVF 인덱스 + Arrow 메타데이터로 동작하는 읽기 전용 VectorStore
+
+    get_retriever가 쓰는 Chroma 기능(similarity_search_by_vector의 where 필터, get(ids, where))을
+    같은 형식으로 지원하므로 Chroma 대신 그대로 사용할 수 있습니다.
+    """
+
+    def __init__(self, index_dir, embedding, nprobe=DEFAULT_NPROBE):
+        def load(name):
+            return np.load(os.path.join(index_dir, name), mmap_mode='r')
+
+        with open(os.path.join(index_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.index_dir = index_dir
+        self._embedding = embedding
+        self.nprobe = nprobe
+        self.vectors = load('vectors.npy')
+        self.centroids = np.load(os.path.join(index_dir, 'centroids.npy'))
+        self.offsets = np.load(os.path.join(index_dir, 'offsets.npy'))
+        self.ids_sorted = load('ids_sorted.npy')
+        self.ids_rows = load('ids_rows.npy')
+        self.codes = {column: load(f'codes_{column}.npy') for column in FILTER_COLUMNS}
+        self.vocabularies = {
+            column: {value: code for code, value in enumerate(values)}
+            for column, values in self.meta["vocabularies"].items()
+        }
+        self.table = pa.ipc.open_file(pa.memory_map(os.path.join(index_dir, 'documents.arrow'))).read_all()
+
+    @classmethod
+    def load(cls, embedding, persist_path=None, collection_name=None, nprobe=DEFAULT_NPROBE):
+        """내보낸 로컬 인덱스를 엽니다. 아직 만들어지지 않았으면 None을 반환합니다."""
+        index_dir = get_local_index_dir(persist_path, collection_name)
+        if not os.path.exists(os.path.join(index_dir, 'meta.json')):
+            return None
+        return cls(index_dir, embedding, nprobe=nprobe)
+
+    @property
+    def embeddings(self):
+        return self._embedding
+
+    def count(self):
+        return self.meta["count"]
+
+    # --- 필터 ---
+    def _condition_mask(self, column, condition):
+        if column not in self.codes:
+            raise ValueError(f"로컬 인덱스는 {FILTER_COLUMNS} 컬럼만 필터링할 수 있습니다: {column}")
+        codes = self.codes[column]
+        vocabulary = self.vocabularies[column]
+
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        (operator, value), = condition.items()
+        if operator in ("$eq", "$ne"):
+            mask = codes == vocabulary.get(value, -2)
+            return mask if operator == "$eq" else ~mask
+        if operator in ("$in", "$nin"):
+            mask = np.isin(codes, [vocabulary[item] for item in value if item in vocabulary])
+            return mask if operator == "$in" else ~mask
+        raise ValueError(f"지원하지 않는 필터 연산자입니다: {operator}")
+
+    def _filter_mask(self, where):
+        """Chroma where 형식({"company_name": "A"}, {"type": {"$in": [...]}}, {"$and": [...]})을 bool 배열로 바꿉니다."""
+        masks = []
+        for key, value in where.items():
+            if key in ("$and", "$or"):
+                children = [self._filter_mask(child) for child in value]
+                masks.append(np.logical_and.reduce(children) if key == "$and" else np.logical_or.reduce(children))
+            else:
+                masks.append(self._condition_mask(key, value))
+        return np.logical_and.reduce(masks)
+
+    # --- 검색 ---
+    def _candidate_rows(self, query, k, mask):
+        """IVF 리스트를 중심점 유사도 순으로 살펴보며 후보 행 번호를 모읍니다."""
+        count = self.meta["count"]
+        if mask is not None:
+            matched = int(mask.sum())
+            if matched <= BRUTE_FORCE_MAX_ROWS:
+                return np.flatnonzero(mask)
+        if count <= BRUTE_FORCE_MAX_ROWS or self.nprobe >= len(self.centroids):
+            return np.arange(count) if mask is None else np.flatnonzero(mask)
+
+        probe_order = np.argsort(-(self.centroids @ query))
+        rows, found = [], 0
+        for probed, list_index in enumerate(probe_order, start=1):
+            start, end = self.offsets[list_index], self.offsets[list_index + 1]
+            list_rows = np.arange(start, end)
+            if mask is not None:
+                list_rows = list_rows[mask[start:end]]
+            rows.append(list_rows)
+            found += len(list_rows)
+            # 필터 때문에 후보가 모자라면 k개를 채울 때까지 리스트를 더 살펴봄
+            if probed >= self.nprobe and found >= k:
+                break
+        return np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+
+    def _search(self, embedding, k, where=None):
+        if self.meta["count"] == 0:
+            return []
+        query = _normalize(np.asarray(embedding, dtype=np.float32))
+        mask = self._filter_mask(where) if where else None
+        rows = self._candidate_rows(query, k, mask)
+        if len(rows) == 0:
+            return []
+
+        # IVF 리스트를 살펴본 순서대로 모인 행 번호를 정렬해 디스크 순서로 읽고, 연속 구간이면 슬라이스로 읽어 복사를 줄임
+        rows = np.sort(rows)
+        if rows[-1] - rows[0] + 1 == len(rows):
+            scores = self.vectors[rows[0]:rows[-1] + 1] @ query
+        else:
+            scores = self.vectors[rows] @ query
+        k = min(k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(rows[i]), float(scores[i])) for i in top]
+
+    def _documents(self, rows):
+        records = self.table.take(pa.array(rows, type=pa.int64())).to_pylist()
+        return [
+            Document(
+                id=record["id"],
+                page_content=record["document"],
+                metadata={key: record[key] for key in self.meta["metadata_keys"] if record[key] is not None},
+            )
+            for record in records
+        ]
+
+    def similarity_search_with_score_by_vector(self, embedding, k=4, filter=None, **kwargs):
+        hits = self._search(embedding, k, filter)
+        documents = self._documents([row for row, _ in hits])
+        # Chroma 기본 설정과 같이 점수는 제곱 L2 거리로 반환 (정규화된 벡터이므로 2 - 2 * 코사인 유사도)
+        return [(doc, 2.0 - 2.0 * score) for doc, (_, score) in zip(documents, hits)]
+
+    def similarity_search_by_vector(self, embedding, k=4, filter=None, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k, filter)]
+
+    def similarity_search_with_score(self, query, k=4, filter=None, **kwargs):
+        return self.similarity_search_with_score_by_vector(self._embedding.embed_query(query), k, filter)
+
+    def similarity_search(self, query, k=4, filter=None, **kwargs):
+        return self.similarity_search_by_vector(self._embedding.embed_query(query), k, filter)
+
+    def _select_relevance_score_fn(self):
+        return self._euclidean_relevance_score_fn
+
+    # --- Chroma 호환 조회 ---
+    def _rows_for_ids(self, ids):
+        ids = np.asarray(ids, dtype=str)
+        positions = np.searchsorted(self.ids_sorted, ids)
+        positions = np.minimum(positions, len(self.ids_sorted) - 1)
+        found = self.ids_sorted[positions] == ids
+        return self.ids_rows[positions[found]]
+
+    def get(self, ids=None, where=None, include=None, **kwargs):
+        """Chroma의 get과 같은 형식({"ids", "documents", "metadatas"})으로 반환합니다."""
+        if ids is not None:
+            rows = self._rows_for_ids(ids) if len(ids) and self.meta["count"] else np.zeros(0, dtype=np.int64)
+        else:
+            rows = np.arange(self.meta["count"])
+        if where:
+            rows = rows[self._filter_mask(where)[rows]]
+
+        documents = self._documents(rows.tolist())
+        return {
+            "ids": [doc.id for doc in documents],
+            "documents": [doc.page_content for doc in documents],
+            "metadatas": [doc.metadata for doc in documents],
+        }
+
+    # --- 쓰기 (지원하지 않음) ---
+    def add_texts(self, texts, metadatas=None, **kwargs: Any):
+        raise NotImplementedError("LocalVectorStore는 읽기 전용입니다. Chroma에 추가한 뒤 export_local_index로 다시 내보내세요.")
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, **kwargs: Any):
+        raise NotImplementedError("LocalVectorStore는 export_local_index로 만든 인덱스를 LocalVectorStore.load로 엽니다.")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Chroma 벡터 DB를 로컬 ANN 인덱스로 내보내기")
+    parser.add_argument("--persist-path", default=vectorstore_module.PERSIST_PATH)
+    parser.add_argument("--nlist", type=int, help="IVF 리스트 수 (기본: 4 * sqrt(문서 수))")
+    args = parser.parse_args()
+
+    for collection_name in (None, vectorstore_module.CHUNK_COLLECTION):
+        started = time.perf_counter()
+        try:
+            index_dir = export_local_index(args.persist_path, collection_name, nlist=args.nlist)
+        except ValueError as e:
+            print(f"건너뜀: {e}")
+            continue
+        with open(os.path.join(index_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        print(f"내보내기 완료: {index_dir} ({meta['count']}개, IVF {meta['nlist']}개 리스트, "
+              f"{time.perf_counter() - started:.1f}초)")
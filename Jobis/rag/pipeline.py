@@ -1,30 +1,19 @@
+import logging
 import os
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables import RunnableGenerator, RunnableLambda, RunnablePassthrough
 
-def format_docs(docs):
-    if not docs:
-        return ""
-    
-    formatted = []
-    for doc in docs:
-        company = doc.metadata.get('company_name', 'Unknown')
-        content = doc.page_content
-        formatted.append(f"[{company}]\n{content}")
-        
-    return "\n\n".join(formatted)
-
-def build_rag_chain(retriever):
-    # LLM 설정
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash",
-        temperature=0,
-        google_api_key=os.getenv("GOOGLE_API_KEY")
-    )
+from rag.context import CONTEXT_TOKEN_BUDGET, build_context, count_tokens
+from rag import telemetry
+
+logger = logging.getLogger(__name__)
+
+# .env에 JOBIS_LLM=fake를 넣으면 Gemini 대신 로컬 가짜 LLM을 사용합니다. (API 키 없이 개발/벤치마크)
+LLM_BACKEND = os.getenv("JOBIS_LLM", "gemini")
+FAKE_LLM_LATENCY = float(os.getenv("JOBIS_FAKE_LLM_LATENCY", "0.5"))
 
-    template = """
+PROMPT_TEMPLATE = """
     당신은 취업 정보 전문가 AI 'JOBIS'입니다.
     아래 [관련 기업 정보]를 참고하여 질문에 답변해주세요.
     단, [관련 기업 정보]에 질문에서 물어보는 정확한 단어가 없더라도 유사한 내용이 있다면 답변해주세요.
@@ -38,15 +27,81 @@ def build_rag_chain(retriever):
     * 질문에 답변할 내용이 정보에 없다면 "죄송합니다. 해당 내용에 대한 정보를 찾을 수 없습니다."라고 답변을 해주세요.
     * 답변:
     """
-    
-    prompt = PromptTemplate.from_template(template)
 
-    # Chain 구성
-    rag_chain = (
-        {"context": retriever | format_docs, "question": RunnablePassthrough()}
-        | prompt
+def format_docs(docs, max_tokens=CONTEXT_TOKEN_BUDGET):
+    # 중복 제거 + 기업별 묶음 + 토큰 예산 적용 (context.py)
+    with telemetry.span("format_docs") as span:
+        context = build_context(docs, max_tokens=max_tokens)
+        if telemetry.is_enabled():
+            span.set(docs=len(docs), context_chars=len(context), context_tokens=count_tokens(context))
+    return context
+
+def log_prompt_tokens(prompt_value):
+    # 토큰 수 계산(토크나이저 실행)은 INFO 로그가 켜져 있을 때만 합니다.
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("LLM 입력: %d tokens", count_tokens(prompt_value.to_string()))
+    return prompt_value
+
+def _log_answer_tokens(chunks):
+    if not logger.isEnabledFor(logging.INFO):
+        yield from chunks
+        return
+    answer = []
+    for chunk in chunks:
+        answer.append(chunk)
+        yield chunk
+    logger.info("LLM 출력: %d tokens", count_tokens("".join(answer)))
+
+async def _alog_answer_tokens(chunks):
+    enabled = logger.isEnabledFor(logging.INFO)
+    answer = []
+    async for chunk in chunks:
+        if enabled:
+            answer.append(chunk)
+        yield chunk
+    if enabled:
+        logger.info("LLM 출력: %d tokens", count_tokens("".join(answer)))
+
+def get_llm():
+    # LLM 클라이언트 패키지는 무거우므로 처음 생성할 때 import (챗봇 시작 시간 단축)
+    if LLM_BACKEND == "fake":
+        from rag.fake_llm import FakeChatModel
+        return FakeChatModel(latency=FAKE_LLM_LATENCY)
+
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.5-flash",
+        temperature=0,
+        google_api_key=os.getenv("GOOGLE_API_KEY")
+    )
+
+def build_prompt():
+    return PromptTemplate.from_template(PROMPT_TEMPLATE)
+
+def build_answer_chain(llm=None):
+    """{context, question} 입력을 받아 답변 문자열을 생성하는 Chain (프롬프트 + LLM)"""
+    # LLM 설정
+    if llm is None:
+        llm = get_llm()
+
+    prompt = build_prompt()
+    # 계측이 켜져 있으면 LLM 호출 시간/첫 토큰까지의 시간을 기록 (telemetry.py)
+    llm = telemetry.instrument(llm, "llm")
+
+    # 토큰 로깅 단계는 스트리밍을 막지 않도록 generator로 구성
+    return (
+        prompt
+        | RunnableLambda(log_prompt_tokens)
         | llm
         | StrOutputParser()
+        | RunnableGenerator(_log_answer_tokens, _alog_answer_tokens)
+    )
+
+def build_rag_chain(retriever, llm=None):
+    # Chain 구성
+    rag_chain = (
+        {"context": telemetry.instrument(retriever, "retriever") | format_docs, "question": RunnablePassthrough()}
+        | build_answer_chain(llm)
     )
 
     return rag_chain
\ No newline at end of file
@@ -1,11 +1,34 @@
+import argparse
 import json
 import os
 import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 # 경로 맟 설정
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# `python rag/preprocessing.py`로 실행해도 rag 패키지를 찾을 수 있도록 루트 경로 추가
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+
+from rag.processed_store import PARQUET_SUFFIX, get_parquet_path, iter_processed_records, write_processed_table
+
 INPUT_FILE = os.path.join(BASE_DIR, 'data', 'raw', 'jobis_rag_data.json')
 OUTPUT_FILE = os.path.join(BASE_DIR, 'data', 'processed', 'cleaned_data.json')
+OUTPUT_JSONL_FILE = os.path.join(BASE_DIR, 'data', 'processed', 'cleaned_data.jsonl')
+OUTPUT_PARQUET_FILE = get_parquet_path(OUTPUT_FILE)  # 기본 출력 (컬럼 저장소)
+OUTPUT_FORMATS = ('parquet', 'jsonl', 'json')
+READ_CHUNK_SIZE = 1 << 20  # 스트리밍 파서가 한 번에 읽는 글자 수
+COMPANY_CHUNK_SIZE = 8  # 워커 프로세스 하나에 한 번에 넘기는 기업 수
+
+# 정규식은 모듈 로드 시 한 번만 컴파일 (항목마다 re 캐시 조회를 하지 않도록)
+MISSING_MARKER_PATTERN = re.compile(r'\([^)]*결측치[^)]*\)')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+SENTENCE_BOUNDARY_PATTERN = re.compile(r'(?<=[.?!])\s+')
+ARRAY_SEPARATOR_PATTERN = re.compile(r'[\s,]*')
+ARRAY_VALUE_END_PATTERN = re.compile(r'\s*[,\]]')  # 배열 원소 뒤에 와야 하는 구분자
 
 # 디렉터리가 없으면 생성
 os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
@@ -17,10 +40,10 @@ def clean_text(text):
     
     # 1. "(... - 결측치 포함)" 또는 "(결측치 포함)" 같은 패턴 제거
     # 괄호와 그 안의 내용 중 '결측치'라는 단어가 들어가면 삭제
-    text = re.sub(r'\([^)]*결측치[^)]*\)', '', text)
+    text = MISSING_MARKER_PATTERN.sub('', text)
     
     # 2. 앞뒤 공백 제거 및 다중 공백을 하나로 줄임
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = WHITESPACE_PATTERN.sub(' ', text).strip()
     
     return text
 
@@ -30,7 +53,7 @@ def split_sentences(text):
         return []
     
     # 문장 끝(. ? !) 뒤에 공백이 오면 분리
-    sentences = re.split(r'(?<=[.?!])\s+', text)
+    sentences = SENTENCE_BOUNDARY_PATTERN.split(text)
     return [s for s in sentences if s.strip()]
 
 # 평점(1~5)을 기반으로 감정을 라벨링
@@ -45,83 +68,231 @@ def get_sentiment_label(score):
     else:
         return "neutral"
 
-# 메인 로직
-def process_data():
-    print(f"Loading data from {INPUT_FILE}...")
+# JSON 배열 파일을 통째로 읽지 않고 원소(기업)를 하나씩 파싱해서 반환
+def iter_json_array(path, chunk_size=READ_CHUNK_SIZE):
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        # 앞쪽 공백이 첫 버퍼보다 길 수 있으므로 공백이 아닌 글자가 나올 때까지 읽음
+        buffer = ''
+        while not buffer:
+            more = f.read(chunk_size)
+            if not more:
+                break
+            buffer = more.lstrip()
+        if not buffer.startswith('['):
+            raise ValueError(f"JSON 배열 형식이 아닙니다: {path}")
+        position = 1
+        eof = False
+
+        while True:
+            position = ARRAY_SEPARATOR_PATTERN.match(buffer, position).end()
+            if buffer.startswith(']', position):
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+                # 숫자처럼 끝 표시가 없는 값은 앞부분만 파싱될 수 있으므로(예: "12" + "3") 뒤에 구분자가 보일 때만 인정
+                if not ARRAY_VALUE_END_PATTERN.match(buffer, end):
+                    raise json.JSONDecodeError("배열 원소 뒤에 ',' 또는 ']'가 없습니다", buffer, end)
+            except json.JSONDecodeError:
+                # 원소가 버퍼 경계에서 잘렸으면 읽은 부분을 버리고 더 읽어서 다시 시도
+                if eof:
+                    raise
+                more = f.read(chunk_size)
+                eof = not more
+                buffer = buffer[position:] + more
+                position = 0
+                continue
+            position = end
+            yield item
+
+# JSON 배열(.json) 또는 JSON Lines(.jsonl) 파일의 항목을 하나씩 반환
+def iter_json_records(path):
+    if not path.endswith('.jsonl'):
+        yield from iter_json_array(path)
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+# 전처리 결과 파일 중 실제로 존재하는 것을 찾음 (Parquet > JSON Lines > JSON 순서)
+def find_processed_file(path=OUTPUT_FILE, prefer_parquet=True):
+    base = os.path.splitext(path)[0]
+    candidates = [base + '.jsonl', path]
+    if prefer_parquet:
+        candidates.insert(0, get_parquet_path(path))
+    for candidate in candidates:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+# 전처리 결과를 한 항목씩 읽어서 반환
+# Parquet이면 필요한 컬럼(columns)과 행(기업명/날짜 조건)만 읽고, JSON이면 점진적으로 파싱한 뒤 같은 조건을 적용
+def load_processed_items(path=OUTPUT_FILE, columns=None, companies=None, date_from=None, date_to=None,
+                         prefer_parquet=True):
+    source = find_processed_file(path, prefer_parquet)
+    if source is None:
+        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {path}")
+
+    if source.endswith(PARQUET_SUFFIX):
+        yield from iter_processed_records(source, columns, companies, date_from, date_to)
+        return
+
+    items = iter_json_records(source)
+    company_set = set(companies) if companies else None
+    for item in items:
+        if company_set is not None and item.get('company_name') not in company_set:
+            continue
+        if date_from and not (item.get('date') and item['date'] >= date_from):
+            continue
+        if date_to and not (item.get('date') and item['date'] <= date_to):
+            continue
+        if columns is not None:
+            item = {key: item[key] for key in columns if key in item}
+        yield item
+
+# 기업 하나의 원본 데이터를 전처리 항목들로 변환
+def process_company(company):
+    company_id = company.get('company_id')
+    company_name = company.get('company_name')
+    industry = company.get('industry')
     
-    try:
-        with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-            raw_data = json.load(f)
-    except FileNotFoundError:
+    for item in company.get('data', []):
+        processed_item = {
+            "company_id": company_id,
+            "company_name": company_name,
+            "industry": industry,
+            "type": item['type'],
+            "data_id": item['data_id']
+        }
+
+        # Review 데이터 처리
+        if item['type'] == 'review':
+            review_content = item.get('review', {})
+            
+            # 1. 텍스트 필드 클리닝 (결측치 제거)
+            re_adv = clean_text(review_content.get('re_adv'))
+            re_dis = clean_text(review_content.get('re_dis')) # null인 경우 빈 문자열 반환됨
+            
+            # 2. 감정 라벨링 (점수 기반)
+            score = review_content.get('re_score')
+            sentiment = get_sentiment_label(score)
+            
+            # 3. 텍스트 통합 (장점 + 단점) 및 문장 분리
+            full_text = f"장점: {re_adv} 단점: {re_dis}".strip() # 텍스트 통합
+            sentences = split_sentences(full_text) # 문장 분리
+
+            processed_item.update({
+                "score": score,
+                "sentiment": sentiment,
+                "content": full_text,
+                "sentences": sentences,
+                "date": review_content.get('re_date')
+            })
+
+        # Interview 데이터 처리
+        elif item['type'] == 'interview':
+            interview_content = item.get('interview', {})
+            
+            in_title = clean_text(interview_content.get('in_title'))
+            in_query = clean_text(interview_content.get('in_query'))
+            
+            full_text = f"면접 질문: {in_query} 답변/후기: {in_title}"
+            sentences = split_sentences(full_text)
+
+            processed_item.update({
+                "content": full_text,
+                "sentences": sentences,
+                "sentiment": "neutral" # 면접 정보는 중립으로 가정
+            })
+
+        # 내용이 비어있지 않은 경우에만 반환
+        if processed_item.get('content'):
+            yield processed_item
+
+# 워커 프로세스에서 실행: 기업 묶음 하나를 전처리 항목 리스트로 변환
+def process_company_chunk(companies):
+    return [processed_item for company in companies for processed_item in process_company(company)]
+
+def _chunked(iterable, size):
+    chunk = []
+    for value in iterable:
+        chunk.append(value)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+# 기업 목록(리스트 또는 제너레이터)을 전처리 항목 스트림으로 변환
+# num_workers > 1이면 기업 묶음을 여러 프로세스에서 처리하되, 결과는 입력 순서 그대로 반환
+def iter_processed(raw_companies, num_workers=1, chunk_size=COMPANY_CHUNK_SIZE):
+    if num_workers <= 1:
+        for company in raw_companies:
+            yield from process_company(company)
+        return
+
+    # executor.map은 입력을 한꺼번에 제출하므로, 진행 중인 묶음 수를 제한해 메모리 사용량을 일정하게 유지
+    max_inflight = num_workers * 2
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        inflight = deque()
+        for chunk in _chunked(raw_companies, chunk_size):
+            inflight.append(executor.submit(process_company_chunk, chunk))
+            if len(inflight) >= max_inflight:
+                yield from inflight.popleft().result()
+        while inflight:
+            yield from inflight.popleft().result()
+
+# 메인 로직
+def process_data(output_format='parquet', num_workers=1, input_file=None):
+    # 원본은 JSON 배열 또는 dumy.py가 만든 JSON Lines(한 줄에 기업 하나)
+    input_file = input_file or INPUT_FILE
+    print(f"Loading data from {input_file}...")
+
+    if not os.path.exists(input_file):
         print("Error: 파일을 찾을 수 없습니다. 경로를 확인해주세요.")
         return
 
-    processed_list = []
-
-    for company in raw_data:
-        company_id = company.get('company_id')
-        company_name = company.get('company_name')
-        industry = company.get('industry')
-        
-        for item in company.get('data', []):
-            processed_item = {
-                "company_id": company_id,
-                "company_name": company_name,
-                "industry": industry,
-                "type": item['type'],
-                "data_id": item['data_id']
-            }
-
-            # Review 데이터 처리
-            if item['type'] == 'review':
-                review_content = item.get('review', {})
-                
-                # 1. 텍스트 필드 클리닝 (결측치 제거)
-                re_adv = clean_text(review_content.get('re_adv'))
-                re_dis = clean_text(review_content.get('re_dis')) # null인 경우 빈 문자열 반환됨
-                
-                # 2. 감정 라벨링 (점수 기반)
-                score = review_content.get('re_score')
-                sentiment = get_sentiment_label(score)
-                
-                # 3. 텍스트 통합 (장점 + 단점) 및 문장 분리
-                full_text = f"장점: {re_adv} 단점: {re_dis}".strip() # 텍스트 통합
-                sentences = split_sentences(full_text) # 문장 분리
-
-                processed_item.update({
-                    "score": score,
-                    "sentiment": sentiment,
-                    "content": full_text,
-                    "sentences": sentences,
-                    "date": review_content.get('re_date')
-                })
-
-            # Interview 데이터 처리
-            elif item['type'] == 'interview':
-                interview_content = item.get('interview', {})
-                
-                in_title = clean_text(interview_content.get('in_title'))
-                in_query = clean_text(interview_content.get('in_query'))
-                
-                full_text = f"면접 질문: {in_query} 답변/후기: {in_title}"
-                sentences = split_sentences(full_text)
-
-                processed_item.update({
-                    "content": full_text,
-                    "sentences": sentences,
-                    "sentiment": "neutral" # 면접 정보는 중립으로 가정
-                })
-
-            # 내용이 비어있지 않은 경우에만 리스트에 추가
-            if processed_item.get('content'):
-                processed_list.append(processed_item)
-
-    # 저장
-    print(f"Saving processed data to {OUTPUT_FILE}...")
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(processed_list, f, ensure_ascii=False, indent=2)
-    
-    print("Pre-processing completed successfully!")
+    output_file = {'parquet': OUTPUT_PARQUET_FILE, 'jsonl': OUTPUT_JSONL_FILE, 'json': OUTPUT_FILE}[output_format]
+
+    if output_format == 'json':
+        raw_data = list(iter_json_records(input_file))
+
+        processed_list = list(iter_processed(raw_data, num_workers))
+
+        # 저장
+        print(f"Saving processed data to {output_file}...")
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(processed_list, f, ensure_ascii=False, indent=2)
+        count = len(processed_list)
+    else:
+        # 기업을 하나씩 읽고 → 전처리하고 → 순서대로 저장 (메모리 사용량이 데이터 크기와 무관)
+        print(f"Streaming processed data to {output_file}...")
+        processed_items = iter_processed(iter_json_records(input_file), num_workers)
+        if output_format == 'parquet':
+            count = write_processed_table(processed_items, output_file)
+        else:
+            count = 0
+            with open(output_file, 'w', encoding='utf-8') as f:
+                for processed_item in processed_items:
+                    f.write(json.dumps(processed_item, ensure_ascii=False) + "\n")
+                    count += 1
+
+    # 로더는 Parquet > JSON Lines > JSON 순으로 읽으므로, 더 우선하는 이전 출력이 남아 있으면 삭제
+    for stale_file in (OUTPUT_PARQUET_FILE, OUTPUT_JSONL_FILE):
+        if stale_file == output_file:
+            break
+        if os.path.exists(stale_file):
+            os.remove(stale_file)
+
+    print(f"Pre-processing completed successfully! ({count} items)")
 
 if __name__ == "__main__":
-    process_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Jobis 데이터 전처리")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default='parquet',
+                        help="출력 형식 (기본 parquet: 컬럼 단위로 읽을 수 있는 cleaned_data.parquet)")
+    parser.add_argument("--workers", type=int, default=1, help="전처리 워커 프로세스 수 (0이면 CPU 코어 수)")
+    parser.add_argument("--input", default=INPUT_FILE, help="원본 데이터 경로 (.json 또는 .jsonl)")
+    args = parser.parse_args()
+
+    process_data(output_format=args.format, num_workers=args.workers or os.cpu_count(), input_file=args.input)
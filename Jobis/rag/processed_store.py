@@ -0,0 +1,164 @@
+import datetime
+import logging
+import os
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+
+logger = logging.getLogger(__name__)
+
+# 전처리 결과 컬럼 저장소 (Parquet) 설정
+PARQUET_SUFFIX = '.parquet'
+WRITE_BATCH_SIZE = 10_000  # 한 번에 RecordBatch로 묶어 쓰는 항목 수
+ROW_GROUP_SIZE = 16_384  # 행 그룹이 작을수록 기업/날짜 조건으로 건너뛸 수 있는 범위가 촘촘해짐
+READ_BATCH_SIZE = 4_096
+
+SCHEMA = pa.schema([
+    ("company_id", pa.string()),
+    ("company_name", pa.string()),
+    ("industry", pa.string()),
+    ("type", pa.string()),
+    ("data_id", pa.string()),
+    ("score", pa.float64()),  # 소수 평점이 잘리지 않도록 float (읽을 때 정수 값은 int로 되돌림)
+    ("sentiment", pa.string()),
+    ("date", pa.date32()),
+    ("content", pa.string()),
+    ("sentences", pa.list_(pa.string())),
+])
+COLUMNS = SCHEMA.names
+
+def get_parquet_path(path):
+    """cleaned_data.json 같은 경로에서 같은 이름의 .parquet 경로를 만듭니다."""
+    return os.path.splitext(path)[0] + PARQUET_SUFFIX
+
+def _parse_date(value, data_id=None):
+    """YYYY-MM-DD(또는 YYYY.MM.DD, YYYY/MM/DD, 시각이 붙은 ISO 문자열)를 date로 바꿉니다.
+
+    형식이 잘못된 날짜는 항목 하나 때문에 전체 쓰기가 중단되지 않도록 경고만 남기고 None(null)으로 저장합니다.
+    """
+    if isinstance(value, datetime.date):
+        return value
+    text = str(value).strip()
+    for candidate in (text, text[:10].replace('.', '-').replace('/', '-')):
+        try:
+            return datetime.date.fromisoformat(candidate)
+        except ValueError:
+            continue
+    logger.warning("날짜 형식이 올바르지 않아 비워 둡니다: data_id=%r, date=%r (YYYY-MM-DD 필요)", data_id, value)
+    return None
+
+def _to_row(item):
+    row = {name: item.get(name) for name in COLUMNS}
+    if row["date"]:
+        row["date"] = _parse_date(row["date"], row["data_id"])
+    elif row["date"] == "":
+        row["date"] = None
+    return row
+
+def write_processed_table(items, path, batch_size=WRITE_BATCH_SIZE):
+    """전처리 항목 이터러블을 Parquet 파일로 씁니다. batch_size개씩 나눠 쓰므로 메모리 사용량이 일정합니다."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    count = 0
+
+    with pq.ParquetWriter(tmp_path, SCHEMA, compression='zstd') as writer:
+        rows = []
+        for item in items:
+            rows.append(_to_row(item))
+            if len(rows) >= batch_size:
+                writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=SCHEMA), row_group_size=ROW_GROUP_SIZE)
+                count += len(rows)
+                rows = []
+        if rows:
+            writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=SCHEMA), row_group_size=ROW_GROUP_SIZE)
+            count += len(rows)
+
+    # 쓰는 도중 실패하면 기존 파일을 그대로 두도록 마지막에 교체
+    os.replace(tmp_path, path)
+    return count
+
+def build_filter(companies=None, date_from=None, date_to=None):
+    """기업명/날짜 조건을 pyarrow 필터 식으로 만듭니다. 조건이 없으면 None"""
+    conditions = []
+    if companies:
+        conditions.append(ds.field("company_name").isin(list(companies)))
+    if date_from:
+        conditions.append(ds.field("date") >= pa.scalar(datetime.date.fromisoformat(date_from)))
+    if date_to:
+        conditions.append(ds.field("date") <= pa.scalar(datetime.date.fromisoformat(date_to)))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+def open_dataset(path):
+    # 로컬 파일을 메모리 매핑으로 열어 필요한 컬럼 페이지만 읽습니다.
+    return ds.dataset(path, format="parquet", filesystem=fs.LocalFileSystem(use_mmap=True))
+
+def load_processed_table(path, columns=None, companies=None, date_from=None, date_to=None):
+    """필요한 컬럼/행만 pyarrow Table로 읽습니다. (분석용)
+
+    조건은 행 그룹 통계로 먼저 걸러지므로 해당하지 않는 행 그룹은 디스크에서 읽지 않습니다.
+    """
+    return open_dataset(path).to_table(columns=columns, filter=build_filter(companies, date_from, date_to))
+
+def iter_processed_records(path, columns=None, companies=None, date_from=None, date_to=None,
+                           batch_size=READ_BATCH_SIZE):
+    """Parquet 파일을 배치 단위로 읽어 항목(dict)을 하나씩 반환합니다.
+
+    기존 JSON 항목과 같은 모양이 되도록 날짜는 "YYYY-MM-DD" 문자열로, 정수 평점은 int로 바꾸고,
+    값이 없는(null) 필드는 뺍니다. (build_metadata는 null과 누락을 같은 기본값으로 처리)
+    """
+    dataset = open_dataset(path)
+    batches = dataset.to_batches(
+        columns=columns,
+        filter=build_filter(companies, date_from, date_to),
+        batch_size=batch_size,
+    )
+    for batch in batches:
+        for row in batch.to_pylist():
+            item = {key: value for key, value in row.items() if value is not None}
+            if isinstance(item.get("date"), datetime.date):
+                item["date"] = item["date"].isoformat()
+            if isinstance(item.get("score"), float) and item["score"].is_integer():
+                item["score"] = int(item["score"])
+            yield item
+
+def table_from_items(items, columns=None, batch_size=WRITE_BATCH_SIZE):
+    """JSON 항목 이터러블을 같은 스키마의 pyarrow Table로 만듭니다. (JSON 입력을 컬럼 연산으로 검증할 때 사용)"""
+    schema = SCHEMA if columns is None else pa.schema([SCHEMA.field(name) for name in columns])
+    batches, rows = [], []
+    for item in items:
+        rows.append(_to_row(item))
+        if len(rows) >= batch_size:
+            batches.append(pa.RecordBatch.from_pylist(rows, schema=schema))
+            rows = []
+    if rows:
+        batches.append(pa.RecordBatch.from_pylist(rows, schema=schema))
+    return pa.Table.from_batches(batches, schema=schema)
+
+def count_rows(path, companies=None, date_from=None, date_to=None):
+    return open_dataset(path).count_rows(filter=build_filter(companies, date_from, date_to))
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    # `python rag/processed_store.py`로 실행해도 rag 패키지를 찾을 수 있도록 루트 경로 추가
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if base_dir not in sys.path:
+        sys.path.append(base_dir)
+
+    from rag.preprocessing import OUTPUT_FILE, load_processed_items
+
+    parser = argparse.ArgumentParser(description="기존 cleaned_data.json(.jsonl)을 Parquet으로 변환")
+    parser.add_argument("--input", default=OUTPUT_FILE, help="변환할 전처리 결과 (JSON 또는 JSON Lines)")
+    parser.add_argument("--output", default=get_parquet_path(OUTPUT_FILE))
+    args = parser.parse_args()
+
+    print(f"Converting {args.input} -> {args.output}...")
+    count = write_processed_table(load_processed_items(args.input, prefer_parquet=False), args.output)
+    print(f"변환 완료: {count}개 항목")
@@ -0,0 +1,122 @@
+import logging
+import os
+import random
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+# 압축 모드(차원 축소) 설정
+# 벡터 DB를 만들 때 PCA로 768차원 임베딩을 compact_dim차원으로 줄여 저장하고,
+# 질문 임베딩도 같은 투영을 거쳐 검색합니다. 투영 행렬은 벡터 DB 폴더에 함께 저장됩니다.
+PROJECTION_FILE = 'pca_projection.npz'
+PCA_SAMPLE_SIZE = 20_000  # PCA 학습에 사용할 최대 문서 수 (무작위 표본)
+PCA_SAMPLE_SEED = 42
+FIT_BATCH_SIZE = 256
+
+class PCAProjection:
+    """평균을 빼고 상위 주성분으로 투영한 뒤 다시 정규화합니다. (코사인 유사도 검색 유지)"""
+
+    def __init__(self, mean, components, explained_variance=None, model=None):
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = np.asarray(components, dtype=np.float32)  # (dim, 원래 차원)
+        self.explained_variance = explained_variance
+        self.model = model  # 학습에 쓴 임베딩 모델/백엔드 (embedder.get_cache_model_name)
+
+    @property
+    def dim(self):
+        return self.components.shape[0]
+
+    @property
+    def input_dim(self):
+        return self.components.shape[1]
+
+    @classmethod
+    def fit(cls, vectors, dim, model=None):
+        vectors = np.asarray(vectors, dtype=np.float64)
+        if len(vectors) < dim:
+            raise ValueError(f"PCA 학습 표본({len(vectors)}개)이 압축 차원({dim})보다 적습니다.")
+
+        mean = vectors.mean(axis=0)
+        _, singular_values, components = np.linalg.svd(vectors - mean, full_matrices=False)
+        variance = singular_values ** 2
+        explained = float(variance[:dim].sum() / variance.sum())
+        return cls(mean, components[:dim], explained_variance=explained, model=model)
+
+    def transform(self, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        projected = (vectors - self.mean) @ self.components.T
+        norms = np.linalg.norm(projected, axis=-1, keepdims=True)
+        return projected / np.maximum(norms, 1e-12)
+
+    def save(self, persist_path):
+        os.makedirs(persist_path, exist_ok=True)
+        path = os.path.join(persist_path, PROJECTION_FILE)
+        tmp_path = path + '.tmp.npz'
+        np.savez(
+            tmp_path,
+            mean=self.mean,
+            components=self.components,
+            explained_variance=np.float64(self.explained_variance or 0.0),
+            model=np.str_(self.model or ''),
+        )
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, persist_path):
+        """persist_path에 저장된 투영을 읽습니다. 압축 모드로 만든 DB가 아니면 None"""
+        path = os.path.join(persist_path, PROJECTION_FILE)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            return cls(
+                data['mean'],
+                data['components'],
+                explained_variance=float(data['explained_variance']),
+                model=str(data['model']) or None,
+            )
+
+class ProjectedEmbeddings(Embeddings):
+    """기존 임베딩 모델을 감싸 결과 벡터에 PCA 투영을 적용합니다."""
+
+    def __init__(self, embeddings, projection):
+        self.embeddings = embeddings
+        self.projection = projection
+
+    def embed_documents(self, texts):
+        return self.projection.transform(self.embeddings.embed_documents(texts)).tolist()
+
+    def embed_query(self, text):
+        return self.projection.transform(self.embeddings.embed_query(text)).tolist()
+
+    def stats(self):
+        return self.embeddings.stats()
+
+def sample_texts(documents, sample_size=PCA_SAMPLE_SIZE, seed=PCA_SAMPLE_SEED):
+    """문서 스트림에서 sample_size개를 고르게 뽑습니다. (Reservoir sampling, 전체를 메모리에 올리지 않음)"""
+    rng = random.Random(seed)
+    sample = []
+    for index, doc in enumerate(documents):
+        if index < sample_size:
+            sample.append(doc.page_content)
+        else:
+            slot = rng.randint(0, index)
+            if slot < sample_size:
+                sample[slot] = doc.page_content
+    return sample
+
+def fit_projection(embeddings, documents, dim, model=None, sample_size=PCA_SAMPLE_SIZE):
+    """문서 표본을 임베딩해 PCA 투영을 학습합니다."""
+    texts = sample_texts(documents, sample_size)
+    vectors = []
+    for start in range(0, len(texts), FIT_BATCH_SIZE):
+        vectors.extend(embeddings.embed_documents(texts[start:start + FIT_BATCH_SIZE]))
+    return PCAProjection.fit(vectors, dim, model=model)
+
+def unwrap_projection(embeddings):
+    """(임베딩 모델, 투영) 쌍을 반환합니다. 투영이 없으면 (embeddings, None)"""
+    if isinstance(embeddings, ProjectedEmbeddings):
+        return embeddings.embeddings, embeddings.projection
+    return embeddings, None
@@ -0,0 +1,185 @@
+import json
+import os
+import re
+
+from rag import vectorstore as vectorstore_module
+
+# 기업명/산업 별칭 인덱스 설정
+COMPANY_INDEX_FILE = 'company_index.json'  # 벡터 DB 폴더 안에 함께 저장
+MIN_ALIAS_LENGTH = 2  # 한 글자 별칭("웹" 등)은 오탐이 많아 제외
+# 리뷰 주제로 흔히 쓰이는 단어라 산업 별칭으로 쓰지 않음 (예: "복지가 좋은 회사")
+INDUSTRY_ALIAS_STOPWORDS = {"복지", "서비스"}
+# "교육", "통신", "의료" 같은 업종 명사는 "교육 지원", "통신비", "의료비"처럼 리뷰 주제로도 쓰이므로
+# 뒤에 업종을 뜻하는 말이 붙었을 때만 산업 별칭으로 씁니다. (예: 교육업계, IT회사, 의료산업)
+INDUSTRY_SUFFIXES = ("업", "업계", "산업", "회사", "기업")
+
+# 기업명 앞뒤에 붙는 법인 형태/지점 표기
+NAME_NOISE_PATTERN = re.compile(r'\((주|유|재|사|매장)\)|주식회사|유한회사')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# 한글 표기 <-> 영문 약어 (예: 엘지화학 <-> LG화학)
+ALIAS_REPLACEMENTS = [
+    ("엘지", "lg"),
+    ("에스케이", "sk"),
+    ("씨제이", "cj"),
+    ("케이티", "kt"),
+    ("에이치디", "hd"),
+]
+
+def normalize_text(text):
+    """소문자화 + 공백 제거 (질문과 별칭을 같은 방식으로 비교하기 위함)"""
+    return WHITESPACE_PATTERN.sub('', text or '').lower()
+
+def company_aliases(company_name):
+    """기업명에서 검색에 쓸 별칭 목록을 만듭니다. (예: "(주)LG화학" -> lg화학, 엘지화학)"""
+    base = NAME_NOISE_PATTERN.sub(' ', company_name)
+    parts = [part for part in re.split(r'[\s/·]+', base) if part]
+
+    aliases = {normalize_text(base)}
+    aliases.update(normalize_text(part) for part in parts)
+
+    for alias in list(aliases):
+        for korean, english in ALIAS_REPLACEMENTS:
+            if korean in alias:
+                aliases.add(alias.replace(korean, english))
+            if english in alias:
+                aliases.add(alias.replace(english, korean))
+
+    return {alias for alias in aliases if len(alias) >= MIN_ALIAS_LENGTH}
+
+def industry_aliases(industry):
+    """산업명에서 별칭 목록을 만듭니다. (예: "은행/금융업" -> 은행/금융업, 금융업, 금융업계, 은행회사, ...)
+
+    업종 명사만 단독으로는 쓰지 않고 INDUSTRY_SUFFIXES를 붙인 형태만 별칭으로 씁니다.
+    """
+    parts = [normalize_text(part) for part in industry.split('/')]
+    aliases = {normalize_text(industry)}
+    aliases.update(part for part in parts if part.endswith('업'))
+
+    stems = {part[:-1] if part.endswith('업') else part for part in parts}
+    for stem in stems:
+        if len(stem) >= MIN_ALIAS_LENGTH and stem not in INDUSTRY_ALIAS_STOPWORDS:
+            aliases.update(stem + suffix for suffix in INDUSTRY_SUFFIXES)
+    return {alias for alias in aliases if len(alias) >= MIN_ALIAS_LENGTH}
+
+def _is_ascii_word_char(char):
+    return char.isascii() and char.isalnum()
+
+def get_company_index_path(persist_path=None):
+    return os.path.join(persist_path or vectorstore_module.PERSIST_PATH, COMPANY_INDEX_FILE)
+
+def save_company_index(documents, persist_path=None):
+    """적재된 문서의 기업명/산업 목록을 별칭 인덱스 파일로 저장합니다. (build_vector_db에서 호출)"""
+    companies = {}
+    for doc in documents:
+        name = doc.metadata.get('company_name')
+        if name and name != 'Unknown':
+            companies[name] = doc.metadata.get('industry', 'Unknown')
+
+    path = get_company_index_path(persist_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"companies": companies}, f, ensure_ascii=False)
+    return path
+
+class QueryAnalyzer:
+    """질문에서 기업명과 산업을 찾아 Chroma where 필터를 만듭니다.
+
+    별칭을 글자 단위 trie로 미리 만들어 두고, 질문을 한 번 훑으면서
+    겹치지 않는 가장 긴 별칭부터 매칭합니다.
+    """
+
+    def __init__(self, companies):
+        # companies: {기업명: 산업}
+        self.companies = companies
+        self._trie = {}
+        for name, industry in companies.items():
+            for alias in company_aliases(name):
+                self._insert(alias, ("company", name))
+        for industry in set(companies.values()):
+            if industry and industry != 'Unknown':
+                for alias in industry_aliases(industry):
+                    self._insert(alias, ("industry", industry))
+
+    @classmethod
+    def load(cls, vectorstore=None, persist_path=None):
+        """저장된 별칭 인덱스를 읽습니다. 파일이 없으면 벡터스토어 메타데이터에서 만듭니다."""
+        path = get_company_index_path(persist_path)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls(json.load(f)["companies"])
+
+        companies = {}
+        if vectorstore is not None:
+            for metadata in vectorstore.get(include=["metadatas"])["metadatas"]:
+                name = (metadata or {}).get('company_name')
+                if name and name != 'Unknown':
+                    companies[name] = metadata.get('industry', 'Unknown')
+        return cls(companies)
+
+    def _insert(self, alias, target):
+        node = self._trie
+        for char in alias:
+            node = node.setdefault(char, {})
+        node.setdefault("$", set()).add(target)
+
+    def analyze(self, query):
+        """질문에 등장한 기업명/산업 목록을 등장 순서대로 반환합니다.
+
+        영문/숫자로 시작하거나 끝나는 별칭은 단어 경계에서만 매칭합니다. (예: "Git"의 "it"는 IT가 아님)
+        """
+        # 공백을 지운 질문과, 각 글자 앞에 원래 공백(또는 문장 시작)이 있었는지 여부
+        chars, word_starts = [], []
+        after_space = True
+        for char in (query or '').lower():
+            if char.isspace():
+                after_space = True
+                continue
+            chars.append(char)
+            word_starts.append(after_space)
+            after_space = False
+        text = ''.join(chars)
+        companies, industries = [], []
+
+        def joined(left, right):
+            # left와 right 사이가 영문/숫자 단어 중간인지 (둘 다 영문/숫자이고 공백으로 나뉘지 않음)
+            return (
+                0 < right < len(text) and not word_starts[right]
+                and _is_ascii_word_char(text[left]) and _is_ascii_word_char(text[right])
+            )
+
+        i = 0
+        while i < len(text):
+            node, match_end, match_targets = self._trie, None, None
+            if not joined(i - 1, i):
+                for j in range(i, len(text)):
+                    node = node.get(text[j])
+                    if node is None:
+                        break
+                    if "$" in node and not joined(j, j + 1):
+                        match_end, match_targets = j + 1, node["$"]
+
+            if match_end is None:
+                i += 1
+                continue
+
+            for kind, value in sorted(match_targets):
+                bucket = companies if kind == "company" else industries
+                if value not in bucket:
+                    bucket.append(value)
+            i = match_end
+
+        return {"companies": companies, "industries": industries}
+
+    def build_filter(self, analysis):
+        """분석 결과로 Chroma where 필터를 만듭니다. 기업명이 있으면 기업명이 우선입니다."""
+        if analysis["companies"]:
+            field, values = "company_name", analysis["companies"]
+        elif analysis["industries"]:
+            field, values = "industry", analysis["industries"]
+        else:
+            return None
+
+        if len(values) == 1:
+            return {field: values[0]}
+        return {field: {"$in": values}}
@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Cross-Encoder 재정렬 설정
+RERANKER_MODEL = "bongsoo/klue-cross-encoder-v1"
+RERANK_MAX_LENGTH = 512
+SCORE_CACHE_SIZE = 10_000  # (질문, 문서) 점수 LRU 캐시 크기
+RELOAD_BACKOFF = 300.0  # 모델 로드에 실패하면 이 시간(초) 동안 다시 로드하지 않고 재정렬을 건너뜀
+
+def doc_key(doc):
+    """캐시 키로 쓸 문서 식별자 (청크 윈도우는 범위까지 포함)"""
+    metadata = doc.metadata
+    key = metadata.get('data_id') or doc.id or doc.page_content
+    if 'window_start' in metadata:
+        key = f"{key}:{metadata['window_start']}-{metadata['window_end']}"
+    return key
+
+class CrossEncoderReranker:
+    """로컬 한국어 Cross-Encoder로 (질문, 문서) 쌍의 관련도 점수를 계산합니다.
+
+    캐시에 없는 쌍만 모아서 한 번의 패딩 배치로 CPU 추론하고, 결과는 LRU 캐시에 보관합니다.
+    모델 로드에 실패하면 reload_backoff 동안은 요청마다 다시 로드하지 않습니다.
+    """
+
+    def __init__(self, model_name=RERANKER_MODEL, cache_size=SCORE_CACHE_SIZE, reload_backoff=RELOAD_BACKOFF):
+        self.model_name = model_name
+        self.cache_size = cache_size
+        self.reload_backoff = reload_backoff
+        self._model = None
+        self._load_error = None
+        self._load_failed_at = None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def is_available(self):
+        """모델을 쓸 수 있거나 다시 로드해 볼 수 있으면 True. 최근 로드 실패 후 대기 중이면 False"""
+        failed_at = self._load_failed_at
+        return failed_at is None or time.monotonic() - failed_at >= self.reload_backoff
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    if not self.is_available():
+                        raise RuntimeError(f"재정렬 모델 로드 실패 후 대기 중입니다: {self._load_error}")
+                    try:
+                        from sentence_transformers import CrossEncoder
+                        self._model = CrossEncoder(self.model_name, device='cpu', max_length=RERANK_MAX_LENGTH)
+                    except Exception as e:
+                        self._load_error, self._load_failed_at = e, time.monotonic()
+                        raise
+                    self._load_error = self._load_failed_at = None
+        return self._model
+
+    def score(self, query, docs):
+        """문서 목록의 관련도 점수 목록을 반환합니다."""
+        keys = [(query, doc_key(doc)) for doc in docs]
+        scores = {}
+        with self._lock:
+            for key in keys:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    scores[key] = self._cache[key]
+            self.hits += len(scores)
+
+        missing = {key: doc for key, doc in zip(keys, docs) if key not in scores}
+        if missing:
+            pairs = [(query, doc.page_content) for doc in missing.values()]
+            predicted = self.model.predict(pairs, batch_size=len(pairs), show_progress_bar=False)
+
+            with self._lock:
+                self.misses += len(missing)
+                for key, value in zip(missing, predicted):
+                    scores[key] = float(value)
+                    self._cache[key] = float(value)
+                    self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return [scores[key] for key in keys]
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._cache),
+            }
+
+class LoadShedder:
+    """동시 재정렬 수와 최근 재정렬 지연 시간을 보고 재정렬을 건너뛸지 결정합니다."""
+
+    def __init__(self, max_inflight, latency_budget):
+        self.max_inflight = max_inflight
+        self.latency_budget = latency_budget  # 초
+        self.inflight = 0
+        self.recent_latency = 0.0  # 지수 이동 평균
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        with self._lock:
+            overloaded = self.inflight >= self.max_inflight or self.recent_latency > self.latency_budget
+            if overloaded:
+                self.skipped += 1
+                # 건너뛰는 동안 평균을 조금씩 낮춰 부하가 풀리면 다시 재정렬하도록 합니다.
+                self.recent_latency *= 0.9
+                return False
+            self.inflight += 1
+            return True
+
+    def release(self, elapsed=None):
+        """재정렬을 마쳤음을 알립니다. 실패해서 elapsed가 None이면 평균 지연 시간에 반영하지 않습니다."""
+        with self._lock:
+            self.inflight -= 1
+            if elapsed is not None:
+                self.recent_latency = 0.8 * self.recent_latency + 0.2 * elapsed
+
+def rerank_documents(reranker, query, docs, k, companies=None):
+    """점수 순으로 상위 k개를 고릅니다. 비교 질문이면 기업별로 고르게 남깁니다.
+
+    반환하는 소요 시간에는 첫 호출의 모델 로드 시간을 넣지 않습니다. (부하 판단용 평균이 튀지 않도록)
+    """
+    getattr(reranker, "model", None)  # 지연 로드되는 Cross-Encoder를 측정 전에 불러옴
+    started = time.perf_counter()
+    scores = reranker.score(query, docs)
+    ranked = [doc for _, doc in sorted(zip(scores, docs), key=lambda pair: pair[0], reverse=True)]
+
+    if not companies or len(companies) < 2:
+        return ranked[:k], time.perf_counter() - started
+
+    per_company = max(k // len(companies), 1)
+    counts = {}
+    selected = []
+    for doc in ranked:
+        company = doc.metadata.get('company_name')
+        if counts.get(company, 0) < per_company:
+            counts[company] = counts.get(company, 0) + 1
+            selected.append(doc)
+    return selected, time.perf_counter() - started
@@ -0,0 +1,247 @@
+import logging
+import os
+import threading
+
+from rag import telemetry
+from rag.answer_cache import SemanticAnswerCache, analysis_key_fn
+from rag.embedder import get_embeddings
+from rag.vectorstore import get_chunk_vectorstore, get_vectorstore
+from rag.retriever import get_retriever
+from rag.lexical_index import LexicalIndex
+from rag.context import count_tokens
+from rag.pipeline import build_answer_chain, build_rag_chain, get_llm
+from rag.query_analyzer import QueryAnalyzer
+from rag.reranker import CrossEncoderReranker
+
+logger = logging.getLogger(__name__)
+
+# 프로세스 전체에서 공유하는 무거운 리소스 (모델, Chroma 클라이언트, RAG Chain)
+# Streamlit은 세션마다 스크립트 스레드를 따로 돌리므로 RLock으로 한 번만 생성되도록 보호합니다.
+DEFAULT_K = 10
+# .env에 JOBIS_RERANKER=1을 넣으면 Cross-Encoder 재정렬(2단계 검색)을 사용합니다.
+USE_RERANKER = os.getenv("JOBIS_RERANKER", "0") == "1"
+WARMUP_TEXT = "복지가 좋은 회사는 어디야?"  # 워밍업 때 한 번 인코딩해 볼 문장
+
+_lock = threading.RLock()
+_embeddings = None
+_vectorstore = None
+_chunk_vectorstore = None
+_chunk_vectorstore_loaded = False
+_query_analyzer = None
+_lexical_index = None
+_lexical_index_loaded = False
+_reranker = None
+_llm = None
+_answer_chain = None
+_answer_cache = None
+_retrievers = {}
+_chains = {}
+# 워밍업 스레드는 _lock과 별도의 락으로 관리 (워밍업이 _lock을 오래 잡고 있어도 start_warmup이 막히지 않도록)
+_warmup_lock = threading.Lock()
+_warmup_thread = None
+_warmup_error = None  # 마지막 워밍업이 실패했으면 그 예외
+
+def get_shared_embeddings():
+    """프로세스당 하나의 임베딩 모델을 반환합니다."""
+    global _embeddings
+    if _embeddings is None:
+        with _lock:
+            if _embeddings is None:
+                _embeddings = get_embeddings()
+    return _embeddings
+
+def get_shared_vectorstore():
+    """프로세스당 하나의 Chroma 벡터스토어를 반환합니다."""
+    global _vectorstore
+    if _vectorstore is None:
+        with _lock:
+            if _vectorstore is None:
+                _vectorstore = get_vectorstore(embeddings=get_shared_embeddings())
+    return _vectorstore
+
+def get_shared_chunk_vectorstore():
+    """문장 윈도우 청크 컬렉션을 공유합니다. 청크 인덱스가 없으면 None (원문 단위 검색)"""
+    global _chunk_vectorstore, _chunk_vectorstore_loaded
+    if not _chunk_vectorstore_loaded:
+        with _lock:
+            if not _chunk_vectorstore_loaded:
+                _chunk_vectorstore = get_chunk_vectorstore(embeddings=get_shared_embeddings())
+                _chunk_vectorstore_loaded = True
+    return _chunk_vectorstore
+
+def get_shared_query_analyzer():
+    """기업명/산업 별칭 인덱스를 한 번만 읽어 공유합니다."""
+    global _query_analyzer
+    if _query_analyzer is None:
+        with _lock:
+            if _query_analyzer is None:
+                _query_analyzer = QueryAnalyzer.load(get_shared_vectorstore())
+    return _query_analyzer
+
+def get_shared_lexical_index():
+    """BM25 역색인을 한 번만 열어 공유합니다. 역색인이 없으면 None (Dense 검색만 사용)"""
+    global _lexical_index, _lexical_index_loaded
+    if not _lexical_index_loaded:
+        with _lock:
+            if not _lexical_index_loaded:
+                _lexical_index = LexicalIndex.load()
+                _lexical_index_loaded = True
+    return _lexical_index
+
+def get_shared_reranker():
+    """Cross-Encoder 재정렬기를 공유합니다. (모델은 첫 재정렬 때 로드)"""
+    global _reranker
+    if _reranker is None:
+        with _lock:
+            if _reranker is None:
+                _reranker = CrossEncoderReranker()
+    return _reranker
+
+def get_shared_retriever(k=DEFAULT_K):
+    """검색 개수(k)별로 한 번만 생성한 Retriever를 반환합니다."""
+    retriever = _retrievers.get(k)
+    if retriever is None:
+        with _lock:
+            retriever = _retrievers.get(k)
+            if retriever is None:
+                retriever = get_retriever(
+                    get_shared_vectorstore(),
+                    k=k,
+                    analyzer=get_shared_query_analyzer(),
+                    lexical_index=get_shared_lexical_index(),
+                    chunk_vectorstore=get_shared_chunk_vectorstore(),
+                    reranker=get_shared_reranker() if USE_RERANKER else None,
+                )
+                _retrievers[k] = retriever
+    return retriever
+
+def get_shared_llm():
+    """프로세스당 하나의 LLM 클라이언트를 반환합니다."""
+    global _llm
+    if _llm is None:
+        with _lock:
+            if _llm is None:
+                _llm = get_llm()
+    return _llm
+
+def get_shared_answer_chain():
+    """검색 결과(context)와 질문을 받아 답변을 생성하는 공유 Chain을 반환합니다."""
+    global _answer_chain
+    if _answer_chain is None:
+        with _lock:
+            if _answer_chain is None:
+                _answer_chain = build_answer_chain(get_shared_llm())
+    return _answer_chain
+
+def get_shared_chain(k=DEFAULT_K):
+    """검색 개수(k)별로 한 번만 구성한 RAG Chain을 반환합니다. LCEL Chain은 상태가 없어 공유해도 안전합니다."""
+    chain = _chains.get(k)
+    if chain is None:
+        with _lock:
+            chain = _chains.get(k)
+            if chain is None:
+                chain = build_rag_chain(get_shared_retriever(k=k), llm=get_shared_llm())
+                _chains[k] = chain
+    return chain
+
+def get_shared_answer_cache():
+    """모든 세션이 함께 쓰는 시맨틱 답변 캐시를 반환합니다."""
+    global _answer_cache
+    if _answer_cache is None:
+        with _lock:
+            if _answer_cache is None:
+                # 다른 기업/산업을 묻는 질문의 답변이 재사용되지 않도록 질문 분석 결과로 캐시를 나눔
+                _answer_cache = SemanticAnswerCache(
+                    get_shared_embeddings(),
+                    key_fn=analysis_key_fn(get_shared_query_analyzer()),
+                )
+    return _answer_cache
+
+def warm_up(k=DEFAULT_K, build_chain=True):
+    """공유 리소스를 모두 만들고 임베딩 모델/토크나이저를 한 번 실행해 첫 질문의 지연을 없앱니다.
+
+    build_chain=False이면 LLM 클라이언트와 공유 Chain은 만들지 않습니다. (LLM을 직접 넘긴 챗봇)
+    """
+    with telemetry.span("warm_up", k=k):
+        embeddings = get_shared_embeddings()
+        get_shared_retriever(k=k)
+        get_shared_answer_cache()
+        if build_chain:
+            get_shared_chain(k=k)
+            get_shared_answer_chain()
+        if USE_RERANKER:
+            get_shared_reranker().model  # Cross-Encoder 모델 로드
+
+        # 디스크 캐시(CachedEmbeddings)를 거치지 않고 모델로 직접 인코딩해야 실제로 워밍업됩니다.
+        getattr(embeddings, "embeddings", embeddings).embed_query(WARMUP_TEXT)
+        count_tokens(WARMUP_TEXT)
+
+def _run_warmup(k, build_chain):
+    global _warmup_error
+    try:
+        warm_up(k=k, build_chain=build_chain)
+    except Exception as e:
+        # 실패해도 첫 질문 때 같은 리소스를 다시 로드하며, 오류는 그때 사용자에게 표시됩니다.
+        logger.warning("리소스 워밍업 실패: %s", e)
+        _warmup_error = e
+
+def start_warmup(k=DEFAULT_K, build_chain=True):
+    """백그라운드 스레드에서 warm_up을 시작합니다. 이미 시작했으면 기존 스레드를 반환합니다.
+
+    UI가 먼저 그려지는 동안 모델을 로드하며, 그 사이 들어온 질문은 로드가 끝날 때까지 _lock에서 기다립니다.
+    이전 워밍업이 실패했으면 새로 시작합니다.
+    """
+    global _warmup_thread, _warmup_error
+    with _warmup_lock:
+        failed = _warmup_thread is not None and not _warmup_thread.is_alive() and _warmup_error is not None
+        if _warmup_thread is None or failed:
+            _warmup_error = None
+            _warmup_thread = threading.Thread(
+                target=_run_warmup, args=(k, build_chain), name="jobis-warmup", daemon=True
+            )
+            _warmup_thread.start()
+        return _warmup_thread
+
+def get_warmup_error():
+    """마지막 워밍업이 실패했으면 그 예외를, 아니면 None을 반환합니다."""
+    return _warmup_error
+
+def is_ready():
+    """워밍업이 성공적으로 끝났으면 True"""
+    thread = _warmup_thread
+    return thread is not None and not thread.is_alive() and _warmup_error is None
+
+def wait_until_ready(timeout=None):
+    """워밍업이 끝날 때까지 기다립니다. 성공했으면 True, 시작하지 않았거나 실패/시간 초과면 False를 반환합니다."""
+    thread = _warmup_thread
+    if thread is None:
+        return False
+    thread.join(timeout)
+    return not thread.is_alive() and _warmup_error is None
+
+def reset_shared_resources():
+    """벡터 DB 재구축 후 등, 공유 리소스를 다시 로드해야 할 때 호출합니다."""
+    global _embeddings, _vectorstore, _chunk_vectorstore, _chunk_vectorstore_loaded
+    global _query_analyzer, _lexical_index, _lexical_index_loaded, _reranker
+    global _llm, _answer_chain, _answer_cache, _warmup_thread, _warmup_error
+    with _warmup_lock:
+        # 실행 중인 워밍업이 비운 뒤의 전역 변수를 예전 리소스로 다시 채우지 않도록 끝날 때까지 기다림
+        # (워밍업 스레드는 _warmup_lock을 잡지 않으므로 여기서 기다려도 교착되지 않음)
+        if _warmup_thread is not None:
+            _warmup_thread.join()
+        _warmup_thread = None
+        _warmup_error = None
+        with _lock:
+            _reranker = None
+            _chunk_vectorstore = None
+            _chunk_vectorstore_loaded = False
+            _lexical_index = None
+            _lexical_index_loaded = False
+            _embeddings = None
+            _answer_cache = None
+            _vectorstore = None
+            _query_analyzer = None
+            _llm = None
+            _answer_chain = None
+            _retrievers.clear()
+            _chains.clear()
@@ -1,7 +1,304 @@
-def get_retriever(vectorstore, k=3):
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores import VectorStore
+
+from rag.lexical_index import tokenize
+from rag.reranker import LoadShedder, rerank_documents
+
+logger = logging.getLogger(__name__)
+
+# 비교 질문(기업 N개)의 기업별 검색을 동시에 실행하는 스레드 풀
+COMPARISON_MAX_WORKERS = 8
+_comparison_executor = ThreadPoolExecutor(max_workers=COMPARISON_MAX_WORKERS, thread_name_prefix="jobis-compare")
+
+# 청크 검색 후 앞뒤로 덧붙일 문장 수
+CONTEXT_SENTENCES = 1
+
+# 하이브리드(BM25 + Dense) 검색 설정
+HYBRID_FETCH_K = 30  # 각 검색기에서 가져올 후보 수
+RRF_K = 60  # Reciprocal Rank Fusion 상수
+
+# 2단계 검색(Cross-Encoder 재정렬) 설정
+RERANK_FETCH_K = 50  # 1단계에서 가져올 후보 수
+RERANK_MAX_INFLIGHT = 4  # 동시에 진행 중인 재정렬이 이보다 많으면 재정렬 생략
+RERANK_LATENCY_BUDGET = 0.5  # 최근 재정렬 평균 지연(초)이 이보다 크면 재정렬 생략
+
+class CompanyAwareRetriever(BaseRetriever):
+    """질문에서 찾은 기업명/산업으로 Chroma where 필터를 걸어 검색하는 Retriever
+
+    기업이 2개 이상 언급된 비교 질문은 기업별로 per_company_k개씩 동시에 검색한 뒤
+    기업 순서대로 묶어서 반환합니다. (한 기업의 문서가 결과를 독차지하지 않도록)
+    """
+
+    vectorstore: VectorStore
+    analyzer: Any
+    k: int = 3
+    per_company_k: int = 5
+
+    def _search(self, query_vector, k, where=None):
+        if where is None:
+            return self.vectorstore.similarity_search_by_vector(query_vector, k=k)
+        return self.vectorstore.similarity_search_by_vector(query_vector, k=k, filter=where)
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        analysis = self.analyzer.analyze(query)
+        # 질문 임베딩은 한 번만 계산하고 모든 검색에서 재사용
+        query_vector = self.vectorstore.embeddings.embed_query(query)
+
+        companies = analysis["companies"]
+        if len(companies) >= 2:
+            futures = [
+                _comparison_executor.submit(self._search, query_vector, self.per_company_k, {"company_name": company})
+                for company in companies
+            ]
+            return [doc for future in futures for doc in future.result()]
+
+        return self._search(query_vector, self.k, self.analyzer.build_filter(analysis))
+
+class ParentWindowRetriever(BaseRetriever):
+    """문장 윈도우 청크를 검색한 뒤, 원문(parent)에서 앞뒤 문장을 조금만 덧붙여 반환하는 Retriever
+
+    같은 원문에서 나온 윈도우는 겹치는 범위끼리 합칩니다. 원문 전체를 넘기지 않으므로
+    LLM 프롬프트가 짧아집니다.
+    """
+
+    base_retriever: BaseRetriever
+    parent_vectorstore: VectorStore
+    context_sentences: int = CONTEXT_SENTENCES
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        chunks = self.base_retriever.invoke(query)
+
+        # 원문별로 매칭된 윈도우 범위를 검색 순위 순서대로 모음
+        windows = {}
+        for doc in chunks:
+            parent_id = doc.metadata.get('parent_id')
+            if parent_id is not None:
+                windows.setdefault(parent_id, []).append(
+                    (doc.metadata['window_start'], doc.metadata['window_end'])
+                )
+        if not windows:
+            return chunks
+
+        result = self.parent_vectorstore.get(ids=list(windows))
+        parents = dict(zip(result["ids"], zip(result["documents"], result["metadatas"])))
+        return self.expand_windows(windows, parents)
+
+    def lexical_windows(self, query, parent_docs):
+        """BM25로 찾은 원문을 질문 토큰이 가장 많이 겹치는 문장 주변의 윈도우 문서로 바꿉니다.
+
+        하이브리드 검색에서 BM25 결과도 Dense 결과와 같은 단위(문장 윈도우)로 합치기 위해 씁니다.
+        """
+        from rag.preprocessing import split_sentences
+
+        query_terms = set(tokenize(query))
+        windows, parents = {}, {}
+        for doc in parent_docs:
+            parent_id = doc.metadata.get('data_id')
+            sentences = split_sentences(doc.page_content.partition("내용: ")[2])
+            if parent_id is None or not sentences:
+                continue
+            best = max(range(len(sentences)), key=lambda i: len(query_terms & set(tokenize(sentences[i]))))
+            windows[parent_id] = [(best, best + 1)]
+            parents[parent_id] = (doc.page_content, doc.metadata)
+        return self.expand_windows(windows, parents)
+
+    def expand_windows(self, windows, parents):
+        """{원문 id: [(시작, 끝), ...]} 문장 범위에 앞뒤 문장을 덧붙이고, 겹치는 범위는 합쳐 문서로 만듭니다."""
+        # preprocessing은 pyarrow(Parquet 저장소)를 함께 불러오므로 챗봇 시작 시간을 늘리지 않도록 사용할 때 import
+        from rag.preprocessing import split_sentences
+
+        documents = []
+        for parent_id, ranges in windows.items():
+            if parent_id not in parents:
+                continue
+            content, metadata = parents[parent_id]
+            header, _, body = content.partition("내용: ")
+            sentences = split_sentences(body)
+
+            expanded = sorted(
+                (max(start - self.context_sentences, 0), min(end + self.context_sentences, len(sentences)))
+                for start, end in ranges
+            )
+            merged = [list(expanded[0])]
+            for start, end in expanded[1:]:
+                if start <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+
+            for start, end in merged:
+                window_metadata = dict(metadata or {})
+                window_metadata.update({"window_start": start, "window_end": end})
+                documents.append(Document(
+                    page_content=f"{header}내용: {' '.join(sentences[start:end])}",
+                    metadata=window_metadata,
+                ))
+
+        return documents
+
+def fusion_key(doc):
+    """RRF에서 같은 결과로 볼 단위. 문장 윈도우 문서는 (data_id, 시작, 끝), 원문 문서는 data_id"""
+    metadata = doc.metadata
+    data_id = metadata.get('data_id')
+    if data_id is None:
+        return doc.page_content
+    if 'window_start' in metadata:
+        return (data_id, metadata['window_start'], metadata['window_end'])
+    return data_id
+
+class HybridRetriever(BaseRetriever):
+    """BM25 역색인(lexical_index.py)과 Dense 검색 결과를 RRF로 합치는 Retriever
+
+    정확한 용어("트랜스포머", "L1, L2 정규화")나 기업명이 들어간 질문을 Dense 검색만으로는
+    놓치는 경우를 보완합니다. 비교 질문(기업 2개 이상)은 기업별 균형을 위해 Dense 결과를 그대로 씁니다.
+    청크 모드에서는 BM25로 찾은 원문도 문장 윈도우로 바꾸고, 같은 원문의 윈도우끼리는 겹칠 때만 같은 결과로 합칩니다.
+    """
+
+    vectorstore: VectorStore
+    dense_retriever: BaseRetriever
+    lexical_index: Any
+    analyzer: Any = None
+    k: int = 3
+    fetch_k: int = HYBRID_FETCH_K
+    rrf_k: int = RRF_K
+
+    def _lexical_documents(self, query, analysis):
+        hits = self.lexical_index.search(query, k=self.fetch_k)
+        if not hits:
+            return []
+
+        ids = [doc_id for doc_id, _ in hits]
+        where = self.analyzer.build_filter(analysis) if analysis else None
+        result = self.vectorstore.get(ids=ids, where=where) if where else self.vectorstore.get(ids=ids)
+        by_id = {
+            doc_id: Document(page_content=content, metadata=metadata or {})
+            for doc_id, content, metadata in zip(result["ids"], result["documents"], result["metadatas"])
+        }
+        # BM25 순위를 유지 (필터에 걸러진 문서는 제외)
+        return [by_id[doc_id] for doc_id in ids if doc_id in by_id]
+
+    @staticmethod
+    def _match_dense_window(doc, dense_keys):
+        # BM25 쪽 윈도우가 같은 원문의 Dense 윈도우와 겹치면 같은 결과로 봄
+        key = fusion_key(doc)
+        if not isinstance(key, tuple):
+            return key
+        data_id, start, end = key
+        for dense_key in dense_keys:
+            if isinstance(dense_key, tuple) and dense_key[0] == data_id and dense_key[1] < end and start < dense_key[2]:
+                return dense_key
+        return key
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        analysis = self.analyzer.analyze(query) if self.analyzer is not None else None
+        dense_docs = self.dense_retriever.invoke(query)
+        if analysis and len(analysis["companies"]) >= 2:
+            return dense_docs
+
+        lexical_docs = self._lexical_documents(query, analysis)
+        if isinstance(self.dense_retriever, ParentWindowRetriever):
+            lexical_docs = self.dense_retriever.lexical_windows(query, lexical_docs)
+
+        dense_keys = [fusion_key(doc) for doc in dense_docs]
+        lexical_keys = [self._match_dense_window(doc, dense_keys) for doc in lexical_docs]
+
+        scores = {}
+        documents = {}
+        for ranked, keys in ((dense_docs, dense_keys), (lexical_docs, lexical_keys)):
+            for rank, (doc, key) in enumerate(zip(ranked, keys)):
+                scores[key] = scores.get(key, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+                documents.setdefault(key, doc)
+
+        ranked_keys = sorted(scores, key=scores.get, reverse=True)[:self.k]
+        return [documents[key] for key in ranked_keys]
+
+class RerankingRetriever(BaseRetriever):
+    """1단계로 후보를 넉넉히(fetch_k) 가져오고 Cross-Encoder로 재정렬해 상위 k개만 반환하는 Retriever
+
+    부하가 높으면(LoadShedder) 재정렬을 건너뛰고 1단계 순위 그대로 k개를 반환합니다.
+    재정렬이 실패해도(모델 다운로드/로드 실패, 메모리 부족 등) 답변은 1단계 순위로 계속 진행하며,
+    모델 로드 실패 후에는 재시도 대기 시간(RELOAD_BACKOFF) 동안 재정렬을 건너뜁니다.
+    """
+
+    base_retriever: BaseRetriever
+    reranker: Any
+    load_shedder: Any
+    analyzer: Any = None
+    k: int = 3
+    enabled: bool = True
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        candidates = self.base_retriever.invoke(query)
+        # 모델 로드에 실패한 뒤 재시도 대기 중이면 로드를 다시 시도하지 않고 1단계 순위를 그대로 씀
+        available = getattr(self.reranker, "is_available", lambda: True)()
+        if not self.enabled or len(candidates) <= 1 or not available or not self.load_shedder.try_acquire():
+            return candidates[:self.k]
+
+        elapsed = None
+        try:
+            companies = self.analyzer.analyze(query)["companies"] if self.analyzer is not None else None
+            docs, elapsed = rerank_documents(self.reranker, query, candidates, self.k, companies)
+            return docs
+        except Exception as e:
+            logger.warning("재정렬 실패, 1단계 순위로 진행합니다: %s", e)
+            return candidates[:self.k]
+        finally:
+            self.load_shedder.release(elapsed)
+
+def get_retriever(vectorstore, k=3, analyzer=None, per_company_k=5, lexical_index=None, chunk_vectorstore=None,
+                  reranker=None):
+    # reranker가 있으면 후보를 넉넉히 검색한 뒤 Cross-Encoder로 재정렬하는 2단계 검색기를 반환
+    if reranker is not None:
+        base_retriever = get_retriever(
+            vectorstore,
+            k=RERANK_FETCH_K,
+            analyzer=analyzer,
+            per_company_k=per_company_k,
+            lexical_index=lexical_index,
+            chunk_vectorstore=chunk_vectorstore,
+        )
+        return RerankingRetriever(
+            base_retriever=base_retriever,
+            reranker=reranker,
+            load_shedder=LoadShedder(RERANK_MAX_INFLIGHT, RERANK_LATENCY_BUDGET),
+            analyzer=analyzer,
+            k=k,
+        )
+
+    # lexical_index가 있으면 BM25 + Dense 하이브리드 검색기를 반환
+    if lexical_index is not None:
+        dense_retriever = get_retriever(
+            vectorstore,
+            k=HYBRID_FETCH_K,
+            analyzer=analyzer,
+            per_company_k=per_company_k,
+            chunk_vectorstore=chunk_vectorstore,
+        )
+        return HybridRetriever(
+            vectorstore=vectorstore,
+            dense_retriever=dense_retriever,
+            lexical_index=lexical_index,
+            analyzer=analyzer,
+            k=k,
+        )
+
+    # chunk_vectorstore가 있으면 청크를 검색하고 원문에서 앞뒤 문맥을 덧붙이는 검색기를 반환
+    if chunk_vectorstore is not None:
+        chunk_retriever = get_retriever(chunk_vectorstore, k=k, analyzer=analyzer, per_company_k=per_company_k)
+        return ParentWindowRetriever(base_retriever=chunk_retriever, parent_vectorstore=vectorstore)
+
+    # analyzer가 있으면 기업명/산업 메타데이터 필터를 적용한 검색기를 반환
+    if analyzer is not None:
+        return CompanyAwareRetriever(vectorstore=vectorstore, analyzer=analyzer, k=k, per_company_k=per_company_k)
+
     retriever = vectorstore.as_retriever(
             search_type="similarity",
             search_kwargs={"k": k}
         )
     
-    return retriever
\ No newline at end of file
+    return retriever
@@ -0,0 +1,391 @@
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from langchain_core.callbacks import BaseCallbackHandler
+
+logger = logging.getLogger(__name__)
+
+# 단계별 계측(tracing/metrics) 설정
+# .env에 JOBIS_TELEMETRY=log,memory,prometheus 처럼 싱크를 나열하면 켜집니다. (비어 있으면 꺼짐)
+TELEMETRY_SINKS = os.getenv("JOBIS_TELEMETRY", "")
+# prometheus 싱크를 켠 상태에서 포트를 지정하면 start_metrics_server() 호출 시 http://localhost:<port>/metrics 로 노출합니다.
+METRICS_PORT = os.getenv("JOBIS_METRICS_PORT", "0")
+
+METRIC_PREFIX = "jobis"
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)  # 초
+SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)  # 문서 수/글자 수/토큰 수
+MEMORY_SAMPLES = 10_000  # memory 싱크가 지표별로 보관하는 최근 샘플 수
+
+class Span:
+    """한 단계의 실행 시간과 속성(문서 수, 토큰 수 등)을 기록합니다. with 문으로 사용합니다."""
+
+    __slots__ = ("name", "attributes", "started", "duration")
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+        self.started = None
+        self.duration = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.started
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        _emit_span(self)
+        return False
+
+class _NoopSpan:
+    """계측이 꺼져 있을 때 쓰는 빈 Span. 아무것도 측정하지 않습니다."""
+
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+NOOP_SPAN = _NoopSpan()
+
+# None이면 아직 설정 전 - 처음 사용할 때 JOBIS_TELEMETRY로 설정합니다.
+# (import 시점에 설정하면 임베딩 작업 프로세스처럼 모듈을 다시 import하는 자식 프로세스에서도 설정이 실행됨)
+_sinks = None
+_configure_lock = threading.Lock()
+_metrics_server = None
+
+def _get_sinks():
+    sinks = _sinks
+    if sinks is None:
+        with _configure_lock:
+            if _sinks is None:
+                configure_from_env()
+            sinks = _sinks
+    return sinks
+
+def is_enabled():
+    return bool(_get_sinks())
+
+def configure(sinks):
+    """사용할 싱크 목록을 설정합니다. 빈 목록이면 계측이 꺼집니다."""
+    global _sinks
+    _sinks = tuple(sinks)
+
+def get_sink(sink_type):
+    """설정된 싱크 중 sink_type 인스턴스를 반환합니다. 없으면 None"""
+    return next((sink for sink in _get_sinks() if isinstance(sink, sink_type)), None)
+
+def span(name, **attributes):
+    """단계 하나를 측정합니다. 계측이 꺼져 있으면 아무 일도 하지 않는 NOOP_SPAN을 반환합니다.
+
+        with telemetry.span("format_docs") as s:
+            ...
+            s.set(docs=len(docs))
+    """
+    if not _get_sinks():
+        return NOOP_SPAN
+    return Span(name, attributes)
+
+def increment(name, value=1, **labels):
+    """캐시 적중 같은 카운터를 올립니다."""
+    for sink in _get_sinks():
+        try:
+            sink.record_count(name, value, labels)
+        except Exception as e:
+            logger.warning("계측 싱크 %s 처리 실패: %s", type(sink).__name__, e)
+
+def _emit_span(finished):
+    for sink in _get_sinks():
+        try:
+            sink.record_span(finished)
+        except Exception as e:
+            logger.warning("계측 싱크 %s 처리 실패: %s", type(sink).__name__, e)
+
+def _format_attributes(attributes):
+    return " ".join(
+        f"{key}={value:.1f}" if isinstance(value, float) else f"{key}={value}"
+        for key, value in attributes.items()
+    )
+
+def _numeric_attributes(attributes):
+    return {
+        key: value for key, value in attributes.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    }
+
+# --- 싱크 ---
+class LogSink:
+    """단계가 끝날 때마다 로그 한 줄을 남깁니다."""
+
+    def __init__(self, level=logging.INFO):
+        self.level = level
+
+    def record_span(self, finished):
+        logger.log(self.level, "span %s %.1fms %s", finished.name, finished.duration * 1000,
+                   _format_attributes(finished.attributes))
+
+    def record_count(self, name, value, labels):
+        logger.log(self.level, "count %s +%s %s", name, value, _format_attributes(labels))
+
+class MemorySink:
+    """최근 샘플을 메모리에 보관하고 p50/p95/p99 요약을 계산합니다. (벤치마크/디버깅용)"""
+
+    def __init__(self, max_samples=MEMORY_SAMPLES):
+        self.max_samples = max_samples
+        self._samples = defaultdict(lambda: deque(maxlen=self.max_samples))
+        self._counts = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def record_span(self, finished):
+        with self._lock:
+            self._samples[(finished.name, "duration_ms")].append(finished.duration * 1000)
+            for key, value in _numeric_attributes(finished.attributes).items():
+                self._samples[(finished.name, key)].append(value)
+
+    def record_count(self, name, value, labels):
+        key = name + "".join(f"[{label}={labels[label]}]" for label in sorted(labels))
+        with self._lock:
+            self._counts[key] += value
+
+    def summary(self):
+        """{단계: {지표: {count, mean, p50, p95, p99}}}와 카운터 값을 반환합니다."""
+        with self._lock:
+            samples = {key: np.asarray(values, dtype=np.float64) for key, values in self._samples.items()}
+            counts = dict(self._counts)
+
+        stages = defaultdict(dict)
+        for (name, metric), values in samples.items():
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            stages[name][metric] = {
+                "count": len(values),
+                "mean": float(values.mean()),
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+            }
+        return {"stages": dict(stages), "counts": counts}
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += value
+        self.count += 1
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+class PrometheusSink:
+    """Prometheus 텍스트 형식(exposition format)으로 내보낼 히스토그램/카운터를 누적합니다."""
+
+    def __init__(self):
+        self._histograms = {}  # (metric, labels) -> _Histogram
+        self._counters = defaultdict(float)  # (metric, labels) -> 값
+        self._lock = threading.Lock()
+
+    def _observe(self, metric, labels, value, buckets):
+        histogram = self._histograms.get((metric, labels))
+        if histogram is None:
+            histogram = self._histograms[(metric, labels)] = _Histogram(buckets)
+        histogram.observe(value)
+
+    def record_span(self, finished):
+        labels = (("stage", finished.name),)
+        with self._lock:
+            self._observe(f"{METRIC_PREFIX}_stage_duration_seconds", labels, finished.duration, DURATION_BUCKETS)
+            for key, value in _numeric_attributes(finished.attributes).items():
+                self._observe(f"{METRIC_PREFIX}_stage_{key}", labels, value, SIZE_BUCKETS)
+            if "error" in finished.attributes:
+                self._counters[(f"{METRIC_PREFIX}_stage_errors_total", labels)] += 1
+
+    def record_count(self, name, value, labels):
+        key = (f"{METRIC_PREFIX}_{name}_total", tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] += value
+
+    def render(self):
+        """현재 값을 Prometheus 텍스트 형식 문자열로 반환합니다."""
+        lines = []
+        with self._lock:
+            declared = set()
+            for (metric, labels), histogram in sorted(self._histograms.items()):
+                if metric not in declared:
+                    lines.append(f"# TYPE {metric} histogram")
+                    declared.add(metric)
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{metric}_bucket{_format_labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{metric}_bucket{_format_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {histogram.total}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+            for (metric, labels), value in sorted(self._counters.items()):
+                if metric not in declared:
+                    lines.append(f"# TYPE {metric} counter")
+                    declared.add(metric)
+                lines.append(f"{metric}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port, host="0.0.0.0"):
+        """/metrics 엔드포인트를 백그라운드 스레드에서 제공합니다."""
+        sink = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+                body = sink.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="jobis-metrics", daemon=True).start()
+        logger.info("Prometheus 지표 엔드포인트: http://%s:%d/metrics", host, port)
+        return server
+
+SINK_TYPES = {"log": LogSink, "memory": MemorySink, "prometheus": PrometheusSink}
+
+def configure_from_env(value=TELEMETRY_SINKS):
+    """"log,memory,prometheus" 같은 문자열로 싱크를 설정합니다. 알 수 없는 싱크 이름은 경고 후 무시합니다."""
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SINK_TYPES]
+    if unknown:
+        logger.warning("알 수 없는 계측 싱크를 무시합니다: %s (사용 가능: %s)", unknown, list(SINK_TYPES))
+
+    sinks = [SINK_TYPES[name]() for name in names if name in SINK_TYPES]
+    configure(sinks)
+    return sinks
+
+def start_metrics_server(port=None):
+    """prometheus 싱크가 켜져 있으면 /metrics 엔드포인트를 엽니다. (UI 같은 진입점에서 한 번 호출)
+
+    이미 열었으면 기존 서버를 반환하고, 싱크가 꺼져 있거나 포트가 없거나 열 수 없으면 None을 반환합니다.
+    """
+    global _metrics_server
+    prometheus = get_sink(PrometheusSink)
+    if prometheus is None:
+        return None
+    if port is None:
+        try:
+            port = int(METRICS_PORT)
+        except ValueError:
+            logger.warning("JOBIS_METRICS_PORT 값이 올바르지 않습니다: %r", METRICS_PORT)
+            return None
+    if not port:
+        return None
+
+    with _configure_lock:
+        if _metrics_server is None:
+            try:
+                _metrics_server = prometheus.serve(port)
+            except OSError as e:
+                logger.warning("Prometheus 지표 엔드포인트를 열지 못했습니다 (포트 %d): %s", port, e)
+        return _metrics_server
+
+# --- LangChain 콜백 연동 ---
+class StageTracer(BaseCallbackHandler):
+    """Runnable(Retriever/LLM)의 콜백 이벤트를 Span으로 바꿉니다.
+
+    instrument()로 붙인 Runnable의 최상위 실행만 측정하고, 그 안에서 호출되는 하위 실행은 건너뜁니다.
+    """
+
+    run_inline = True  # 비동기 실행에서도 스레드 풀을 거치지 않고 바로 호출
+
+    def __init__(self, stage):
+        self.stage = stage
+        self._runs = {}  # run_id -> Span (하위 실행이면 None)
+
+    def _start(self, run_id, parent_run_id):
+        if parent_run_id in self._runs:
+            self._runs[run_id] = None
+            return
+        self._runs[run_id] = Span(self.stage, {}).__enter__()
+
+    def _end(self, run_id, error=None, **attributes):
+        started = self._runs.pop(run_id, None)
+        if started is None:
+            return
+        started.set(**attributes)
+        if error is not None:
+            started.__exit__(type(error), error, None)
+        else:
+            started.__exit__(None, None, None)
+
+    # Retriever
+    def on_retriever_start(self, serialized, query, *, run_id, parent_run_id=None, **kwargs):
+        self._start(run_id, parent_run_id)
+
+    def on_retriever_end(self, documents, *, run_id, **kwargs):
+        self._end(run_id, docs=len(documents))
+
+    def on_retriever_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
+
+    # LLM
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        self._start(run_id, parent_run_id)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        self._start(run_id, parent_run_id)
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        started = self._runs.get(run_id)
+        if started is not None and "first_token_ms" not in started.attributes:
+            started.set(first_token_ms=(time.perf_counter() - started.started) * 1000)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        attributes = {}
+        generations = response.generations[0] if response.generations else []
+        message = getattr(generations[0], "message", None) if generations else None
+        usage = getattr(message, "usage_metadata", None)
+        if usage:
+            attributes["input_tokens"] = usage.get("input_tokens", 0)
+            attributes["output_tokens"] = usage.get("output_tokens", 0)
+        self._end(run_id, **attributes)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
+
+def instrument(runnable, stage):
+    """계측이 켜져 있으면 runnable에 StageTracer 콜백을 붙여 반환합니다. 꺼져 있으면 그대로 반환합니다."""
+    if not _get_sinks():
+        return runnable
+    return runnable.with_config(callbacks=[StageTracer(stage)])
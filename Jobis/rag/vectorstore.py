@@ -1,25 +1,136 @@
+import logging
 import os
-from langchain_chroma import Chroma
-from langchain_huggingface import HuggingFaceEmbeddings
+import uuid
+
+from rag import telemetry
+from rag.embedder import get_cache_model_name, get_embeddings
+from rag.projection import PCAProjection, ProjectedEmbeddings
+
+logger = logging.getLogger(__name__)
 
 # 경로 및 설정
 BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 PERSIST_PATH = os.path.join(BASE_PATH, 'data', 'chroma_db')
-EMBEDDING_MODEL = "jhgan/ko-sroberta-multitask"
+CHUNK_COLLECTION = 'jobis_chunks'  # 문장 윈도우 청크 컬렉션 (embedding.py --chunked)
+DB_VERSION_FILE = 'db_version'  # 벡터 DB가 바뀔 때마다 갱신되는 버전 마커 (답변 캐시 무효화용)
+EMBEDDING_MODEL_FILE = 'embedding_model'  # 벡터를 만든 임베딩 모델/백엔드 (embedder.get_cache_model_name)
+# 검색 백엔드: chroma(기본) 또는 local(local_index.py로 내보낸 mmap IVF 인덱스, 읽기 전용)
+VECTOR_BACKENDS = ('chroma', 'local')
+VECTOR_BACKEND = os.getenv("JOBIS_VECTOR_BACKEND", "chroma").lower()
 
-def get_vectorstore():
-    embeddings = HuggingFaceEmbeddings(
-        model_name=EMBEDDING_MODEL,
-        model_kwargs={'device': 'cpu'},
-        encode_kwargs={'normalize_embeddings': True}
-    )
+def get_db_version(persist_path=None):
+    """현재 벡터 DB 버전 문자열을 반환합니다. 마커가 없으면 None을 반환합니다."""
+    persist_path = persist_path or PERSIST_PATH
+    try:
+        with open(os.path.join(persist_path, DB_VERSION_FILE), 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+def bump_db_version(persist_path=None):
+    """벡터 DB 내용이 바뀌었음을 기록합니다."""
+    persist_path = persist_path or PERSIST_PATH
+    os.makedirs(persist_path, exist_ok=True)
+    version = uuid.uuid4().hex
+    with open(os.path.join(persist_path, DB_VERSION_FILE), 'w', encoding='utf-8') as f:
+        f.write(version)
+    return version
+
+def get_embedding_model_marker(persist_path=None):
+    """벡터 DB를 만든 임베딩 모델 이름을 반환합니다. 마커가 없으면 None을 반환합니다."""
+    persist_path = persist_path or PERSIST_PATH
+    try:
+        with open(os.path.join(persist_path, EMBEDDING_MODEL_FILE), 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+def write_embedding_model_marker(model_name, persist_path=None):
+    """벡터 DB를 만든 임베딩 모델 이름을 기록합니다. (fp32/int8 벡터가 섞이지 않도록 빌드 때 확인)"""
+    persist_path = persist_path or PERSIST_PATH
+    os.makedirs(persist_path, exist_ok=True)
+    with open(os.path.join(persist_path, EMBEDDING_MODEL_FILE), 'w', encoding='utf-8') as f:
+        f.write(model_name)
+
+def open_chroma(persist_path=None, collection_name=None, embeddings=None, create=True):
+    """Chroma 컬렉션을 엽니다. create=False이면 컬렉션이 없을 때 만들지 않고 None을 반환합니다."""
+    persist_path = persist_path or PERSIST_PATH
+    if not create and not os.path.exists(os.path.join(persist_path, 'chroma.sqlite3')):
+        return None
+
+    # chromadb는 import만으로 수백 ms가 걸리므로 벡터스토어를 처음 열 때 불러옵니다.
+    from chromadb.errors import NotFoundError
+    from langchain_chroma import Chroma
+
+    kwargs = {"collection_name": collection_name} if collection_name else {}
+    try:
+        return Chroma(
+            persist_directory=persist_path,
+            embedding_function=embeddings,
+            create_collection_if_not_exists=create,
+            **kwargs,
+        )
+    except NotFoundError:
+        return None
+
+def get_vectorstore(embeddings=None, use_cache=True, collection_name=None, backend=None, create=True):
+    backend = (backend or VECTOR_BACKEND).lower()
+    if backend not in VECTOR_BACKENDS:
+        raise ValueError(f"지원하지 않는 검색 백엔드입니다: {backend} (선택: {', '.join(VECTOR_BACKENDS)})")
+
+    if embeddings is None:
+        with telemetry.span("load_embeddings"):
+            embeddings = get_embeddings(use_cache=use_cache)
 
     if not os.path.exists(PERSIST_PATH):
         raise FileNotFoundError(f"Vector DB가 존재하지 않습니다. 경로: {PERSIST_PATH}")
 
-    vectorstore = Chroma(
-        persist_directory=PERSIST_PATH,
-        embedding_function=embeddings,
-    )
+    model_name = get_embedding_model_marker(PERSIST_PATH)
+    if model_name and model_name != get_cache_model_name():
+        logger.warning(
+            "벡터 DB는 %s로 임베딩되었습니다. (현재 %s) 같은 모델/백엔드로 쓰거나 --rebuild로 다시 만드세요.",
+            model_name, get_cache_model_name(),
+        )
+
+    # 압축 모드로 만든 DB이면 질문 임베딩에도 같은 PCA 투영을 적용합니다.
+    projection = PCAProjection.load(PERSIST_PATH)
+    if projection is not None and not isinstance(embeddings, ProjectedEmbeddings):
+        if projection.model and projection.model != get_cache_model_name():
+            logger.warning("벡터 DB의 PCA 투영은 %s로 학습되었습니다. (현재 %s)", projection.model, get_cache_model_name())
+        embeddings = ProjectedEmbeddings(embeddings, projection)
+
+    if backend == 'local':
+        from rag.local_index import LocalVectorStore, get_local_index_dir
+
+        with telemetry.span("get_vectorstore", collection=collection_name or "default", backend=backend):
+            vectorstore = LocalVectorStore.load(embeddings, PERSIST_PATH, collection_name)
+        if vectorstore is None:
+            raise FileNotFoundError(
+                f"로컬 인덱스가 존재하지 않습니다. 경로: {get_local_index_dir(PERSIST_PATH, collection_name)} "
+                "(python rag/local_index.py로 먼저 내보내세요)"
+            )
+        if vectorstore.meta.get("db_version") != get_db_version():
+            logger.warning("로컬 인덱스가 현재 벡터 DB보다 오래되었습니다. python rag/local_index.py로 다시 내보내세요.")
+        return vectorstore
 
-    return vectorstore
\ No newline at end of file
+    with telemetry.span("get_vectorstore", collection=collection_name or "default"):
+        vectorstore = open_chroma(PERSIST_PATH, collection_name, embeddings, create=create)
+
+    return vectorstore
+
+def get_chunk_vectorstore(embeddings=None, use_cache=True, backend=None):
+    """청크 컬렉션을 반환합니다. 청크 인덱스가 구축되지 않았으면 None을 반환합니다."""
+    if (backend or VECTOR_BACKEND).lower() == 'local':
+        from rag.local_index import get_local_index_dir
+
+        if not os.path.exists(os.path.join(get_local_index_dir(PERSIST_PATH, CHUNK_COLLECTION), 'meta.json')):
+            return None
+        return get_vectorstore(embeddings=embeddings, use_cache=use_cache, collection_name=CHUNK_COLLECTION, backend='local')
+
+    # 읽기만 하므로 청크 컬렉션이 없으면 새로 만들지 않습니다.
+    chunk_store = get_vectorstore(
+        embeddings=embeddings, use_cache=use_cache, collection_name=CHUNK_COLLECTION, backend=backend, create=False
+    )
+    if chunk_store is None or chunk_store._collection.count() == 0:
+        return None
+    return chunk_store
\ No newline at end of file
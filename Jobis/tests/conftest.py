@@ -0,0 +1,46 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+
+# 테스트는 모델/네트워크 없이 실행합니다. (chromadb 사용 통계 전송 끔)
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# rag 패키지를 찾을 수 있도록 프로젝트 루트(tests/ 상위)를 sys.path에 추가
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_PATH not in sys.path:
+    sys.path.append(BASE_PATH)
+
+class NormalizedFakeEmbeddings(Embeddings):
+    """텍스트마다 고정된 무작위 벡터를 정규화해 반환합니다. (실제 모델처럼 normalize_embeddings=True)"""
+
+    def __init__(self, size=16):
+        self.fake = DeterministicFakeEmbedding(size=size)
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        vector = np.asarray(self.fake.embed_query(text), dtype=np.float32)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+@pytest.fixture
+def fake_embeddings():
+    return NormalizedFakeEmbeddings()
+
+def make_item(data_id, company_name="A사", content="연봉이 높고 복지가 좋습니다.", **fields):
+    item = {
+        "data_id": data_id,
+        "company_name": company_name,
+        "industry": "IT",
+        "type": "review",
+        "sentiment": "positive",
+        "score": 4,
+        "date": "2024-01-01",
+        "content": content,
+        "sentences": [sentence.strip() + "." for sentence in content.split(".") if sentence.strip()],
+    }
+    item.update(fields)
+    return item
@@ -0,0 +1,51 @@
+from langchain_core.embeddings import Embeddings
+
+from rag.answer_cache import SemanticAnswerCache, analysis_key_fn
+from rag.query_analyzer import QueryAnalyzer
+
+class ConstantEmbeddings(Embeddings):
+    """모든 질문을 같은 벡터로 임베딩합니다. (템플릿 질문처럼 유사도가 1인 최악의 경우)"""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return [1.0, 0.0, 0.0]
+
+def make_cache(version="v1", **kwargs):
+    analyzer = QueryAnalyzer({"삼성전자": "IT", "LG전자": "IT", "현대자동차": "제조업"})
+    return SemanticAnswerCache(
+        ConstantEmbeddings(), version_fn=lambda: version, key_fn=analysis_key_fn(analyzer), **kwargs
+    )
+
+def test_same_question_hits():
+    cache = make_cache()
+    cache.store("삼성전자 장점은?", "삼성전자 답변", cost=1.0)
+    assert cache.lookup("삼성전자 장점은?") == "삼성전자 답변"
+    assert cache.stats()["hits"] == 1
+
+def test_company_swapped_question_misses():
+    cache = make_cache()
+    cache.store("삼성전자 장점은?", "삼성전자 답변", cost=1.0)
+    assert cache.lookup("LG전자 장점은?") is None
+    assert cache.lookup("삼성전자랑 LG전자 장점 비교해줘") is None
+
+def test_polarity_swapped_question_misses():
+    cache = make_cache()
+    cache.store("삼성전자 장점은?", "장점 답변", cost=1.0)
+    assert cache.lookup("삼성전자 단점은?") is None
+
+def test_question_without_company_does_not_reuse_company_answer():
+    cache = make_cache()
+    cache.store("삼성전자 연봉은?", "삼성전자 답변", cost=1.0)
+    assert cache.lookup("연봉 높은 회사는?") is None
+
+def test_db_version_change_clears_cache():
+    version = {"value": "v1"}
+    analyzer = QueryAnalyzer({"삼성전자": "IT"})
+    cache = SemanticAnswerCache(
+        ConstantEmbeddings(), version_fn=lambda: version["value"], key_fn=analysis_key_fn(analyzer)
+    )
+    cache.store("삼성전자 장점은?", "답변", cost=1.0)
+    version["value"] = "v2"
+    assert cache.lookup("삼성전자 장점은?") is None
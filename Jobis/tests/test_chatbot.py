@@ -0,0 +1,64 @@
+import asyncio
+
+from rag import chatbot as chatbot_module
+from rag.chatbot import TIMEOUT_MESSAGE, JobisChatbot
+
+class FakeRetriever:
+    async def ainvoke(self, query):
+        return []
+
+class FakeAnswerChain:
+    def __init__(self, chunks, delay=0.0):
+        self.chunks = chunks
+        self.delay = delay
+        self.closed = False
+
+    async def astream(self, inputs):
+        try:
+            for chunk in self.chunks:
+                await asyncio.sleep(self.delay)
+                yield chunk
+        finally:
+            self.closed = True
+
+def make_bot(answer_chain):
+    bot = JobisChatbot(use_answer_cache=False, warm_up=False)
+    bot.__dict__["_traced_retriever"] = FakeRetriever()
+    bot.__dict__["answer_chain"] = answer_chain
+    return bot
+
+def test_astream_timeout_yields_message_instead_of_cancelling_caller():
+    bot = make_bot(FakeAnswerChain(["첫 조각", "늦은 조각"], delay=0.3))
+
+    async def consume():
+        return [chunk async for chunk in bot.astream("질문", timeout=0.45)]
+
+    assert asyncio.run(consume()) == ["첫 조각", TIMEOUT_MESSAGE]
+
+def test_astream_slow_consumer_does_not_count_against_timeout():
+    bot = make_bot(FakeAnswerChain(["a", "b", "c"]))
+
+    async def consume():
+        chunks = []
+        async for chunk in bot.astream("질문", timeout=0.2):
+            chunks.append(chunk)
+            await asyncio.sleep(0.15)  # 조각 사이 호출자 처리 시간
+        return chunks
+
+    assert asyncio.run(consume()) == ["a", "b", "c"]
+
+def test_astream_consumer_stopping_early_closes_stream_and_releases_llm_slot():
+    answer_chain = FakeAnswerChain(["a", "b", "c"])
+    bot = make_bot(answer_chain)
+
+    async def consume():
+        stream = bot.astream("질문")
+        async for chunk in stream:
+            break
+        await stream.aclose()
+        return chunk, chatbot_module._get_llm_semaphore()._value
+
+    chunk, free_slots = asyncio.run(consume())
+    assert chunk == "a"
+    assert answer_chain.closed
+    assert free_slots == chatbot_module.MAX_CONCURRENT_LLM_CALLS
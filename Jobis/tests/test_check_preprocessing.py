@@ -0,0 +1,24 @@
+import json
+
+from conftest import make_item
+from rag import check_preprocessing
+
+def write_json(tmp_path, monkeypatch, items):
+    path = tmp_path / "cleaned_data.json"
+    path.write_text(json.dumps(items, ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setattr(check_preprocessing, "PROCESSED_FILE", str(path))
+
+def test_report_on_empty_file_prints_placeholders(tmp_path, monkeypatch, capsys):
+    write_json(tmp_path, monkeypatch, [])
+    report = check_preprocessing.report_data(output_file=None)
+    assert report["source_rows"] == 0
+    assert report["content_length"]["p50"] is None
+    assert "p50/p95: -/-자" in capsys.readouterr().out
+
+def test_report_counts_problems(tmp_path, monkeypatch):
+    items = [make_item("1"), make_item("1", content="(결측치 포함) 내용"), make_item("2", score=3.5)]
+    write_json(tmp_path, monkeypatch, items)
+    report = check_preprocessing.report_data(output_file=None)
+    assert report["integrity"]["duplicate_data_ids"] == 1
+    assert report["integrity"]["noise_remains"] == 1
+    assert report["score"]["distribution"] == {"4": 2, "3.5": 1}
@@ -0,0 +1,61 @@
+import logging
+
+import pytest
+from langchain_core.documents import Document
+
+from rag import context as context_module
+from rag import pipeline
+from rag.context import build_context, deduplicate
+
+@pytest.fixture(autouse=True)
+def char_token_counter(monkeypatch):
+    # 모델 토크나이저 대신 글자 수 기반 추정치 사용 (글자 1.5개 = 1토큰)
+    monkeypatch.setattr(context_module, "_get_tokenizer", lambda: None)
+
+def doc(content, company="A사", industry="IT"):
+    return Document(
+        page_content=f"기업명: {company}\n산업분야: {industry}\n내용: {content}",
+        metadata={"company_name": company, "industry": industry},
+    )
+
+def test_near_duplicates_are_removed_keeping_rank_order():
+    docs = [
+        doc("연봉이 높고 복지가 좋으며 야근이 거의 없는 편입니다."),
+        doc("재택 근무가 자유롭고 팀 분위기가 수평적입니다."),
+        doc("연봉이 높고 복지가 좋으며 야근이 거의 없는 편입니다!", company="B사"),  # 머리말만 다른 거의 같은 본문
+    ]
+    assert deduplicate(docs) == docs[:2]
+
+def test_distinct_documents_are_kept():
+    docs = [doc("연봉이 높습니다."), doc("식대가 나옵니다."), doc("교육비를 지원합니다.")]
+    assert deduplicate(docs) == docs
+
+def test_budget_skips_documents_that_do_not_fit_and_tries_shorter_ones():
+    long_text = "야근이 많지만 성장할 수 있는 환경이고 선배들이 친절하게 알려줍니다. " * 4
+    docs = [doc("연봉이 높습니다."), doc(long_text), doc("식대가 나옵니다.")]
+    budget = context_module.count_tokens("[A사] 산업분야: IT") + 2 * context_module.count_tokens("- 연봉이 높습니다.")
+
+    context = build_context(docs, max_tokens=budget)
+    assert "연봉이 높습니다." in context
+    assert "야근이 많지만" not in context
+    assert "식대가 나옵니다." in context
+
+def test_nothing_fits_in_tiny_budget():
+    assert build_context([doc("연봉이 높습니다.")], max_tokens=1) == ""
+
+def test_documents_are_grouped_by_company_with_one_header():
+    docs = [doc("연봉이 높습니다."), doc("야근이 많습니다.", company="B사", industry="제조"), doc("식대가 나옵니다.")]
+    assert build_context(docs) == (
+        "[A사] 산업분야: IT\n- 연봉이 높습니다.\n- 식대가 나옵니다.\n\n"
+        "[B사] 산업분야: 제조\n- 야근이 많습니다."
+    )
+
+def test_token_logging_skips_tokenizer_when_info_is_disabled(monkeypatch, caplog):
+    def fail(text):
+        raise AssertionError("INFO 로그가 꺼져 있으면 토큰을 세지 않아야 합니다")
+
+    monkeypatch.setattr(pipeline, "count_tokens", fail)
+    caplog.set_level(logging.WARNING, logger=pipeline.logger.name)
+    prompt_value = pipeline.build_prompt().invoke({"context": "c", "question": "q"})
+    assert pipeline.log_prompt_tokens(prompt_value) is prompt_value
+    assert list(pipeline._log_answer_tokens(iter(["a", "b"]))) == ["a", "b"]
@@ -0,0 +1,40 @@
+from rag.embedding_cache import EmbeddingCache
+
+MODEL = "test-model"
+
+def put(cache, *keys):
+    cache.put_many(MODEL, True, [(key, [float(len(key)), 1.0]) for key in keys])
+
+def test_get_many_returns_stored_vectors(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"))
+    put(cache, "a", "bb")
+    assert cache.get_many(MODEL, True, ["a", "bb", "c"]) == {"a": [1.0, 1.0], "bb": [2.0, 1.0]}
+    assert cache.get_many(MODEL, False, ["a"]) == {}
+    assert (cache.hits, cache.misses) == (2, 2)
+
+def test_cache_hit_does_not_write(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"))
+    put(cache, "a")
+    writes = cache._conn.total_changes
+    for _ in range(10):
+        assert "a" in cache.get_many(MODEL, True, ["a"])
+    assert cache._conn.total_changes == writes
+
+def test_eviction_keeps_recently_used_entries(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"), max_entries=10)
+    put(cache, *[f"old{i}" for i in range(9)])
+    put(cache, "hot")
+    cache.get_many(MODEL, True, ["hot"])  # 적중 기록은 아직 메모리에만 있음
+    put(cache, *[f"new{i}" for i in range(5)])
+
+    entries = cache.stats()["entries"]
+    assert entries <= 10
+    assert "hot" in cache.get_many(MODEL, True, ["hot"])
+    assert all(f"new{i}" in cache.get_many(MODEL, True, [f"new{i}"]) for i in range(5))
+
+def test_entry_estimate_survives_reopen(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    put(EmbeddingCache(path, max_entries=5), *[str(i) for i in range(5)])
+    cache = EmbeddingCache(path, max_entries=5)
+    put(cache, "x")
+    assert cache.stats()["entries"] <= 5
@@ -0,0 +1,106 @@
+import pytest
+from langchain_chroma import Chroma
+
+from conftest import make_item
+from rag.embedding import create_documents, sync_vector_db
+
+@pytest.fixture
+def vector_store(tmp_path, fake_embeddings):
+    return Chroma(collection_name="sync_test", persist_directory=str(tmp_path), embedding_function=fake_embeddings)
+
+def sync(vector_store, items):
+    return sync_vector_db(vector_store, lambda: create_documents(items), batch_size=2)
+
+def counts(summary):
+    return {key: summary[key] for key in ("added", "updated", "deleted", "skipped", "missing_id")}
+
+def test_first_sync_adds_everything(vector_store):
+    items = [make_item("1"), make_item("2"), make_item("3")]
+    assert counts(sync(vector_store, items)) == {"added": 3, "updated": 0, "deleted": 0, "skipped": 0, "missing_id": 0}
+    assert sorted(vector_store.get()["ids"]) == ["1", "2", "3"]
+
+def test_resync_skips_unchanged_documents(vector_store):
+    items = [make_item("1"), make_item("2")]
+    sync(vector_store, items)
+    assert counts(sync(vector_store, items)) == {"added": 0, "updated": 0, "deleted": 0, "skipped": 2, "missing_id": 0}
+
+def test_sync_detects_added_updated_and_deleted(vector_store):
+    sync(vector_store, [make_item("1"), make_item("2"), make_item("3")])
+
+    items = [make_item("1"), make_item("2", content="야근이 많습니다."), make_item("4")]
+    assert counts(sync(vector_store, items)) == {"added": 1, "updated": 1, "deleted": 1, "skipped": 1, "missing_id": 0}
+
+    result = vector_store.get(ids=["2"])
+    assert "야근이 많습니다." in result["documents"][0]
+    assert sorted(vector_store.get()["ids"]) == ["1", "2", "4"]
+
+def test_metadata_change_is_an_update(vector_store):
+    sync(vector_store, [make_item("1")])
+    summary = sync(vector_store, [make_item("1", sentiment="negative")])
+    assert summary["updated"] == 1
+    assert vector_store.get(ids=["1"])["metadatas"][0]["sentiment"] == "negative"
+
+def test_documents_without_data_id_are_counted(vector_store, caplog):
+    items = [make_item("1"), make_item(None), make_item("")]
+    with caplog.at_level("WARNING"):
+        summary = sync(vector_store, items)
+    assert summary["added"] == 1
+    assert summary["missing_id"] == 2
+    assert "2건" in caplog.text
+
+def test_plain_build_keeps_existing_chunk_collection_in_sync(tmp_path, fake_embeddings, monkeypatch):
+    from rag import embedding as embedding_module
+    from rag import vectorstore as vectorstore_module
+    from rag.processed_store import write_processed_table
+
+    persist_path = str(tmp_path / "chroma_db")
+    input_file = str(tmp_path / "cleaned_data.json")
+    monkeypatch.setattr(embedding_module, "PERSIST_PATH", persist_path)
+    monkeypatch.setattr(embedding_module, "INPUT_FILE", input_file)
+    monkeypatch.setattr(vectorstore_module, "PERSIST_PATH", persist_path)
+    monkeypatch.setattr(embedding_module, "get_embeddings", lambda use_cache=True: fake_embeddings)
+
+    def build(items, chunked=False):
+        write_processed_table(items, str(tmp_path / "cleaned_data.parquet"))
+        embedding_module.build_vector_db(use_cache=False, chunked=chunked)
+
+    # 청크 없이 만든 DB는 읽기만 해서는 청크 컬렉션이 생기지 않음
+    build([make_item("1")])
+    assert vectorstore_module.get_chunk_vectorstore(embeddings=fake_embeddings, backend="chroma") is None
+    assert vectorstore_module.open_chroma(persist_path, vectorstore_module.CHUNK_COLLECTION, create=False) is None
+
+    build([make_item("1")], chunked=True)
+    build([make_item("2", content="새로운 리뷰입니다.")])  # --chunked 없이 증분 빌드
+
+    chunk_store = vectorstore_module.get_chunk_vectorstore(embeddings=fake_embeddings, backend="chroma")
+    parents = {metadata["parent_id"] for metadata in chunk_store.get()["metadatas"]}
+    assert parents == {"2"}
+
+def test_build_refuses_to_mix_embedding_backends(tmp_path, fake_embeddings, monkeypatch, caplog):
+    from rag import embedding as embedding_module
+    from rag import vectorstore as vectorstore_module
+    from rag.processed_store import write_processed_table
+
+    persist_path = str(tmp_path / "chroma_db")
+    monkeypatch.setattr(embedding_module, "PERSIST_PATH", persist_path)
+    monkeypatch.setattr(embedding_module, "INPUT_FILE", str(tmp_path / "cleaned_data.json"))
+    monkeypatch.setattr(vectorstore_module, "PERSIST_PATH", persist_path)
+    monkeypatch.setattr(embedding_module, "get_embeddings", lambda use_cache=True: fake_embeddings)
+    write_processed_table([make_item("1")], str(tmp_path / "cleaned_data.parquet"))
+
+    embedding_module.build_vector_db(use_cache=False)
+    torch_model = vectorstore_module.get_embedding_model_marker(persist_path)
+    assert torch_model == embedding_module.get_cache_model_name()
+
+    onnx_model = f"{torch_model}#onnx-qint8-avx2"
+    monkeypatch.setattr(embedding_module, "get_cache_model_name", lambda: onnx_model)
+    with pytest.raises(ValueError, match="--rebuild"):
+        embedding_module.build_vector_db(use_cache=False)
+    assert vectorstore_module.get_embedding_model_marker(persist_path) == torch_model
+
+    embedding_module.build_vector_db(rebuild=True, use_cache=False)
+    assert vectorstore_module.get_embedding_model_marker(persist_path) == onnx_model
+
+    # 다른 모델/백엔드로 DB를 열면 경고
+    vectorstore_module.get_vectorstore(embeddings=fake_embeddings, backend="chroma")
+    assert onnx_model in caplog.text
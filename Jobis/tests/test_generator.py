@@ -0,0 +1,68 @@
+import json
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+# data/raw는 패키지가 아니므로 경로를 직접 추가
+RAW_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'raw')
+if RAW_DIR not in sys.path:
+    sys.path.append(RAW_DIR)
+
+import dumy
+
+END_DATE = datetime(2025, 1, 1)
+
+def generate(tmp_path, name, num_workers, seed=7):
+    path = str(tmp_path / name)
+    dumy.generate_jobis_data_file(
+        output_file=path,
+        companies_per_industry=5,
+        records_per_company=6,
+        seed=seed,
+        num_workers=num_workers,
+        end_date=END_DATE,
+    )
+    with open(path, 'rb') as f:
+        return f.read()
+
+def test_same_seed_gives_identical_output_for_any_worker_count(tmp_path):
+    single = generate(tmp_path, "single.jsonl", num_workers=1)
+    assert single == generate(tmp_path, "single_again.jsonl", num_workers=1)
+    assert single == generate(tmp_path, "parallel.jsonl", num_workers=3)
+    assert single != generate(tmp_path, "other_seed.jsonl", num_workers=1, seed=8)
+
+    companies = [json.loads(line) for line in single.decode('utf-8').splitlines()]
+    assert len(companies) == len(dumy.INDUSTRIES) * 5
+    assert all(len(company["data"]) == 6 for company in companies)
+
+def negative_template_frequencies(sector, count, data_id_start):
+    templates = dumy.TEMPLATE_POOLS[sector]["negative_long"]
+    texts = [
+        review["re_dis"]
+        for review in (dumy.generate_review(sector, data_id_start + i)["review"] for i in range(count))
+        if review["re_dis"]
+    ]
+    counts = [sum(text.count(template) for text in texts) for template in templates]
+    total = sum(counts)
+    return [value / total for value in counts]
+
+@pytest.mark.parametrize("sector", [dumy.INDUSTRIES[0], dumy.INDUSTRIES[-1]])
+def test_template_distribution_stays_stable(sector):
+    dumy.seed_random(42)
+    templates = dumy.TEMPLATE_POOLS[sector]["negative_long"]
+    pool_size = len(templates)
+    questions = {template for template in templates[len(dumy.NEGATIVE_TEMPLATES):]}
+
+    first = negative_template_frequencies(sector, 3000, 1)
+    last = negative_template_frequencies(sector, 3000, 100_001)
+
+    # 템플릿 풀은 생성 중에 커지지 않음
+    assert len(dumy.TEMPLATE_POOLS[sector]["negative_long"]) == pool_size
+    for frequencies in (first, last):
+        # 모든 템플릿이 균등 분포의 ±30% 안에서 쓰이고, 면접 질문이 단점 문장을 잠식하지 않음
+        assert all(0.7 / pool_size <= value <= 1.3 / pool_size for value in frequencies)
+        question_share = sum(value for template, value in zip(templates, frequencies) if template in questions)
+        assert question_share == pytest.approx(len(questions) / pool_size, abs=0.03)
+    assert max(abs(a - b) for a, b in zip(first, last)) < 0.02
@@ -0,0 +1,45 @@
+from conftest import make_item
+from rag.lexical_index import LexicalIndex, build_lexical_index, tokenize
+
+def build(tmp_path, items):
+    build_lexical_index(items, str(tmp_path))
+    return LexicalIndex.load(str(tmp_path))
+
+def test_tokenize_uses_korean_bigrams_and_ascii_words():
+    assert tokenize("L2 정규화") == ["l2", "정규", "규화"]
+
+def test_load_returns_none_without_index(tmp_path):
+    assert LexicalIndex.load(str(tmp_path)) is None
+
+def test_exact_term_ranks_first_and_unmatched_docs_are_dropped(tmp_path):
+    index = build(tmp_path, [
+        make_item("1", content="야근이 많고 연봉이 낮습니다."),
+        make_item("2", content="트랜스포머 모델을 직접 학습합니다."),
+        make_item("3", content="연봉이 높고 야근이 적습니다."),
+    ])
+    hits = index.search("트랜스포머", k=3)
+    assert [doc_id for doc_id, _ in hits] == ["2"]
+    assert hits[0][1] > 0
+    assert index.search("없는단어", k=3) == []
+
+def test_rare_terms_outweigh_common_terms(tmp_path):
+    # "연봉"은 모든 문서에 있어 idf가 낮고, "재택"은 한 문서에만 있음
+    index = build(tmp_path, [
+        make_item("1", content="연봉 연봉 연봉 이야기."),
+        make_item("2", content="연봉 그리고 재택 근무."),
+        make_item("3", content="연봉 수준 보통."),
+    ])
+    assert index.search("연봉 재택", k=1)[0][0] == "2"
+
+def test_shorter_document_wins_with_same_term_frequency(tmp_path):
+    index = build(tmp_path, [
+        make_item("long", content="재택 근무가 가능하고 식대와 교통비와 통신비와 자기계발비를 모두 지원합니다."),
+        make_item("short", content="재택 가능."),
+        make_item("other", content="야근이 많습니다."),
+    ])
+    assert [doc_id for doc_id, _ in index.search("재택", k=2)] == ["short", "long"]
+
+def test_k_limits_results(tmp_path):
+    index = build(tmp_path, [make_item(str(i), content=f"복지 좋음 {i}번.") for i in range(5)])
+    assert len(index.search("복지", k=2)) == 2
+    assert len(index.search("복지", k=10)) == 5
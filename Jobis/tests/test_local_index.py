@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+from langchain_chroma import Chroma
+
+from conftest import NormalizedFakeEmbeddings, make_item
+from rag.embedding import create_documents
+from rag import local_index as local_index_module
+from rag.local_index import LocalVectorStore, export_local_index
+
+COMPANIES = ["A사", "B사", "C사"]
+FILTERS = [
+    {"company_name": "B사"},
+    {"company_name": {"$eq": "C사"}},
+    {"type": {"$in": ["interview"]}},
+    {"sentiment": {"$ne": "positive"}},
+    {"company_name": {"$nin": ["A사", "B사"]}},
+    {"$and": [{"company_name": "A사"}, {"type": "review"}]},
+    {"$or": [{"company_name": "A사"}, {"sentiment": "negative"}]},
+    {"company_name": "없는 회사"},
+]
+
+@pytest.fixture(scope="module")
+def stores(tmp_path_factory):
+    persist_path = str(tmp_path_factory.mktemp("chroma_db"))
+    embeddings = NormalizedFakeEmbeddings()
+    items = [
+        make_item(
+            f"{index}_{'R' if index % 2 else 'I'}",
+            company_name=COMPANIES[index % len(COMPANIES)],
+            content=f"{index}번째 리뷰입니다. 문장 {index * 7}.",
+            type="review" if index % 2 else "interview",
+            sentiment=["positive", "negative", "neutral"][index % 3],
+        )
+        for index in range(60)
+    ]
+    chroma = Chroma(persist_directory=persist_path, embedding_function=embeddings)
+    documents = list(create_documents(items))
+    chroma.add_documents(documents, ids=[doc.id for doc in documents])
+
+    export_local_index(persist_path, nlist=4)
+    return chroma, LocalVectorStore.load(embeddings, persist_path), embeddings
+
+def ids_of(documents):
+    return [doc.id for doc in documents]
+
+def test_unfiltered_search_matches_chroma(stores):
+    chroma, local, embeddings = stores
+    local.nprobe = 4  # 모든 IVF 리스트를 살펴보면 정확 검색과 같음
+    for query in ["연봉", "복지", "야근", "면접 질문"]:
+        vector = embeddings.embed_query(query)
+        assert ids_of(local.similarity_search_by_vector(vector, k=5)) == ids_of(chroma.similarity_search_by_vector(vector, k=5))
+
+@pytest.mark.parametrize("where", FILTERS)
+def test_filtered_search_matches_chroma(stores, where):
+    chroma, local, embeddings = stores
+    vector = embeddings.embed_query("분위기 좋은 회사")
+    expected = chroma.similarity_search_by_vector(vector, k=4, filter=where)
+    actual = local.similarity_search_by_vector(vector, k=4, filter=where)
+    assert ids_of(actual) == ids_of(expected)
+    assert [doc.metadata for doc in actual] == [doc.metadata for doc in expected]
+
+def test_scores_match_chroma_distance(stores):
+    chroma, local, _ = stores
+    expected = chroma.similarity_search_with_score("연봉", k=3)
+    actual = local.similarity_search_with_score("연봉", k=3)
+    for (_, expected_score), (_, actual_score) in zip(expected, actual):
+        assert actual_score == pytest.approx(expected_score, abs=1e-4)
+
+@pytest.mark.parametrize("where", [None] + FILTERS)
+def test_get_by_ids_matches_chroma(stores, where):
+    chroma, local, _ = stores
+    ids = ["0_I", "1_R", "2_I", "3_R", "없는_id"]
+    kwargs = {"where": where} if where else {}
+    expected = chroma.get(ids=ids, **kwargs)
+    actual = local.get(ids=ids, **kwargs)
+    assert sorted(zip(actual["ids"], actual["documents"])) == sorted(zip(expected["ids"], expected["documents"]))
+    assert dict(zip(actual["ids"], actual["metadatas"])) == dict(zip(expected["ids"], expected["metadatas"]))
+
+def test_get_where_without_ids_matches_chroma(stores):
+    chroma, local, _ = stores
+    where = {"company_name": "A사"}
+    assert sorted(local.get(where=where)["ids"]) == sorted(chroma.get(where=where)["ids"])
+    assert len(local.get(include=["metadatas"])["metadatas"]) == 60
+
+def test_unsupported_filter_column_raises(stores):
+    _, local, embeddings = stores
+    with pytest.raises(ValueError):
+        local.similarity_search_by_vector(embeddings.embed_query("연봉"), k=3, filter={"score": 4})
+
+def test_local_store_is_read_only(stores):
+    _, local, _ = stores
+    with pytest.raises(NotImplementedError):
+        local.add_texts(["새 문서"])
+
+def assert_scores_belong_to_rows(local, vector, k):
+    query = np.asarray(vector, dtype=np.float32)
+    query /= np.linalg.norm(query)
+    hits = local._search(vector, k)
+    assert hits
+    for row, score in hits:
+        assert score == pytest.approx(float(np.asarray(local.vectors[row]) @ query), abs=1e-5)
+    return hits
+
+def test_interleaved_candidate_rows_keep_their_scores(stores, monkeypatch):
+    _, local, embeddings = stores
+    vector = embeddings.embed_query("연봉")
+    # 행 번호의 최솟값~최댓값 폭이 개수와 같아도 연속 구간이 아님 (3..6이 아니라 3, 4, 6, 10)
+    monkeypatch.setattr(local, "_candidate_rows", lambda query, k, mask: np.array([3, 10, 4, 6]))
+    hits = assert_scores_belong_to_rows(local, vector, k=4)
+    assert sorted(row for row, _ in hits) == [3, 4, 6, 10]
+
+def test_ivf_search_over_several_probed_lists(stores, monkeypatch):
+    _, local, embeddings = stores
+    monkeypatch.setattr(local_index_module, "BRUTE_FORCE_MAX_ROWS", 0)
+    for nprobe in (1, 2, 3):
+        monkeypatch.setattr(local, "nprobe", nprobe)
+        for query in ["연봉", "복지", "야근"]:
+            assert_scores_belong_to_rows(local, embeddings.embed_query(query), k=10)
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from rag.preprocessing import iter_json_array
+
+RECORDS = [
+    {"company_name": "엘지화학", "reviews": [{"content": "연봉이 높고 복지가 좋습니다. 😀", "score": 4.5}]},
+    {"company_name": "KT", "reviews": []},
+    {"company_name": "해커스 교육그룹", "reviews": [{"content": "야근이 많아요…", "score": 2}]},
+]
+
+def write(tmp_path, text):
+    path = tmp_path / "data.json"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+def test_objects_and_multibyte_text_split_across_chunks(tmp_path, chunk_size):
+    path = write(tmp_path, json.dumps(RECORDS, ensure_ascii=False, indent=2))
+    assert list(iter_json_array(path, chunk_size=chunk_size)) == RECORDS
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5])
+def test_whitespace_and_commas_at_chunk_edges(tmp_path, chunk_size):
+    text = "\n\n  [ \n" + " ,\n ".join(json.dumps(record, ensure_ascii=False) for record in RECORDS) + " \n ]\n"
+    path = write(tmp_path, text)
+    assert list(iter_json_array(path, chunk_size=chunk_size)) == RECORDS
+
+@pytest.mark.parametrize("chunk_size", [1, 3])
+def test_scalars_are_not_cut_at_chunk_edges(tmp_path, chunk_size):
+    path = write(tmp_path, '[12345, true, null, "문자열", 6.5e3]')
+    assert list(iter_json_array(path, chunk_size=chunk_size)) == [12345, True, None, "문자열", 6500.0]
+
+@pytest.mark.parametrize("text", ["[]", "  [ ]  ", "[\n]\n"])
+def test_empty_array(tmp_path, text):
+    assert list(iter_json_array(write(tmp_path, text), chunk_size=1)) == []
+
+@pytest.mark.parametrize("text", [
+    '[{"company_name": "A"}, {"company_name": "B"',
+    '[{"company_name": "A"},',
+    '[{"company_name": "A"}',
+    '[',
+])
+def test_truncated_file_raises(tmp_path, text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(write(tmp_path, text), chunk_size=4))
+
+@pytest.mark.parametrize("text", ["", '{"company_name": "A"}'])
+def test_non_array_raises(tmp_path, text):
+    with pytest.raises(ValueError, match="JSON 배열"):
+        list(iter_json_array(write(tmp_path, text), chunk_size=4))
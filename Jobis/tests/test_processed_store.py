@@ -0,0 +1,65 @@
+import json
+
+from conftest import make_item
+from rag.embedding import create_chunk_documents, create_documents
+from rag.preprocessing import load_processed_items
+from rag.processed_store import get_parquet_path, write_processed_table
+
+def interview_item(data_id):
+    # 면접 항목에는 score/date 필드가 없음
+    item = make_item(data_id, type="interview", sentiment="neutral", content="면접 질문: 자기소개 답변/후기: 무난했습니다.")
+    del item["score"], item["date"]
+    return item
+
+ITEMS = [
+    make_item("1_R"),
+    make_item("2_R", score=3.5),
+    make_item("3_R", score=None, date=None, sentiment="neutral"),
+    make_item("4_R", date="2023-12-31"),
+    interview_item("5_I"),
+]
+
+def load_both(tmp_path, items):
+    json_path = str(tmp_path / "cleaned_data.json")
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(items, f, ensure_ascii=False)
+    from_json = list(load_processed_items(json_path, prefer_parquet=False))
+
+    write_processed_table(items, get_parquet_path(json_path))
+    from_parquet = list(load_processed_items(json_path))
+    return from_json, from_parquet
+
+def hashes(documents):
+    return {doc.id: doc.metadata["content_hash"] for doc in documents}
+
+def test_document_hashes_match_between_json_and_parquet(tmp_path):
+    from_json, from_parquet = load_both(tmp_path, ITEMS)
+    assert hashes(create_documents(from_parquet)) == hashes(create_documents(from_json))
+    assert hashes(create_chunk_documents(from_parquet)) == hashes(create_chunk_documents(from_json))
+
+def test_fractional_score_is_not_truncated(tmp_path):
+    _, from_parquet = load_both(tmp_path, ITEMS)
+    scores = {item["data_id"]: item.get("score") for item in from_parquet}
+    assert scores["2_R"] == 3.5
+    assert scores["1_R"] == 4 and isinstance(scores["1_R"], int)
+
+def test_null_fields_use_the_same_defaults(tmp_path):
+    from_json, from_parquet = load_both(tmp_path, ITEMS)
+    for items in (from_json, from_parquet):
+        metadata = {doc.id: doc.metadata for doc in create_documents(items)}
+        assert (metadata["3_R"]["score"], metadata["3_R"]["date"]) == (0, "")
+        assert (metadata["5_I"]["score"], metadata["5_I"]["date"]) == (0, "")
+
+def test_common_date_formats_are_converted(tmp_path):
+    _, from_parquet = load_both(tmp_path, [make_item("1", date="2024.03.05"), make_item("2", date="2024-03-06T09:00:00")])
+    assert [item["date"] for item in from_parquet] == ["2024-03-05", "2024-03-06"]
+
+def test_invalid_date_is_logged_and_stored_as_null(tmp_path, caplog):
+    path = str(tmp_path / "out.parquet")
+    assert write_processed_table([make_item("ok"), make_item("bad_1", date="어제")], path) == 2
+    assert "bad_1" in caplog.text
+
+    records = {item["data_id"]: item for item in load_processed_items(path)}
+    assert records["ok"]["date"] == "2024-01-01"
+    assert "date" not in records["bad_1"]
+    assert records["bad_1"]["content"] == make_item("bad_1")["content"]
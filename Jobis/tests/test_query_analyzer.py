@@ -0,0 +1,56 @@
+import pytest
+
+from rag.query_analyzer import QueryAnalyzer
+
+COMPANIES = {
+    "(주)LG화학": "제조/화학",
+    "KT": "IT/웹/통신",
+    "해커스 교육그룹": "교육업",
+    "삼성서울병원": "의료/제약/복지",
+    "국민은행": "은행/금융업",
+}
+
+@pytest.fixture
+def analyzer():
+    return QueryAnalyzer(COMPANIES)
+
+@pytest.mark.parametrize("query", [
+    "교육 지원이 좋은 회사 알려줘",
+    "통신비 지원해주는 회사",
+    "의료비 지원 복지 좋은 곳",
+    "Git 잘 쓰는 회사",
+    "KTX 타고 출근하는 회사",
+    "복지가 좋은 회사는 어디야?",
+])
+def test_topic_words_do_not_become_filters(analyzer, query):
+    analysis = analyzer.analyze(query)
+    assert analysis == {"companies": [], "industries": []}
+    assert analyzer.build_filter(analysis) is None
+
+@pytest.mark.parametrize("query, industry", [
+    ("교육업계 연봉 어때?", "교육업"),
+    ("IT 회사 중 야근 적은 곳", "IT/웹/통신"),
+    ("it기업 복지", "IT/웹/통신"),
+    ("통신 업계 분위기", "IT/웹/통신"),
+    ("의료산업 워라밸", "의료/제약/복지"),
+    ("금융업 연봉", "은행/금융업"),
+    ("제조업 야근", "제조/화학"),
+])
+def test_industry_with_suffix_is_matched(analyzer, query, industry):
+    analysis = analyzer.analyze(query)
+    assert analysis["industries"] == [industry]
+    assert analyzer.build_filter(analysis) == {"industry": industry}
+
+@pytest.mark.parametrize("query, company", [
+    ("LG화학 복지 어때?", "(주)LG화학"),
+    ("엘지화학 연봉", "(주)LG화학"),
+    ("KT 야근 많아?", "KT"),
+    ("kt에서 일하기 어때", "KT"),
+])
+def test_company_aliases(analyzer, query, company):
+    assert analyzer.analyze(query)["companies"] == [company]
+
+def test_company_filter_takes_priority_and_keeps_order(analyzer):
+    analysis = analyzer.analyze("KT랑 LG화학 비교해줘, IT 회사 기준으로")
+    assert analysis["companies"] == ["KT", "(주)LG화학"]
+    assert analyzer.build_filter(analysis) == {"company_name": {"$in": ["KT", "(주)LG화학"]}}
@@ -0,0 +1,80 @@
+import sys
+import time
+import types
+
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from rag.reranker import CrossEncoderReranker, LoadShedder, rerank_documents
+from rag.retriever import RerankingRetriever
+
+CANDIDATES = [Document(page_content=f"문서 {i}", metadata={"data_id": str(i)}) for i in range(5)]
+
+class StaticRetriever(BaseRetriever):
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        return list(CANDIDATES)
+
+class ReverseReranker:
+    def score(self, query, docs):
+        return [float(doc.metadata["data_id"]) for doc in docs]
+
+class BrokenReranker:
+    def score(self, query, docs):
+        raise RuntimeError("모델 다운로드 실패")
+
+class SlowLoadingReranker(ReverseReranker):
+    def __init__(self):
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            time.sleep(0.2)
+            self._model = object()
+        return self._model
+
+def make_retriever(reranker, shedder=None):
+    return RerankingRetriever(
+        base_retriever=StaticRetriever(),
+        reranker=reranker,
+        load_shedder=shedder or LoadShedder(max_inflight=4, latency_budget=0.5),
+        k=2,
+    )
+
+def test_reranks_candidates():
+    docs = make_retriever(ReverseReranker()).invoke("질문")
+    assert [doc.metadata["data_id"] for doc in docs] == ["4", "3"]
+
+def test_rerank_failure_falls_back_to_first_stage():
+    shedder = LoadShedder(max_inflight=4, latency_budget=0.5)
+    docs = make_retriever(BrokenReranker(), shedder).invoke("질문")
+    assert [doc.metadata["data_id"] for doc in docs] == ["0", "1"]
+    assert shedder.inflight == 0
+    assert shedder.recent_latency == 0.0
+
+def test_model_load_time_is_not_measured():
+    _, elapsed = rerank_documents(SlowLoadingReranker(), "질문", CANDIDATES, k=2)
+    assert elapsed < 0.1
+
+def test_model_load_failure_is_remembered_until_backoff_expires(monkeypatch):
+    attempts = []
+
+    def failing_cross_encoder(*args, **kwargs):
+        attempts.append(args)
+        raise OSError("모델 다운로드 실패")
+
+    monkeypatch.setitem(sys.modules, "sentence_transformers", types.SimpleNamespace(CrossEncoder=failing_cross_encoder))
+    reranker = CrossEncoderReranker(reload_backoff=0.2)
+    retriever = make_retriever(reranker)
+
+    for _ in range(3):
+        docs = retriever.invoke("질문")
+        assert [doc.metadata["data_id"] for doc in docs] == ["0", "1"]
+    assert len(attempts) == 1
+    assert not reranker.is_available()
+    assert retriever.load_shedder.inflight == 0
+
+    time.sleep(0.25)
+    assert reranker.is_available()
+    retriever.invoke("질문")
+    assert len(attempts) == 2
@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+from rag import resources
+
+@pytest.fixture(autouse=True)
+def clean_resources():
+    resources.reset_shared_resources()
+    yield
+    resources.reset_shared_resources()
+
+def test_failed_warmup_is_not_ready_and_retries(monkeypatch):
+    calls = []
+
+    def warm_up(k, build_chain):
+        calls.append(k)
+        if len(calls) == 1:
+            raise RuntimeError("model download failed")
+
+    monkeypatch.setattr(resources, "warm_up", warm_up)
+
+    assert resources.wait_until_ready(timeout=5) is False  # 시작 전
+    resources.start_warmup()
+    assert resources.wait_until_ready(timeout=5) is False
+    assert not resources.is_ready()
+    assert isinstance(resources.get_warmup_error(), RuntimeError)
+
+    resources.start_warmup()  # 실패한 워밍업은 다시 시작
+    assert resources.wait_until_ready(timeout=5) is True
+    assert resources.is_ready()
+    assert resources.get_warmup_error() is None
+    assert len(calls) == 2
+
+    resources.start_warmup()  # 성공한 뒤에는 다시 실행하지 않음
+    assert len(calls) == 2
+
+def test_reset_waits_for_running_warmup(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    def warm_up(k, build_chain):
+        started.set()
+        release.wait(5)
+        resources._embeddings = "stale"  # 워밍업이 끝나며 예전 리소스를 채움
+
+    monkeypatch.setattr(resources, "warm_up", warm_up)
+    resources.start_warmup()
+    started.wait(5)
+
+    reset = threading.Thread(target=resources.reset_shared_resources)
+    reset.start()
+    reset.join(0.1)
+    assert reset.is_alive()  # 워밍업이 끝날 때까지 기다림
+
+    release.set()
+    reset.join(5)
+    assert not reset.is_alive()
+    assert resources._embeddings is None
+    assert not resources.is_ready()
@@ -0,0 +1,92 @@
+from typing import List
+
+import pytest
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from conftest import make_item
+from rag.embedding import create_documents
+from rag.lexical_index import LexicalIndex, build_lexical_index
+from rag.retriever import HybridRetriever, ParentWindowRetriever
+
+class StaticRetriever(BaseRetriever):
+    docs: List[Document]
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        return list(self.docs)
+
+ITEMS = [
+    make_item("1", content="연봉이 높습니다. 야근이 적습니다. 식대가 나옵니다. 팀 분위기가 좋습니다. 재택 근무가 됩니다. 교육비를 줍니다."),
+    make_item("2", content="복지가 평범합니다. 트랜스포머 모델을 직접 학습합니다. 출퇴근이 자유롭습니다."),
+    make_item("3", content="연봉 협상이 어렵습니다."),
+]
+
+@pytest.fixture
+def vectorstore(tmp_path, fake_embeddings):
+    store = Chroma(collection_name="parents", persist_directory=str(tmp_path / "chroma"), embedding_function=fake_embeddings)
+    documents = list(create_documents(ITEMS))
+    store.add_documents(documents, ids=[doc.id for doc in documents])
+    return store
+
+@pytest.fixture
+def lexical_index(tmp_path):
+    build_lexical_index(ITEMS, str(tmp_path))
+    return LexicalIndex.load(str(tmp_path))
+
+def parent(data_id):
+    return Document(page_content=f"문서 {data_id}", metadata={"data_id": data_id})
+
+def window(data_id, start, end):
+    return Document(
+        page_content=f"청크 {data_id}:{start}",
+        metadata={"data_id": data_id, "parent_id": data_id, "window_start": start, "window_end": end},
+    )
+
+def test_rrf_orders_by_combined_rank(vectorstore, lexical_index):
+    # Dense: 3, 1 / BM25("트랜스포머 연봉"): 2, 그 다음 연봉 문서들
+    retriever = HybridRetriever(
+        vectorstore=vectorstore,
+        dense_retriever=StaticRetriever(docs=[parent("3"), parent("1")]),
+        lexical_index=lexical_index,
+        k=3,
+    )
+    lexical_ids = [doc_id for doc_id, _ in lexical_index.search("트랜스포머 연봉", k=3)]
+    assert lexical_ids[0] == "2"
+
+    docs = retriever.invoke("트랜스포머 연봉")
+    ranks = {}
+    for ranked in (["3", "1"], lexical_ids):
+        for rank, doc_id in enumerate(ranked):
+            ranks[doc_id] = ranks.get(doc_id, 0.0) + 1.0 / (retriever.rrf_k + rank + 1)
+    expected = sorted(ranks, key=ranks.get, reverse=True)
+    assert [doc.metadata["data_id"] for doc in docs] == expected
+
+def test_chunk_mode_keeps_distinct_windows_and_maps_lexical_hits_to_windows(vectorstore, lexical_index):
+    dense = ParentWindowRetriever(
+        base_retriever=StaticRetriever(docs=[window("1", 0, 1), window("1", 4, 5)]),
+        parent_vectorstore=vectorstore,
+    )
+    retriever = HybridRetriever(vectorstore=vectorstore, dense_retriever=dense, lexical_index=lexical_index, k=5)
+
+    docs = retriever.invoke("트랜스포머")
+    keys = [(doc.metadata["data_id"], doc.metadata["window_start"], doc.metadata["window_end"]) for doc in docs]
+
+    # 같은 원문(1)의 떨어진 두 윈도우가 하나로 합쳐지지 않음
+    assert ("1", 0, 2) in keys and ("1", 3, 6) in keys
+    # BM25로만 찾은 원문(2)은 원문 전체가 아니라 매칭된 문장 주변 윈도우로 반환
+    lexical_window = next(doc for doc in docs if doc.metadata["data_id"] == "2")
+    assert "트랜스포머" in lexical_window.page_content
+    assert "출퇴근" in lexical_window.page_content
+    assert (lexical_window.metadata["window_start"], lexical_window.metadata["window_end"]) == (0, 3)
+
+def test_chunk_mode_merges_lexical_window_overlapping_dense_window(vectorstore, lexical_index):
+    dense = ParentWindowRetriever(
+        base_retriever=StaticRetriever(docs=[window("3", 0, 1), window("1", 4, 5)]),
+        parent_vectorstore=vectorstore,
+    )
+    retriever = HybridRetriever(vectorstore=vectorstore, dense_retriever=dense, lexical_index=lexical_index, k=5)
+
+    # "재택"은 원문 1의 4번 문장 - Dense 윈도우(3~6)와 겹치므로 같은 결과로 합쳐져 1위가 됨
+    docs = retriever.invoke("재택")
+    assert [(doc.metadata["data_id"], doc.metadata["window_start"]) for doc in docs] == [("1", 3), ("3", 0)]
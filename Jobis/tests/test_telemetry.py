@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from rag import telemetry
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+def run_import(script, **env):
+    return subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=False,
+        env={**os.environ, **env},
+    )
+
+def test_import_does_not_start_metrics_server():
+    # 같은 포트로 두 프로세스가 동시에 import해도 (임베딩 작업 프로세스) 실패하지 않아야 함
+    script = "import rag.embedding_cache, rag.telemetry; assert rag.telemetry._metrics_server is None"
+    env = {"JOBIS_TELEMETRY": "prometheus", "JOBIS_METRICS_PORT": "19464"}
+    first = subprocess.Popen([sys.executable, "-c", script + "; import time; time.sleep(1)"], cwd=ROOT_DIR, env={**os.environ, **env})
+    second = run_import(script, **env)
+    assert first.wait() == 0
+    assert second.returncode == 0, second.stderr
+
+def test_unknown_sink_is_ignored_with_warning(monkeypatch, caplog):
+    monkeypatch.setattr(telemetry, "_sinks", None)
+    result = run_import("import rag.telemetry", JOBIS_TELEMETRY="memroy")
+    assert result.returncode == 0, result.stderr
+
+    sinks = telemetry.configure_from_env("memroy,log")
+    assert [type(sink) for sink in sinks] == [telemetry.LogSink]
+    assert "memroy" in caplog.text
+
+def test_increment_survives_failing_sink(monkeypatch):
+    class BrokenSink:
+        def record_count(self, name, value, labels):
+            raise RuntimeError("boom")
+
+    memory = telemetry.MemorySink()
+    monkeypatch.setattr(telemetry, "_sinks", (BrokenSink(), memory))
+    telemetry.increment("embedding_cache", result="hit")
+    assert memory._counts
@@ -1,5 +1,6 @@
 import streamlit as st
 import base64
+import itertools
 import sys
 from pathlib import Path
 
@@ -8,7 +9,15 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.append(str(ROOT_DIR))
 
+from rag import telemetry
 from rag.chatbot import JobisChatbot
+from rag.resources import start_warmup
+
+# 화면을 그리는 동안 백그라운드에서 모델/벡터DB를 로드합니다. (서버당 한 번만 실행, rerun 시에는 무시)
+start_warmup()
+
+# JOBIS_TELEMETRY에 prometheus가 있고 JOBIS_METRICS_PORT가 지정되어 있으면 /metrics 엔드포인트를 엽니다. (서버당 한 번)
+telemetry.start_metrics_server()
 
 # ---------------------------
 # Title with Logo
@@ -74,6 +83,7 @@ st.markdown(bubble_style, unsafe_allow_html=True)
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
+# JobisChatbot은 프로세스 공유 리소스(모델/벡터DB/Chain)를 참조하는 가벼운 객체입니다.
 if "chatbot" not in st.session_state:
     st.session_state.chatbot = JobisChatbot()
 
@@ -108,13 +118,6 @@ for msg in st.session_state.messages:
 # ---------------------------
 user_input = st.chat_input("질문을 입력하세요")
 
-# 글자가 하나씩 출력되는 애니메이션(streaming)
-def stream_answer(text):
-    import time
-    for char in text:
-        yield char
-        time.sleep(0.02)  # 속도 조절 가능
-
 if user_input:
     st.session_state.messages.append({"role": "user", "content": user_input})
 
@@ -128,13 +131,14 @@ if user_input:
         unsafe_allow_html=True
     )
 
-    # ---- RAG 호출 + 스피너 ----
+    # ---- RAG 호출 + 스피너 (첫 토큰이 도착할 때까지만 표시) ----
+    answer_stream = st.session_state.chatbot.ask_stream(user_input)
     with st.spinner("Jobis 생각 중..."):
-        bot_response = st.session_state.chatbot.ask(user_input)
+        first_chunk = next(answer_stream, "")
 
-    # 메시지 저장
-    st.session_state.messages.append({"role": "assistant", "content": bot_response})
-
-    # ---- 스트리밍 출력 ----
+    # ---- 스트리밍 출력 (LLM 토큰을 받는 즉시 출력) ----
     with st.chat_message("assistant"):
-        st.write_stream(stream_answer(bot_response))
\ No newline at end of file
+        bot_response = st.write_stream(itertools.chain([first_chunk], answer_stream))
+
+    # 메시지 저장
+    st.session_state.messages.append({"role": "assistant", "content": bot_response})
\ No newline at end of file